@@ -21,25 +21,40 @@ from .hotkey_context import *  # noqa: F401 F403
 
 from .block_input import *  # noqa: F401 F403
 from .clipboard import *  # noqa: F401 F403
+from .compiled_keys import *  # noqa: F401 F403
+from .cron import *  # noqa: F401 F403
 from .exceptions import *  # noqa: F401 F403
 from .flow import *  # noqa: F401 F403
+from .histogram import *  # noqa: F401 F403
 from .hotkey import *  # noqa: F401 F403
 from .hotstring import *  # noqa: F401 F403
+from .hotstring_recognizer import *  # noqa: F401 F403
+from .key_sequence import *  # noqa: F401 F403
 from .key_state import *  # noqa: F401 F403
+from .keymap import *  # noqa: F401 F403
 from .menu import *  # noqa: F401 F403
 from .message_box import *  # noqa: F401 F403
+from .monitor import *  # noqa: F401 F403
 from .mouse import *  # noqa: F401 F403
+from .pool import *  # noqa: F401 F403
+from .recording import *  # noqa: F401 F403
 from .remap_key import *  # noqa: F401 F403
 from .sending import *  # noqa: F401 F403
 from .settings import *  # noqa: F401 F403
+from .text_insertion import *  # noqa: F401 F403
 from .timer import *  # noqa: F401 F403
 from .tooltip import *  # noqa: F401 F403
+from .watch import *  # noqa: F401 F403
 from .window import *  # noqa: F401 F403
 from .window_message import *  # noqa: F401 F403
 
+from . import tiling  # noqa: F401
+
 # Override modules with functions
 hotkey = default_context.hotkey  # noqa: F405
 remap_key = default_context.remap_key  # noqa: F405
 hotstring = default_context.hotstring  # noqa: F405
+load_hotstrings = default_context.load_hotstrings  # noqa: F405
+sequence = default_context.sequence  # noqa: F405
 
 __version__ = "0.1"
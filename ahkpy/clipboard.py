@@ -2,7 +2,7 @@ import dataclasses as dc
 import functools
 from typing import Callable
 
-from .flow import ahk_call, _wait_for, _wrap_callback
+from .flow import ahk_call, _rate_limit_args, _suppressed_count, _wait_for, _wrap_callback
 
 __all__ = [
     "ClipboardHandler",
@@ -45,7 +45,8 @@ def wait_clipboard(timeout: float = None) -> str:
     return _wait_for(timeout, get_clipboard) or ""
 
 
-def on_clipboard_change(func: Callable = None, *args, prepend_handler=False):
+def on_clipboard_change(func: Callable = None, *args, prepend_handler=False, debounce=None, throttle=None,
+                        coalesce=False):
     """Register *func* to be called on clipboard change.
 
     On clipboard change, *func* will be called with the clipboard text as the
@@ -61,6 +62,13 @@ def on_clipboard_change(func: Callable = None, *args, prepend_handler=False):
 
     If *func* returns true, then the other clipboard handlers won't be called.
 
+    The optional *debounce*, *throttle*, and *coalesce* arguments limit the
+    rate of *func* calls for bursts of clipboard changes, for example, when
+    an application sets the clipboard several times in a row. The suppressed
+    changes are dropped on the AHK side without calling Python and are counted
+    in :attr:`ClipboardHandler.suppressed_count`. For more information refer
+    to :meth:`HotkeyContext.hotkey`.
+
     If *func* is given, returns an instance of :class:`ClipboardHandler`.
     Otherwise, the function works as a decorator::
 
@@ -74,6 +82,7 @@ def on_clipboard_change(func: Callable = None, *args, prepend_handler=False):
        <https://www.autohotkey.com/docs/commands/OnClipboardChange.htm>`_
     """
     option = 1 if not prepend_handler else -1
+    limit = _rate_limit_args(debounce, throttle, coalesce)
 
     def on_clipboard_change_decorator(func):
         func = _wrap_callback(
@@ -82,7 +91,7 @@ def on_clipboard_change(func: Callable = None, *args, prepend_handler=False):
             _bare_clipboard_handler,
             _clipboard_handler,
         )
-        ahk_call("OnClipboardChange", func, option)
+        ahk_call("OnClipboardChangeWithLimit", func, option, *limit)
         return ClipboardHandler(func)
 
     if func is None:
@@ -116,11 +125,20 @@ class ClipboardHandler:
     func: Callable
     __slots__ = ("func",)
 
+    @property
+    def suppressed_count(self) -> int:
+        """The number of clipboard changes suppressed by the *debounce*,
+        *throttle*, and *coalesce* options (read-only).
+
+        :type: int
+        """
+        return _suppressed_count(self.func)
+
     def unregister(self):
         """Unregister the clipboard handler and stop calling the function on
         clipboard change.
         """
-        ahk_call("OnClipboardChange", self.func, 0)
+        ahk_call("OnClipboardChangeWithLimit", self.func, 0, 0, 0, 0)
 
 
 # TODO: Implement ClipboardAll.
@@ -0,0 +1,551 @@
+import ctypes
+import functools
+import re
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from .flow import global_ahk_lock, sleep
+from .settings import get_settings
+
+__all__ = [
+    "CompiledKeys",
+    "KeyEvent",
+    "compile_keys",
+]
+
+
+KEYEVENTF_EXTENDEDKEY = 0x0001
+KEYEVENTF_KEYUP = 0x0002
+KEYEVENTF_UNICODE = 0x0004
+# Not a Windows flag. Marks the events of the literal characters that are
+# translated to keystrokes for the keyboard layout of the active window when
+# the keys are sent.
+KEYEVENTF_CHAR = 0x10000
+
+# AHK marks its own events with these values in dwExtraInfo to ignore them in
+# its hooks according to SendLevel.
+KEY_IGNORE = 0xFFC3D44F
+KEY_IGNORE_ALL_EXCEPT_MODIFIER = KEY_IGNORE - 2
+
+COMPILED_KEYS_MODES = {"input", "event"}
+
+
+class KeyEvent(NamedTuple):
+    """The keyboard event that corresponds to the `KEYBDINPUT
+    <https://docs.microsoft.com/en-us/windows/win32/api/winuser/ns-winuser-keybdinput>`_
+    structure.
+    """
+
+    #: The virtual-key code, or 0 for Unicode and character events.
+    vk: int
+    #: The scan code, or the UTF-16 code unit for Unicode and character events.
+    scan: int
+    #: The combination of ``KEYEVENTF_*`` flags.
+    flags: int
+
+    @property
+    def is_up(self) -> bool:
+        """Whether the event releases the key."""
+        return bool(self.flags & KEYEVENTF_KEYUP)
+
+
+def compile_keys(keys: str, mode="input") -> "CompiledKeys":
+    """Parse the *keys* in the AHK `Send
+    <https://www.autohotkey.com/docs/commands/Send.htm#Parameters>`__ syntax
+    into a list of keyboard events.
+
+    The keys are parsed and validated once, so the syntax errors raise
+    :exc:`ValueError` right away instead of when the keys are sent. The
+    results are cached by *keys* and *mode*, so compiling the same keys again
+    is cheap::
+
+        SIGNATURE = ahkpy.compile_keys("{Text}Best regards,")
+
+        @ahkpy.hotkey("F1")
+        def sign():
+            ahkpy.compile_keys("^{End}{Enter 2}").send()
+            SIGNATURE.send()
+
+    If *mode* is ``"input"``, all the events are sent in a single `SendInput
+    <https://docs.microsoft.com/en-us/windows/win32/api/winuser/nf-winuser-sendinput>`_
+    call. If *mode* is ``"event"``, the events are sent one by one with
+    :attr:`Settings.key_delay` between them.
+
+    The supported syntax includes the ``^!+#`` modifiers, key names in
+    braces, such as ``{Enter}``, ``{vk41}``, ``{sc01E}``, ``{U+20AC}``, the
+    repeat count ``{Tab 3}``, ``{Ctrl down}`` and ``{Ctrl up}``, ``{Blind}``,
+    ``{Raw}``, and ``{Text}``. Mouse clicks ``{Click}`` and ``{ASC nnnnn}``
+    are not supported.
+
+    The literal characters are sent as the keystrokes that type them in the
+    keyboard layout of the active window at the time of sending, like AHK
+    does. The characters that the layout can't type, and the text after
+    ``{Text}``, are sent as Unicode characters. The space, :kbd:`Enter`, and
+    :kbd:`Tab` are sent as the keys regardless of the layout. After
+    ``{Text}``, the backspace character is sent as the :kbd:`Backspace` key.
+    ``\r\n`` is sent as a single :kbd:`Enter`.
+    """
+    if mode not in COMPILED_KEYS_MODES:
+        raise ValueError(f"{mode!r} is not a valid mode")
+    return _compile(str(keys), mode)
+
+
+class CompiledKeys:
+    """The keyboard events parsed from the AHK Send syntax.
+
+    Use the :func:`compile_keys` function to create it.
+    """
+
+    def __init__(self, keys: str, mode: str, events: Sequence[KeyEvent], blind: bool):
+        #: The source string in the AHK Send syntax.
+        self.keys = keys
+        #: The send mode, ``"input"`` or ``"event"``.
+        self.mode = mode
+        #: The tuple of :class:`KeyEvent` to send.
+        self.events: Tuple[KeyEvent, ...] = tuple(events)
+        #: Whether the keys start with ``{Blind}``.
+        self.blind = blind
+        self._inputs: Dict[Tuple[int, int], ctypes.Array] = {}
+
+    def send(self, *, level=None, sink: Optional[Callable[[Sequence[KeyEvent], int], None]] = None):
+        """Send the events to the active window.
+
+        The *level* argument works the same as in :func:`send`.
+
+        If *sink* is given, it's called with the sequence of events and the
+        ``dwExtraInfo`` value instead of sending them to the system. It lets
+        you test and benchmark the keys without affecting the keyboard. The
+        sink receives the character events untranslated, with the
+        ``KEYEVENTF_CHAR`` flag.
+
+        Unless the keys start with ``{Blind}``, the modifiers that are held
+        down when the keys are sent are released first and pressed back
+        afterwards.
+        """
+        if level is None:
+            level = get_settings().send_level
+        elif not 0 <= level <= 100:
+            raise ValueError("level must be between 0 and 100")
+        extra_info = KEY_IGNORE_ALL_EXCEPT_MODIFIER - int(level)
+
+        if sink is not None:
+            if self.mode == "input":
+                sink(self.events, extra_info)
+            else:
+                for event in self.events:
+                    sink((event,), extra_info)
+            return
+
+        with global_ahk_lock:
+            released = () if self.blind else _held_modifiers()
+            if released:
+                _send_input(_build_inputs(
+                    [KeyEvent(vk, 0, flags | KEYEVENTF_KEYUP) for vk, flags in released], extra_info,
+                ))
+            try:
+                layout = _active_layout()
+                if self.mode == "input":
+                    inputs = self._inputs.get((layout, extra_info))
+                    if inputs is None:
+                        inputs = _build_inputs(_translate_chars(self.events, layout), extra_info)
+                        self._inputs[layout, extra_info] = inputs
+                    _send_input(inputs)
+                else:
+                    key_delay = get_settings().key_delay
+                    for event in _translate_chars(self.events, layout):
+                        _send_input(_build_inputs((event,), extra_info))
+                        if key_delay and key_delay > 0:
+                            sleep(key_delay)
+            finally:
+                if released:
+                    _send_input(_build_inputs([KeyEvent(vk, 0, flags) for vk, flags in released], extra_info))
+
+    def __len__(self):
+        return len(self.events)
+
+    def __repr__(self):
+        return f"<{self.__class__.__qualname__} {self.keys!r} {self.mode!r}>"
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile(keys, mode):
+    events, blind = _parse(keys)
+    return CompiledKeys(keys, mode, events, blind)
+
+
+_KEY_NAMES = {
+    "enter": (0x0D, False),
+    "escape": (0x1B, False),
+    "esc": (0x1B, False),
+    "space": (0x20, False),
+    "tab": (0x09, False),
+    "backspace": (0x08, False),
+    "bs": (0x08, False),
+    "delete": (0x2E, True),
+    "del": (0x2E, True),
+    "insert": (0x2D, True),
+    "ins": (0x2D, True),
+    "up": (0x26, True),
+    "down": (0x28, True),
+    "left": (0x25, True),
+    "right": (0x27, True),
+    "home": (0x24, True),
+    "end": (0x23, True),
+    "pgup": (0x21, True),
+    "pgdn": (0x22, True),
+    "capslock": (0x14, False),
+    "scrolllock": (0x91, False),
+    "numlock": (0x90, True),
+    "printscreen": (0x2C, True),
+    "pause": (0x13, False),
+    "appskey": (0x5D, True),
+    "sleep": (0x5F, False),
+    "lwin": (0x5B, True),
+    "rwin": (0x5C, True),
+    "control": (0x11, False),
+    "ctrl": (0x11, False),
+    "lcontrol": (0xA2, False),
+    "lctrl": (0xA2, False),
+    "rcontrol": (0xA3, True),
+    "rctrl": (0xA3, True),
+    "shift": (0x10, False),
+    "lshift": (0xA0, False),
+    "rshift": (0xA1, False),
+    "alt": (0x12, False),
+    "lalt": (0xA4, False),
+    "ralt": (0xA5, True),
+    "numpaddiv": (0x6F, True),
+    "numpadmult": (0x6A, False),
+    "numpadadd": (0x6B, False),
+    "numpadsub": (0x6D, False),
+    "numpaddot": (0x6E, False),
+    "numpadenter": (0x0D, True),
+    "browser_back": (0xA6, True),
+    "browser_forward": (0xA7, True),
+    "browser_refresh": (0xA8, True),
+    "browser_stop": (0xA9, True),
+    "browser_search": (0xAA, True),
+    "browser_favorites": (0xAB, True),
+    "browser_home": (0xAC, True),
+    "volume_mute": (0xAD, True),
+    "volume_down": (0xAE, True),
+    "volume_up": (0xAF, True),
+    "media_next": (0xB0, True),
+    "media_prev": (0xB1, True),
+    "media_stop": (0xB2, True),
+    "media_play_pause": (0xB3, True),
+    "launch_mail": (0xB4, True),
+    "launch_media": (0xB5, True),
+    "launch_app1": (0xB6, True),
+    "launch_app2": (0xB7, True),
+    **{f"f{n}": (0x6F + n, False) for n in range(1, 25)},
+    **{f"numpad{n}": (0x60 + n, False) for n in range(10)},
+}
+
+_MODIFIER_VKS = {
+    "^": 0xA2,  # LCtrl
+    "!": 0xA4,  # LAlt
+    "+": 0xA0,  # LShift
+    "#": 0x5B,  # LWin
+}
+
+_VK_SC_RE = re.compile(r"(?:vk([0-9a-f]{1,2}))?(?:sc([0-9a-f]{1,3}))?$", re.IGNORECASE)
+_UNICODE_RE = re.compile(r"u\+([0-9a-f]{1,6})$", re.IGNORECASE)
+_EXTENDED_VKS = {vk for vk, extended in _KEY_NAMES.values() if extended and vk != 0x0D}
+
+
+def _parse(keys):
+    # Returns the list of events and whether the keys are sent in the Blind
+    # mode.
+    events: List[KeyEvent] = []
+    modifiers: List[int] = []
+    blind = False
+    i = 0
+    n = len(keys)
+    while i < n:
+        char = keys[i]
+        if char in _MODIFIER_VKS:
+            vk = _MODIFIER_VKS[char]
+            if vk not in modifiers:
+                modifiers.append(vk)
+            i += 1
+            continue
+
+        if char == "{":
+            # "{}}" is the closing brace itself.
+            end = keys.find("}", i + 2)
+            if end == -1:
+                raise ValueError(f"unclosed brace at position {i} in {keys!r}")
+            name, _, arg = keys[i + 1:end].partition(" ")
+            i = end + 1
+            lower = name.lower()
+            if lower == "blind":
+                if events or modifiers or blind:
+                    raise ValueError("{Blind} must be at the start of the keys")
+                blind = True
+                continue
+            if lower in ("raw", "text"):
+                if modifiers:
+                    raise ValueError(f"modifiers must be followed by a key in {keys!r}")
+                # Like the rest of the keys, "\r\n" is a single Enter.
+                char_events = _char_events if lower == "raw" else _text_events
+                for rest_char in keys[i:].replace("\r\n", "\n"):
+                    events.extend(char_events(rest_char))
+                return events, blind
+            if lower == "click" or lower.startswith("asc"):
+                raise ValueError(f"{{{name}}} is not supported by compile_keys")
+            key_events = _named_key_events(name)
+            down, up, count = _parse_key_arg(arg, name)
+            _with_modifiers(events, modifiers, key_events, down, up, count)
+            modifiers = []
+            continue
+
+        i += 1
+        if char == "\r" and keys[i:i + 1] == "\n":
+            continue
+        _with_modifiers(events, modifiers, _split(_char_events(char)), True, True, 1)
+        modifiers = []
+
+    if modifiers:
+        raise ValueError(f"modifiers must be followed by a key in {keys!r}")
+    return events, blind
+
+
+def _parse_key_arg(arg, name):
+    # Returns whether to press and release the key and the repeat count.
+    arg = arg.strip().lower()
+    if not arg:
+        return True, True, 1
+    if arg in ("down", "downtemp", "downr"):
+        return True, False, 1
+    if arg == "up":
+        return False, True, 1
+    if arg.isdigit():
+        return True, True, int(arg)
+    raise ValueError(f"invalid argument {arg!r} of key {name!r}")
+
+
+def _with_modifiers(events, modifiers, key_events, down, up, count):
+    # key_events is a pair of the events that press and release the key.
+    press, release = key_events
+    events.extend(KeyEvent(vk, 0, _vk_flags(vk)) for vk in modifiers)
+    for _ in range(count):
+        if down:
+            events.extend(press)
+        if up:
+            events.extend(release)
+    events.extend(KeyEvent(vk, 0, _vk_flags(vk) | KEYEVENTF_KEYUP) for vk in reversed(modifiers))
+
+
+def _named_key_events(name):
+    lower = name.lower()
+    if len(name) == 1:
+        return _split(_char_events(name))
+    key = _KEY_NAMES.get(lower)
+    if key is not None:
+        vk, extended = key
+        return _vk_events(vk, 0, extended)
+    match = _UNICODE_RE.match(name)
+    if match:
+        return _split(_unicode_events(chr(int(match.group(1), 16))))
+    match = _VK_SC_RE.match(name)
+    if match and (match.group(1) or match.group(2)):
+        vk = int(match.group(1) or "0", 16)
+        scan = int(match.group(2) or "0", 16)
+        return _vk_events(vk, scan & 0xFF, bool(scan & 0x100) or vk in _EXTENDED_VKS)
+    raise ValueError(f"unknown key name {name!r}")
+
+
+def _vk_flags(vk):
+    return KEYEVENTF_EXTENDEDKEY if vk in _EXTENDED_VKS else 0
+
+
+def _vk_events(vk, scan=0, extended=False):
+    flags = KEYEVENTF_EXTENDEDKEY if extended else 0
+    return [KeyEvent(vk, scan, flags)], [KeyEvent(vk, scan, flags | KEYEVENTF_KEYUP)]
+
+
+def _split(events):
+    # Split the flat list of events of a character into the press and release
+    # parts.
+    half = len(events) // 2
+    return events[:half], events[half:]
+
+
+def _char_events(char):
+    if char in ("\n", "\r"):
+        press, release = _vk_events(0x0D)
+        return press + release
+    if char == "\t":
+        press, release = _vk_events(0x09)
+        return press + release
+    if char == " ":
+        press, release = _vk_events(0x20)
+        return press + release
+    if ord(char) > 0xFFFF:
+        # VkKeyScanEx takes a single UTF-16 code unit.
+        return _unicode_events(char)
+    return [KeyEvent(0, ord(char), KEYEVENTF_CHAR), KeyEvent(0, ord(char), KEYEVENTF_CHAR | KEYEVENTF_KEYUP)]
+
+
+def _text_events(char):
+    # The Text mode types the control characters with the keys and sends
+    # the rest as Unicode.
+    if char in ("\n", "\r", "\t"):
+        return _char_events(char)
+    if char == "\b":
+        press, release = _vk_events(0x08)
+        return press + release
+    return _unicode_events(char)
+
+
+def _unicode_events(char):
+    # Characters outside the BMP are sent as surrogate pairs.
+    data = char.encode("utf-16-le")
+    units = [int.from_bytes(data[j:j + 2], "little") for j in range(0, len(data), 2)]
+    return (
+        [KeyEvent(0, unit, KEYEVENTF_UNICODE) for unit in units] +
+        [KeyEvent(0, unit, KEYEVENTF_UNICODE | KEYEVENTF_KEYUP) for unit in units]
+    )
+
+
+# The modifiers in the high byte of the VkKeyScanEx result.
+_SHIFT_STATE_VKS = (
+    (0x01, 0xA0),  # LShift
+    (0x02, 0xA2),  # LCtrl
+    (0x04, 0xA4),  # LAlt
+)
+
+
+def _translate_chars(events, layout):
+    # Replace the character events with the keystrokes that type the
+    # characters in the layout.
+    result = []
+    for event in events:
+        if not event.flags & KEYEVENTF_CHAR:
+            result.append(event)
+            continue
+        up = event.flags & KEYEVENTF_KEYUP
+        key = _char_key(chr(event.scan), layout)
+        if key is None:
+            press, release = _split(_unicode_events(chr(event.scan)))
+            result.extend(release if up else press)
+            continue
+        vk, shift_state = key
+        if up:
+            result.append(KeyEvent(vk, 0, _vk_flags(vk) | KEYEVENTF_KEYUP))
+            continue
+        # Hold the modifiers only while the key goes down, like AHK does.
+        modifiers = [mod_vk for bit, mod_vk in _SHIFT_STATE_VKS if shift_state & bit]
+        result.extend(KeyEvent(mod_vk, 0, _vk_flags(mod_vk)) for mod_vk in modifiers)
+        result.append(KeyEvent(vk, 0, _vk_flags(vk)))
+        result.extend(KeyEvent(mod_vk, 0, _vk_flags(mod_vk) | KEYEVENTF_KEYUP) for mod_vk in reversed(modifiers))
+    return result
+
+
+@functools.lru_cache(maxsize=4096)
+def _char_key(char, layout):
+    # Returns the virtual key and the shift state that type the char in the
+    # layout, or None if the layout can't type it.
+    result = _user32().VkKeyScanExW(char, layout)
+    if result == -1:
+        return None
+    vk, shift_state = result & 0xFF, (result >> 8) & 0xFF
+    # The Hankaku and other special shift states can't be sent as modifiers.
+    if shift_state & ~0x07:
+        return None
+    return vk, shift_state
+
+
+def _active_layout():
+    user32 = _user32()
+    thread_id = user32.GetWindowThreadProcessId(user32.GetForegroundWindow(), None)
+    return user32.GetKeyboardLayout(thread_id) or 0
+
+
+@functools.lru_cache(maxsize=None)
+def _user32():
+    # Private instance, so the prototypes don't leak into ctypes.windll.
+    from ctypes import wintypes
+
+    user32 = ctypes.WinDLL("user32")
+    user32.GetForegroundWindow.argtypes = []
+    user32.GetForegroundWindow.restype = wintypes.HWND
+    user32.GetWindowThreadProcessId.argtypes = [wintypes.HWND, ctypes.c_void_p]
+    user32.GetWindowThreadProcessId.restype = wintypes.DWORD
+    user32.GetKeyboardLayout.argtypes = [wintypes.DWORD]
+    user32.GetKeyboardLayout.restype = wintypes.HKL
+    user32.VkKeyScanExW.argtypes = [wintypes.WCHAR, wintypes.HKL]
+    user32.VkKeyScanExW.restype = ctypes.c_short
+    return user32
+
+
+_INPUT = None
+
+
+def _input_type():
+    global _INPUT
+    if _INPUT is not None:
+        return _INPUT
+
+    from ctypes import wintypes
+
+    class MOUSEINPUT(ctypes.Structure):
+        _fields_ = [
+            ("dx", wintypes.LONG),
+            ("dy", wintypes.LONG),
+            ("mouseData", wintypes.DWORD),
+            ("dwFlags", wintypes.DWORD),
+            ("time", wintypes.DWORD),
+            ("dwExtraInfo", ctypes.c_size_t),
+        ]
+
+    class KEYBDINPUT(ctypes.Structure):
+        _fields_ = [
+            ("wVk", wintypes.WORD),
+            ("wScan", wintypes.WORD),
+            ("dwFlags", wintypes.DWORD),
+            ("time", wintypes.DWORD),
+            ("dwExtraInfo", ctypes.c_size_t),
+        ]
+
+    class _INPUTUNION(ctypes.Union):
+        _fields_ = [("mi", MOUSEINPUT), ("ki", KEYBDINPUT)]
+
+    class INPUT(ctypes.Structure):
+        _anonymous_ = ("u",)
+        _fields_ = [("type", wintypes.DWORD), ("u", _INPUTUNION)]
+
+    _INPUT = INPUT
+    return INPUT
+
+
+def _build_inputs(events, extra_info):
+    INPUT_KEYBOARD = 1
+    INPUT = _input_type()
+    map_vk = ctypes.windll.user32.MapVirtualKeyW
+    inputs = (INPUT * len(events))()
+    for item, (vk, scan, flags) in zip(inputs, events):
+        item.type = INPUT_KEYBOARD
+        item.ki.wVk = vk
+        # Some applications read the scan code instead of the virtual key.
+        item.ki.wScan = scan or (map_vk(vk, 0) if vk else 0)
+        item.ki.dwFlags = flags
+        item.ki.dwExtraInfo = extra_info
+    return inputs
+
+
+def _send_input(inputs):
+    if not inputs:
+        return
+    sent = ctypes.windll.user32.SendInput(len(inputs), inputs, ctypes.sizeof(inputs[0]))
+    if sent != len(inputs):
+        raise ctypes.WinError()
+
+
+def _held_modifiers():
+    get_key_state = ctypes.windll.user32.GetAsyncKeyState
+    return [
+        (vk, _vk_flags(vk))
+        for vk in (0xA2, 0xA3, 0xA4, 0xA5, 0xA0, 0xA1, 0x5B, 0x5C)
+        if get_key_state(vk) & 0x8000
+    ]
@@ -0,0 +1,294 @@
+import datetime as dt
+import functools
+import heapq
+import itertools
+from typing import Callable, List, Optional, Tuple
+
+from .timer import Timer
+
+__all__ = [
+    "ScheduledJob",
+    "schedule",
+    "upcoming_runs",
+]
+
+
+def schedule(when, func: Callable = None, *args) -> "ScheduledJob":
+    """Run *func* with arguments *args* at the times defined by *when*.
+
+    The *when* argument is either a cron expression, or a recurrence rule
+    object with the ``after(dt)`` method, such as :class:`dateutil.rrule.rrule`.
+
+    The cron expression consists of five space-separated fields: minute
+    (0–59), hour (0–23), day of the month (1–31), month (1–12 or ``jan``–
+    ``dec``), and day of the week (0–7 or ``sun``–``sat``, where both 0 and 7
+    are Sunday). A field is either ``*``, a value, a range like ``1-5``, or a
+    comma-separated list of them. A ``/step`` suffix selects every *step*-th
+    value of the range, e.g. ``*/15``. The ``@yearly``, ``@monthly``,
+    ``@weekly``, ``@daily``, and ``@hourly`` shortcuts are also supported::
+
+        ahkpy.schedule("0 9 * * mon-fri", export_report)
+        ahkpy.schedule("*/30 * * * *", close_idle_windows)
+
+    The times are in the local time zone. All the scheduled jobs are kept in a
+    single queue, and only one timer is set to fire at the earliest run. The
+    queue is rescheduled when the system time changes and when the computer
+    resumes from sleep. If a run was missed while the computer was asleep,
+    *func* is called once on resume.
+
+    If you want the *func* to be called with keyword arguments use
+    :func:`functools.partial`.
+
+    If *func* is given, returns an instance of :class:`ScheduledJob`.
+    Otherwise, the function works as a decorator::
+
+        @ahkpy.schedule("@hourly")
+        def chime():
+            ahkpy.sound_beep()
+
+        assert isinstance(chime, ahkpy.ScheduledJob)
+    """
+    rule = _parse_rule(when)
+
+    def schedule_decorator(func):
+        if not callable(func):
+            raise TypeError(f"object {func!r} must be callable")
+        if args:
+            func = functools.partial(func, *args)
+        job = ScheduledJob(when, func, rule)
+        _engine.add(job)
+        return job
+
+    if func is None:
+        return schedule_decorator
+    return schedule_decorator(func)
+
+
+def upcoming_runs(count=10) -> List[Tuple[dt.datetime, "ScheduledJob"]]:
+    """Get the next *count* runs of all scheduled jobs as a list of
+    ``(datetime, job)`` tuples sorted by time.
+
+    Only the next run of each job is listed. To get the further runs of a job
+    use :meth:`ScheduledJob.upcoming`.
+    """
+    return _engine.upcoming(count)
+
+
+class ScheduledJob:
+    """The job registered with :func:`schedule`.
+
+    Creating an instance of :class:`!ScheduledJob` doesn't schedule it. Use
+    the :func:`schedule` function instead.
+    """
+
+    def __init__(self, when, func: Callable, rule=None):
+        #: The cron expression or the recurrence rule of the job.
+        self.when = when
+        #: The function to run.
+        self.func = func
+        self._rule = rule if rule is not None else _parse_rule(when)
+        self._next_run: Optional[dt.datetime] = None
+
+    @property
+    def next_run(self) -> Optional[dt.datetime]:
+        """The time of the next run, or ``None`` if the job is cancelled or
+        has no more runs (read-only).
+
+        :type: Optional[datetime.datetime]
+        """
+        return self._next_run
+
+    def upcoming(self, count=5) -> List[dt.datetime]:
+        """Get the times of the next *count* runs of the job."""
+        times = []
+        current = self._next_run
+        while current is not None and len(times) < count:
+            times.append(current)
+            current = self._rule.after(current)
+        return times
+
+    def cancel(self):
+        """Remove the job from the schedule."""
+        _engine.remove(self)
+
+    def __repr__(self):
+        return f"<{self.__class__.__qualname__} {self.when!r} {self.func!r}>"
+
+
+MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+MONTH_NAMES = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+DAY_NAMES = ["sun", "mon", "tue", "wed", "thu", "fri", "sat"]
+
+
+def _parse_rule(when):
+    if isinstance(when, str):
+        return _CronRule(when)
+    if callable(getattr(when, "after", None)):
+        return when
+    raise TypeError(f"object {when!r} must be a cron expression or have the 'after' method")
+
+
+class _CronRule:
+    # Computes the run times of a five-field cron expression in the same way
+    # as the dateutil rules do, so that both can be used interchangeably.
+
+    def __init__(self, expr: str):
+        fields = MACROS.get(expr.strip().lower(), expr).split()
+        if len(fields) != 5:
+            raise ValueError(f"cron expression {expr!r} must have five fields")
+        minute, hour, day, month, weekday = fields
+        self.minutes = _parse_field(minute, 0, 59)
+        self.hours = _parse_field(hour, 0, 23)
+        self.days = _parse_field(day, 1, 31)
+        self.months = _parse_field(month, 1, 12, MONTH_NAMES, 1)
+        # Cron counts weekdays from Sunday, Python from Monday.
+        self.weekdays = {(d - 1) % 7 for d in _parse_field(weekday, 0, 7, DAY_NAMES)}
+        # Like in cron, if both day fields are restricted, either of them may
+        # match.
+        self.either_day = not day.startswith("*") and not weekday.startswith("*")
+        if self.after(dt.datetime(2000, 1, 1)) is None:
+            raise ValueError(f"cron expression {expr!r} never matches")
+
+    def _day_matches(self, date):
+        in_days = date.day in self.days
+        in_weekdays = date.weekday() in self.weekdays
+        if self.either_day:
+            return in_days or in_weekdays
+        return in_days and in_weekdays
+
+    def after(self, time: dt.datetime, inc=False) -> Optional[dt.datetime]:
+        if inc and time.second == 0 and time.microsecond == 0:
+            current = time
+        else:
+            current = time.replace(second=0, microsecond=0) + dt.timedelta(minutes=1)
+        # Every combination of month and day repeats within 28 years.
+        limit = current.replace(year=current.year + 28, month=1, day=1, hour=0, minute=0)
+        while current < limit:
+            if current.month not in self.months:
+                year, month = divmod(current.month, 12)
+                current = current.replace(year=current.year + year, month=month + 1, day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(current):
+                current = current.replace(hour=0, minute=0) + dt.timedelta(days=1)
+                continue
+            if current.hour not in self.hours:
+                current = current.replace(minute=0) + dt.timedelta(hours=1)
+                continue
+            if current.minute not in self.minutes:
+                current += dt.timedelta(minutes=1)
+                continue
+            return current
+        return None
+
+
+def _parse_field(field, low, high, names=None, name_base=0):
+    values = set()
+    for part in field.lower().split(","):
+        rng, _, step = part.partition("/")
+        if rng == "*":
+            start, end = low, high
+        else:
+            start, _, end = rng.partition("-")
+            start = _parse_value(start, low, high, names, name_base)
+            end = _parse_value(end, low, high, names, name_base) if end else (high if step else start)
+        if step:
+            if not step.isdigit() or int(step) <= 0:
+                raise ValueError(f"invalid step in cron field {field!r}")
+            step = int(step)
+        else:
+            step = 1
+        if start > end:
+            raise ValueError(f"invalid range in cron field {field!r}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+def _parse_value(value, low, high, names, name_base):
+    if names and value in names:
+        return names.index(value) + name_base
+    if not value.isdigit() or not low <= int(value) <= high:
+        raise ValueError(f"cron value {value!r} must be between {low} and {high}")
+    return int(value)
+
+
+# The longest delay AHK timers support.
+MAX_DELAY = (2 ** 31 - 1) / 1000
+
+WM_TIMECHANGE = 0x001E
+WM_POWERBROADCAST = 0x0218
+
+
+class _Engine:
+    # Keeps the jobs in a heap ordered by their next run, and a single
+    # countdown for the earliest one.
+
+    def __init__(self, now=dt.datetime.now):
+        self.now = now
+        self.heap = []
+        self.counter = itertools.count()
+        self.timer: Optional[Timer] = None
+        self.installed = False
+
+    def add(self, job):
+        self.install()
+        job._next_run = job._rule.after(self.now())
+        if job._next_run is not None:
+            heapq.heappush(self.heap, (job._next_run, next(self.counter), job))
+        self.arm()
+
+    def remove(self, job):
+        if job._next_run is None:
+            return
+        job._next_run = None
+        self.heap = [item for item in self.heap if item[2] is not job]
+        heapq.heapify(self.heap)
+        self.arm()
+
+    def upcoming(self, count):
+        return [(time, job) for time, _, job in heapq.nsmallest(count, self.heap)]
+
+    def install(self):
+        if self.installed:
+            return
+        from .window_message import on_message
+        # Both messages are broadcast to all top-level windows, including the
+        # hidden main window of AHK.
+        on_message(WM_TIMECHANGE, self.arm)
+        on_message(WM_POWERBROADCAST, self.arm)
+        self.installed = True
+
+    def arm(self):
+        if self.timer is None:
+            self.timer = Timer(func=self.tick, periodic=False)
+        if not self.heap:
+            self.timer.stop()
+            return
+        delay = (self.heap[0][0] - self.now()).total_seconds()
+        self.timer.start(min(max(delay, 0), MAX_DELAY))
+
+    def tick(self):
+        now = self.now()
+        try:
+            while self.heap and self.heap[0][0] <= now:
+                _, _, job = heapq.heappop(self.heap)
+                # The missed runs are coalesced into one.
+                job._next_run = job._rule.after(now)
+                if job._next_run is not None:
+                    heapq.heappush(self.heap, (job._next_run, next(self.counter), job))
+                job.func()
+        finally:
+            # The timer may fire early if the system clock was changed. Then
+            # it's just re-armed.
+            self.arm()
+
+
+_engine = _Engine()
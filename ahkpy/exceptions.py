@@ -42,3 +42,55 @@ class Error(Exception):
             return
 
         super().__setattr__(name, value)
+
+
+class WindowHungError(Error):
+    """The error that is raised when the target window doesn't respond.
+
+    Before a window/control command is executed, the target window is checked
+    for being hung. If Windows considers the window hung, or it doesn't
+    process messages within :attr:`Settings.hung_window_timeout` seconds when
+    the setting is given, the command is not executed, and this error is
+    raised instead of blocking every hotkey in the script.
+
+    In addition to the :exc:`Error` attributes, contains the following
+    attributes:
+
+    .. attribute:: hwnd
+
+       The handle of the window that is not responding.
+
+    .. attribute:: pid
+
+       The identifier of the process that owns the window.
+    """
+
+    def __init__(self, message, what=None, extra=None, file=None, line=None, *, hwnd=None, pid=None):
+        super().__init__(message, what, extra, file, line)
+        self.hwnd = hwnd
+        self.pid = pid
+
+
+class RegistrationError(Error):
+    """The error that is raised when some of the hotkeys or hotstrings passed
+    to :meth:`HotkeyContext.register_many` or
+    :meth:`HotkeyContext.load_hotstrings` couldn't be registered.
+
+    The rest of them are registered regardless. In addition to the
+    :exc:`Error` attributes, contains the following attributes:
+
+    .. attribute:: registered
+
+       The list of the :class:`Hotkey` or :class:`Hotstring` instances that
+       were registered.
+
+    .. attribute:: errors
+
+       The dictionary that maps the key names or triggers that failed to the
+       AHK error messages.
+    """
+
+    def __init__(self, message, what=None, extra=None, file=None, line=None, *, registered=(), errors=None):
+        super().__init__(message, what, extra, file, line)
+        self.registered = list(registered)
+        self.errors = dict(errors or {})
@@ -20,7 +20,47 @@ __all__ = [
 ]
 
 
-global_ahk_lock = threading.RLock()
+# The per-thread state. The pool threads set the 'marshal' attribute to an
+# object that forwards AHK calls to the main thread.
+_thread_state = threading.local()
+
+
+class _AHKLock:
+    # The reentrant lock that is not taken in the pool threads. Their AHK
+    # calls are executed by the main thread, so a pool thread holding the lock
+    # while waiting for the main thread would deadlock it. Instead, the locked
+    # block of a pool thread is marshaled to the main thread as a whole, see
+    # pool._Marshal.
+
+    def __init__(self):
+        self._lock = threading.RLock()
+
+    def acquire(self, blocking=True, timeout=-1):
+        marshal = getattr(_thread_state, "marshal", None)
+        if marshal is not None:
+            marshal.begin()
+            return True
+        return self._lock.acquire(blocking, timeout)
+
+    def release(self):
+        marshal = getattr(_thread_state, "marshal", None)
+        if marshal is not None:
+            marshal.end()
+            return
+        self._lock.release()
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+
+global_ahk_lock = _AHKLock()
+
+# Whether the main script is running in the AHK auto-execute section, whose
+# settings become the defaults of the other AHK threads.
+_in_auto_execute = False
 
 
 def ahk_call(cmd: str, *args):
@@ -28,6 +68,10 @@ def ahk_call(cmd: str, *args):
 
     Use this function when there's no appropriate AutoHotkey.py API.
     """
+    marshal = getattr(_thread_state, "marshal", None)
+    if marshal is not None:
+        return marshal(cmd, args)
+
     locked = global_ahk_lock.acquire(timeout=1)
     if not locked:
         if threading.current_thread() is threading.main_thread():
@@ -243,3 +287,29 @@ def _wrap_callback(func, arg_names, bare_cb, keyword_cb):
     else:
         msg = f"the following keyword arguments are missing: {', '.join(missing_args)}"
         raise TypeError(msg)
+
+
+def _rate_limit_args(debounce, throttle, coalesce):
+    # Convert the rate limiting options to the arguments of the AHK
+    # RateLimiter: throttle and debounce in milliseconds, and coalesce.
+    if debounce is not None and throttle is not None:
+        raise ValueError("debounce and throttle cannot be used together")
+    if debounce is not None and coalesce:
+        raise ValueError("debounce always coalesces the events")
+    result = []
+    for name, value in (("throttle", throttle), ("debounce", debounce)):
+        if value is None:
+            result.append(0)
+        elif value <= 0:
+            raise ValueError(f"{name} must be positive")
+        else:
+            result.append(max(1, int(value * 1000)))
+    result.append(1 if coalesce else 0)
+    return tuple(result)
+
+
+def _suppressed_count(func) -> int:
+    counts = ahk_call("RateLimiterCounts", func)
+    if not counts:
+        return 0
+    return counts["Events"] - counts["Calls"] - counts["Pending"]
@@ -0,0 +1,91 @@
+import bisect
+import dataclasses as dc
+from typing import List, Optional, Tuple
+
+__all__ = [
+    "Histogram",
+]
+
+
+DEFAULT_BOUNDS = (
+    0.0001, 0.0002, 0.0005,
+    0.001, 0.002, 0.005,
+    0.01, 0.02, 0.05,
+    0.1, 0.2, 0.5,
+    1.0,
+)
+
+
+@dc.dataclass
+class Histogram:
+    """The histogram of durations in seconds.
+
+    The durations are counted in buckets with the upper *bounds* in seconds.
+    The last bucket counts the durations that exceed the greatest bound. By
+    default, the buckets grow from 0.1 ms to 1 s in the 1-2-5 progression.
+    """
+
+    #: The upper bounds of the buckets in seconds, in ascending order.
+    bounds: Tuple[float, ...] = DEFAULT_BOUNDS
+
+    #: The number of durations in each bucket. Has one more item than
+    #: :attr:`bounds` for the durations greater than the last bound.
+    counts: List[int] = dc.field(default=None)
+
+    #: The number of added durations.
+    count: int = 0
+
+    #: The sum of added durations in seconds.
+    total: float = 0.0
+
+    #: The longest added duration in seconds.
+    max: float = 0.0
+
+    def __post_init__(self):
+        self.bounds = tuple(self.bounds)
+        if list(self.bounds) != sorted(self.bounds):
+            raise ValueError("bounds must be in ascending order")
+        if self.counts is None:
+            self.counts = [0] * (len(self.bounds) + 1)
+
+    def add(self, value: float):
+        """Count the duration of *value* seconds."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def reset(self):
+        """Forget all the added durations."""
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @property
+    def mean(self) -> float:
+        """The average duration in seconds."""
+        if not self.count:
+            return 0.0
+        return self.total / self.count
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Estimate the duration in seconds that *percent* of the added
+        durations don't exceed.
+
+        The result is the upper bound of the bucket that contains the
+        percentile, or :attr:`max` if it's in the last bucket. Returns ``None``
+        if the histogram is empty.
+        """
+        if not 0 <= percent <= 100:
+            raise ValueError("percent must be between 0 and 100")
+        if not self.count:
+            return None
+        rank = percent / 100 * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank and seen > 0:
+                return min(bound, self.max)
+        return self.max
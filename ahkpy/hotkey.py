@@ -1,14 +1,21 @@
 from __future__ import annotations
 
+import ctypes
 import dataclasses as dc
 import functools
-from typing import Callable
+import warnings
+from typing import Callable, Dict, List, Mapping, Optional
 
 from . import hotkey_context
-from .flow import ahk_call, _wrap_callback
+from .exceptions import RegistrationError
+from .flow import ahk_call, _rate_limit_args, _suppressed_count, _wrap_callback
+from .histogram import Histogram
+from .pool import _dispatcher
 
 __all__ = [
     "Hotkey",
+    "HotkeyStats",
+    "get_hotkey_stats",
 ]
 
 
@@ -21,6 +28,12 @@ def hotkey(
     priority=0,
     max_threads=1,
     input_level=0,
+    stats=False,
+    budget=None,
+    run_in=None,
+    debounce=None,
+    throttle=None,
+    coalesce=False,
 ):
     """hotkey(key_name: str, func: Callable = None, *args, **options)
 
@@ -61,6 +74,43 @@ def hotkey(
         <https://www.autohotkey.com/docs/commands/_InputLevel.htm>`_ of the
         hotkey. Defaults to 0.
 
+    :param bool stats: collect the :class:`HotkeyStats` of the hotkey,
+        available in :attr:`Hotkey.stats`. Defaults to ``False``.
+
+    :param float budget: the time in seconds the *func* is expected to finish
+        in. If the *func* runs longer, a :exc:`RuntimeWarning` is issued.
+        Implies *stats*. Defaults to ``None``.
+
+    :param str run_in: if ``"thread"`` or ``"process"``, *func* is executed in
+        a pool of threads or processes instead of the AHK thread, so that a
+        long-running *func* doesn't block other hotkeys. The hotkey presses are
+        queued in the order of *priority*, and the *max_threads* and *buffer*
+        options limit the number of queued and running calls of the *func*.
+        AHK calls made from the pool threads are executed in the main thread;
+        the calls made by a single AutoHotkey.py function, like :func:`send`, are
+        executed together, so they share the AHK thread settings. In the
+        ``"process"`` mode, *func* and *args* must be picklable, and *func*
+        cannot call AHK. The number of workers is set by
+        :func:`set_pool_size`. Defaults to ``None``, which executes *func* in
+        the AHK thread.
+
+    :param float debounce: call *func* only after the key hasn't been pressed
+        for *debounce* seconds, for example, once the key auto-repeat stops.
+        Defaults to ``None``.
+
+    :param float throttle: call *func* at most once in *throttle* seconds and
+        ignore the presses in between. Defaults to ``None``.
+
+    :param bool coalesce: merge the presses that arrive while *func* is running
+        into a single call after it returns. Combined with *throttle*, the last
+        ignored press is delivered at the end of the period instead. The
+        *max_threads* and *buffer* options are ignored. Defaults to ``False``.
+
+    The *debounce*, *throttle*, and *coalesce* options are enforced on the AHK
+    side, so the suppressed presses don't call Python at all. The number of
+    suppressed presses is available in :attr:`Hotkey.suppressed_count`. These
+    options cannot be combined with *stats*.
+
     If *func* is given, returns an instance of :class:`Hotkey`. Otherwise, the
     method works as a decorator::
 
@@ -87,6 +137,12 @@ def hotkey(
             priority=priority,
             max_threads=max_threads,
             input_level=input_level,
+            stats=stats,
+            budget=budget,
+            run_in=run_in,
+            debounce=debounce,
+            throttle=throttle,
+            coalesce=coalesce,
         )
         hk.enable()
         return hk
@@ -105,6 +161,70 @@ def hotkey(
     return hotkey_decorator(func)
 
 
+def register_many(
+    ctx,
+    mapping: Mapping[str, Callable],
+    *,
+    buffer=False,
+    priority=0,
+    max_threads=1,
+    input_level=0,
+) -> List[Hotkey]:
+    """register_many(mapping: Mapping[str, Callable], **options) -> List[ahkpy.Hotkey]
+
+    Register many hotkeys at once.
+
+    The *mapping* maps the *key_name* of each hotkey to its *func*. The
+    keyword-only *options* apply to all the hotkeys. For more information about
+    the arguments refer to :meth:`HotkeyContext.hotkey`.
+
+    Unlike calling :meth:`HotkeyContext.hotkey` in a loop, the context is
+    entered only once, and all the hotkeys are registered and enabled in a
+    single call to AHK, which makes registering hundreds of hotkeys much
+    faster::
+
+        ahkpy.default_context.register_many({
+            "F1": lambda: print("F1"),
+            "F2": lambda: print("F2"),
+        })
+
+    Returns the list of :class:`Hotkey` instances in the order of *mapping*.
+    If some of the hotkeys couldn't be registered, the rest are still
+    registered, and a :exc:`RegistrationError` is raised. Its
+    :attr:`~RegistrationError.registered` attribute holds the registered
+    hotkeys, and :attr:`~RegistrationError.errors` maps the failed key names
+    to the error messages.
+
+    :command: `Hotkey <https://www.autohotkey.com/docs/commands/Hotkey.htm>`_
+    """
+    option_str = _option_str(buffer, priority, max_threads, input_level)
+    hotkeys = []
+    entries = []
+    for key_name, func in mapping.items():
+        if not key_name:
+            raise ValueError("key_name must not be blank")
+        hk = Hotkey(key_name, context=ctx)
+        entries.append((key_name, hk._wrap(func), option_str))
+        hotkeys.append(hk)
+
+    with ctx._manager():
+        errors = ahk_call("HotkeyMany", tuple(entries))
+
+    if errors:
+        failed = {}
+        for error in errors.values():
+            index, message = error[1], error[2]
+            failed[hotkeys[index-1].key_name] = message
+        failures = "; ".join(f"{key_name!r}: {message}" for key_name, message in failed.items())
+        raise RegistrationError(
+            f"failed to register hotkeys: {failures}",
+            "Hotkey",
+            registered=[hk for hk in hotkeys if hk.key_name not in failed],
+            errors=failed,
+        )
+    return hotkeys
+
+
 @dc.dataclass(frozen=True)
 class Hotkey:
     """Hotkey(key_name: str, context: ahkpy.HotkeyContext)
@@ -144,43 +264,251 @@ class Hotkey:
         with self.context._manager():
             ahk_call("HotkeySpecial", self.key_name, "Toggle")
 
-    def update(self, *, func=None, buffer=None, priority=None, max_threads=None, input_level=None):
+    @property
+    def stats(self) -> Optional["HotkeyStats"]:
+        """The dispatch statistics of the hotkey (read-only).
+
+        Returns ``None`` unless the hotkey was registered with ``stats=True``.
+
+        :type: HotkeyStats
+        """
+        probe = _probes.get(self)
+        if probe is None:
+            return None
+        return probe.stats
+
+    @property
+    def suppressed_count(self) -> int:
+        """The number of presses suppressed by the *debounce*, *throttle*, and
+        *coalesce* options (read-only).
+
+        :type: int
+        """
+        func = _limited.get(self)
+        if func is None:
+            return 0
+        return _suppressed_count(func)
+
+    def update(self, *, func=None, buffer=None, priority=None, max_threads=None, input_level=None,
+               stats=None, budget=None, run_in=None, debounce=None, throttle=None, coalesce=None):
         """Update the hotkey callback and options.
 
         For more information about the arguments refer to
-        :meth:`HotkeyContext.hotkey`.
+        :meth:`HotkeyContext.hotkey`. The *run_in*, *debounce*, *throttle*, and
+        *coalesce* arguments apply to the *func* passed in the same call, and
+        *func* is required to use them.
         """
         if func is not None:
-            if not callable(func):
-                raise TypeError(f"object {func!r} must be callable")
+            func = self._wrap(func)
+        if run_in is not None:
+            if func is None:
+                raise ValueError("func is required to change run_in")
+            func = _dispatcher(func, run_in, priority, max_threads, buffer)
+
+        limit = _rate_limit_args(debounce, throttle, coalesce)
+        probe = _probes.get(self)
+        if budget is not None:
+            stats = True
+        if any(limit):
+            if func is None:
+                raise ValueError("func is required to limit the hotkey rate")
+            if stats:
+                raise ValueError("stats cannot be combined with debounce, throttle, or coalesce")
+            stats = False
+        elif stats is None:
+            stats = probe is not None
+
+        if not stats:
+            if probe is not None:
+                # Replace the probe with the bare callback.
+                del _probes[self]
+                if func is None:
+                    func = probe.func
+                if max_threads is None:
+                    max_threads = probe.max_threads
+                if buffer is None:
+                    buffer = probe.buffer
+            throttle_ms, debounce_ms, coalesce = limit
+            if coalesce and not throttle_ms:
+                # Let the second press reach the limiter while func is
+                # running.
+                max_threads = 2
+                buffer = False
+            option_str = _option_str(buffer, priority, max_threads, input_level)
+            with self.context._manager():
+                ahk_call("Hotkey", self.key_name, func, option_str, *limit)
+            if any(limit):
+                _limited[self] = func
+            elif func is not None:
+                _limited.pop(self, None)
+            return
+
+        if probe is None:
+            if func is None:
+                raise ValueError("func is required to start collecting hotkey stats")
+            probe = _Probe(self, func)
+        elif func is not None:
+            probe.func = func
+        if func is not None:
+            _limited.pop(self, None)
+        if budget is not None:
+            probe.budget = budget
+        if max_threads is not None:
+            probe.max_threads = max_threads
+        if buffer is not None:
+            probe.buffer = bool(buffer)
 
-            func = _wrap_callback(
-                func,
-                ("hotkey",),
-                _bare_hotkey_handler,
-                functools.partial(_hotkey_handler, hotkey=self),
-            )
+        option_str = _option_str(None, priority, None, input_level)
+        with self.context._manager():
+            ahk_call("HotkeyProbe", self.key_name, probe, option_str, probe.max_threads, probe.buffer)
+        _probes[self] = probe
+
+    def _wrap(self, func):
+        if not callable(func):
+            raise TypeError(f"object {func!r} must be callable")
+
+        return _wrap_callback(
+            func,
+            ("hotkey",),
+            _bare_hotkey_handler,
+            functools.partial(_hotkey_handler, hotkey=self),
+        )
 
-        options = []
 
-        if buffer:
-            options.append("B")
-        elif buffer is not None:
-            options.append("B0")
+def _option_str(buffer, priority, max_threads, input_level):
+    options = []
 
-        if priority is not None:
-            options.append(f"P{priority}")
+    if buffer:
+        options.append("B")
+    elif buffer is not None:
+        options.append("B0")
 
-        if max_threads is not None:
-            options.append(f"T{max_threads}")
+    if priority is not None:
+        options.append(f"P{priority}")
 
-        if input_level is not None:
-            options.append(f"I{input_level}")
+    if max_threads is not None:
+        options.append(f"T{max_threads}")
 
-        option_str = "".join(options)
+    if input_level is not None:
+        options.append(f"I{input_level}")
 
-        with self.context._manager():
-            ahk_call("Hotkey", self.key_name, func, option_str)
+    return "".join(options)
+
+
+@dc.dataclass
+class HotkeyStats:
+    """The dispatch statistics of a hotkey registered with ``stats=True``.
+
+    All durations are in seconds and measured with the `QueryPerformanceCounter
+    <https://docs.microsoft.com/en-us/windows/win32/api/profileapi/nf-profileapi-queryperformancecounter>`_
+    clock.
+    """
+
+    #: The number of times the hotkey function was called.
+    calls: int = 0
+
+    #: The number of keypresses ignored because *max_threads* of the hotkey
+    #: were already running. AHK itself ignores the keypresses that arrive
+    #: while another ignored or buffered keypress is still being counted, so
+    #: a burst of keypresses can be undercounted.
+    dropped: int = 0
+
+    #: The number of keypresses buffered because *max_threads* of the hotkey
+    #: were already running and *buffer* was enabled.
+    buffered: int = 0
+
+    #: The number of calls that exceeded the *budget*.
+    over_budget: int = 0
+
+    #: The time from AHK launching the hotkey thread to the start of the
+    #: hotkey function. Includes the time buffered keypresses spent waiting.
+    dispatch_latency: Histogram = dc.field(default_factory=Histogram)
+
+    #: The execution time of the hotkey function.
+    run_time: Histogram = dc.field(default_factory=Histogram)
+
+    def reset(self):
+        """Reset all the counters to zero."""
+        self.calls = 0
+        self.dropped = 0
+        self.buffered = 0
+        self.over_budget = 0
+        self.dispatch_latency.reset()
+        self.run_time.reset()
+
+
+def get_hotkey_stats() -> Dict[Hotkey, HotkeyStats]:
+    """Get the statistics of all hotkeys registered with ``stats=True``.
+
+    The following example prints the 99th percentile of the handler latency of
+    each hotkey::
+
+        for hotkey, stats in ahkpy.get_hotkey_stats().items():
+            p99 = stats.dispatch_latency.percentile(99)
+            print(hotkey.key_name, p99)
+    """
+    return {hotkey: probe.stats for hotkey, probe in _probes.items()}
+
+
+class _Probe:
+    # The callback that AHK calls through _HotkeyProbeCall. Measures the
+    # dispatch latency and the run time of the hotkey function.
+
+    def __init__(self, hotkey, func):
+        self.hotkey = hotkey
+        self.func = func
+        self.stats = HotkeyStats()
+        self.budget = None
+        self.max_threads = 1
+        self.buffer = False
+
+    def __call__(self, event, stamp):
+        stats = self.stats
+        if event == "dropped":
+            stats.dropped += 1
+            return
+        if event == "buffered":
+            stats.buffered += 1
+            return
+
+        start = _perf_counter()
+        try:
+            self.func()
+        finally:
+            end = _perf_counter()
+            frequency = _qpc_frequency()
+            run_time = (end - start) / frequency
+            stats.calls += 1
+            stats.dispatch_latency.add((start - stamp) / frequency)
+            stats.run_time.add(run_time)
+            if self.budget is not None and run_time > self.budget:
+                stats.over_budget += 1
+                warnings.warn(
+                    f"hotkey {self.hotkey.key_name!r} took {run_time * 1000:.1f} ms, "
+                    f"exceeding the budget of {self.budget * 1000:.1f} ms",
+                    RuntimeWarning,
+                )
+
+
+_probes: Dict[Hotkey, _Probe] = {}
+# The callbacks of the hotkeys registered with the rate limiting options.
+_limited: Dict[Hotkey, Callable] = {}
+
+
+def _perf_counter():
+    # Use the same clock as the AHK side to compare the timestamps. Every call
+    # gets its own buffer, so that the probes interrupting each other don't
+    # overwrite the value.
+    value = ctypes.c_int64()
+    ctypes.windll.kernel32.QueryPerformanceCounter(ctypes.byref(value))
+    return value.value
+
+
+@functools.lru_cache(maxsize=None)
+def _qpc_frequency():
+    frequency = ctypes.c_int64()
+    ctypes.windll.kernel32.QueryPerformanceFrequency(ctypes.byref(frequency))
+    return frequency.value
 
 
 def _bare_hotkey_handler(func):
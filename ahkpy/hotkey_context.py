@@ -1,19 +1,27 @@
+import ctypes
 import dataclasses as dc
 import functools
+import time
 from contextlib import contextmanager
-from typing import Callable, Optional, Union
+from typing import Callable, Mapping, Optional, Union
 
 from .hotkey import hotkey as _hotkey
+from .hotkey import register_many as _register_many
 from .hotstring import hotstring as _hotstring
+from .hotstring import load_hotstrings as _load_hotstrings
+from .key_sequence import sequence as _sequence
 from .remap_key import remap_key as _remap_key
 from .flow import ahk_call, global_ahk_lock, _wrap_callback
 
 __all__ = [
     "HotkeyContext",
+    "PredicateStats",
     "default_context",
     "hotkey",
     "hotstring",
+    "load_hotstrings",
     "remap_key",
+    "sequence",
 ]
 
 
@@ -42,6 +50,13 @@ class HotkeyContext:
         ctx = ahkpy.HotkeyContext(is_mouse_over_taskbar)
         ctx.hotkey("F1", ahkpy.message_box, "Pressed F1 over the taskbar.")
 
+    If the *cache* argument is true, the result of *active_when* is memoized
+    for the current foreground window and focused control, and the callable is
+    executed again only after the user switches to another window or control,
+    or the title of the foreground window changes. Use it only if the callable
+    depends on nothing but the active window and its focused control. The
+    cache performance is available in :attr:`predicate_stats`.
+
     :command: `Hotkey, If, % FunctionObject
        <https://www.autohotkey.com/docs/commands/Hotkey.htm#IfFn>`_
     """
@@ -52,19 +67,33 @@ class HotkeyContext:
     # TODO: Consider adding context options: MaxThreadsBuffer,
     # MaxThreadsPerHotkey, and InputLevel.
 
-    def __init__(self, active_when: Callable = None, *args):
+    def __init__(self, active_when: Callable = None, *args, cache=False):
         if active_when is None:
             object.__setattr__(self, "active_when", None)
             return
 
         active_when = _wrap_callback(
             functools.partial(active_when, *args),
-            ("hotkey",),
+            ("hot_id",),
             _bare_predicate,
             _predicate,
         )
+        if cache:
+            active_when = _CachedPredicate(active_when)
         object.__setattr__(self, "active_when", active_when)
 
+    @property
+    def predicate_stats(self) -> Optional["PredicateStats"]:
+        """The statistics of the cached *active_when* callable (read-only).
+
+        Returns ``None`` unless the context was created with ``cache=True``.
+
+        :type: PredicateStats
+        """
+        if isinstance(self.active_when, _CachedPredicate):
+            return self.active_when.stats
+        return None
+
     # Copy arguments verbatim to make Pylance's suggestions work. Use
     # functools.wraps so that the API docs are generated.
 
@@ -78,6 +107,12 @@ class HotkeyContext:
         priority=0,
         max_threads=1,
         input_level=0,
+        stats=False,
+        budget=None,
+        run_in=None,
+        debounce=None,
+        throttle=None,
+        coalesce=False,
     ):
         return _hotkey(
             self,
@@ -88,11 +123,40 @@ class HotkeyContext:
             priority=priority,
             max_threads=max_threads,
             input_level=input_level,
+            stats=stats,
+            budget=budget,
+            run_in=run_in,
+            debounce=debounce,
+            throttle=throttle,
+            coalesce=coalesce,
+        )
+
+    @functools.wraps(_register_many)
+    def register_many(
+        self,
+        mapping: Mapping[str, Callable],
+        *,
+        buffer=False,
+        priority=0,
+        max_threads=1,
+        input_level=0,
+    ):
+        return _register_many(
+            self,
+            mapping,
+            buffer=buffer,
+            priority=priority,
+            max_threads=max_threads,
+            input_level=input_level,
         )
 
+    @functools.wraps(_sequence)
+    def sequence(self, keys: str, func: Callable = None, *args, timeout=1):
+        return _sequence(self, keys, func, *args, timeout=timeout)
+
     @functools.wraps(_remap_key)
-    def remap_key(self, origin_key, destination_key, *, mode=None, level=None):
-        return _remap_key(self, origin_key, destination_key, mode=mode, level=level)
+    def remap_key(self, origin_key, destination_key, *, mode=None, level=None, native=False):
+        return _remap_key(self, origin_key, destination_key, mode=mode, level=level, native=native)
 
     @functools.wraps(_hotstring)
     def hotstring(
@@ -111,6 +175,7 @@ class HotkeyContext:
         mode=None,
         key_delay=None,
         reset_recognizer=False,
+        run_in=None,
     ):
         return _hotstring(
             self,
@@ -128,8 +193,29 @@ class HotkeyContext:
             mode=mode,
             key_delay=key_delay,
             reset_recognizer=reset_recognizer,
+            run_in=run_in,
         )
 
+    @functools.wraps(_load_hotstrings)
+    def load_hotstrings(self, source, *, file_format=None, encoding="utf-8", cache=True, **defaults):
+        return _load_hotstrings(self, source, file_format=file_format, encoding=encoding, cache=cache, **defaults)
+
+    @property
+    def is_native(self) -> bool:
+        """Whether AHK checks the context on its own, without calling Python
+        (read-only).
+
+        The contexts created by :meth:`Windows.window_context`,
+        :meth:`Windows.nonexistent_window_context`,
+        :meth:`Windows.active_window_context`, and
+        :meth:`Windows.inactive_window_context` are native if the window
+        criteria has no exclusions, doesn't include hidden windows, and uses
+        the ``"startswith"`` title and ``"fast"`` text match modes.
+
+        :type: bool
+        """
+        return False
+
     @contextmanager
     def _manager(self):
         # I don't want to make HotkeyContext a Python context manager, because
@@ -168,6 +254,49 @@ class HotkeyContext:
             ahk_call("HotkeyExitContext")
 
 
+@dc.dataclass(frozen=True)
+class _WindowContext(HotkeyContext):
+    # The window context that is checked natively by AHK with Hotkey,
+    # IfWinActive/IfWinExist/IfWinNotActive/IfWinNotExist. The active_when
+    # predicate is kept for introspection and is not called by AHK.
+
+    criterion: str
+    win_title: str
+    win_text: str
+    __slots__ = ("criterion", "win_title", "win_text")
+
+    def __init__(self, criterion, win_title, win_text, active_when):
+        super().__init__(active_when)
+        object.__setattr__(self, "criterion", criterion)
+        object.__setattr__(self, "win_title", win_title)
+        object.__setattr__(self, "win_text", win_text)
+
+    @property
+    def is_native(self):
+        return True
+
+    # The active_when predicate is a new lambda for every context. Compare the
+    # criteria, so that the same hotkey registered twice in the same window
+    # context is the same Hotkey.
+
+    def __eq__(self, other):
+        if not isinstance(other, _WindowContext):
+            return NotImplemented
+        return self._criteria() == other._criteria()
+
+    def __hash__(self):
+        return hash(self._criteria())
+
+    def _criteria(self):
+        return (self.criterion, self.win_title, self.win_text)
+
+    def _enter(self):
+        ahk_call("HotkeyWinContext", self.criterion, self.win_title, self.win_text)
+
+    def _exit(self):
+        ahk_call("HotkeyExitContext")
+
+
 def _bare_predicate(func, *_):
     return bool(func())
 
@@ -176,7 +305,200 @@ def _predicate(func, hot_id):
     return bool(func(hot_id=hot_id))
 
 
+@dc.dataclass
+class PredicateStats:
+    """The statistics of a cached :class:`HotkeyContext` predicate."""
+
+    #: The number of times AHK asked whether the context is active.
+    calls: int = 0
+
+    #: The number of calls answered from the cache.
+    hits: int = 0
+
+    #: The total time in seconds spent executing the predicate on cache
+    #: misses.
+    eval_time: float = 0.0
+
+    #: The longest execution of the predicate in seconds.
+    max_eval_time: float = 0.0
+
+    @property
+    def misses(self) -> int:
+        """The number of calls that executed the predicate."""
+        return self.calls - self.hits
+
+    @property
+    def hit_rate(self) -> float:
+        """The share of calls answered from the cache, from 0 to 1."""
+        if not self.calls:
+            return 0.0
+        return self.hits / self.calls
+
+    @property
+    def mean_eval_time(self) -> float:
+        """The average execution time of the predicate in seconds."""
+        if not self.misses:
+            return 0.0
+        return self.eval_time / self.misses
+
+
+class _CachedPredicate:
+    # Memoizes the predicate result for the pair of the foreground window and
+    # the focused control. The cache is dropped when the window event hooks
+    # report a change in activation, focus, or the foreground window title.
+
+    def __init__(self, func):
+        self.func = func
+        self.uses_hot_id = func.func is _predicate
+        self.stats = PredicateStats()
+        self.cache = {}
+        self.generation = None
+        _install_focus_hooks()
+
+    def __call__(self, hot_id):
+        stats = self.stats
+        stats.calls += 1
+        if self.generation != _focus_generation:
+            self.cache.clear()
+            self.generation = _focus_generation
+
+        key = (_get_focus(), hot_id if self.uses_hot_id else None)
+        try:
+            result = self.cache[key]
+        except KeyError:
+            pass
+        else:
+            stats.hits += 1
+            return result
+
+        start = time.perf_counter()
+        result = self.func(hot_id)
+        elapsed = time.perf_counter() - start
+        stats.eval_time += elapsed
+        stats.max_eval_time = max(stats.max_eval_time, elapsed)
+        self.cache[key] = result
+        return result
+
+
+_focus_generation = 0
+_focus_hooks = []
+_name_change_hook = None
+_gui_thread_info = None
+
+
+def _get_focus():
+    global _gui_thread_info
+    user32 = _user32()
+    if _gui_thread_info is None:
+        from ctypes import wintypes
+
+        class GUITHREADINFO(ctypes.Structure):
+            _fields_ = [
+                ("cbSize", wintypes.DWORD),
+                ("flags", wintypes.DWORD),
+                ("hwndActive", wintypes.HWND),
+                ("hwndFocus", wintypes.HWND),
+                ("hwndCapture", wintypes.HWND),
+                ("hwndMenuOwner", wintypes.HWND),
+                ("hwndMoveSize", wintypes.HWND),
+                ("hwndCaret", wintypes.HWND),
+                ("rcCaret", wintypes.RECT),
+            ]
+
+        _gui_thread_info = GUITHREADINFO(cbSize=ctypes.sizeof(GUITHREADINFO))
+
+    hwnd = user32.GetForegroundWindow()
+    focus = None
+    thread_id = user32.GetWindowThreadProcessId(hwnd, None)
+    if thread_id and user32.GetGUIThreadInfo(thread_id, ctypes.byref(_gui_thread_info)):
+        focus = _gui_thread_info.hwndFocus
+    return hwnd, focus
+
+
+def _install_focus_hooks():
+    if _focus_hooks:
+        return
+
+    from ctypes import wintypes
+
+    EVENT_SYSTEM_FOREGROUND = 0x0003
+    EVENT_OBJECT_FOCUS = 0x8005
+    EVENT_OBJECT_NAMECHANGE = 0x800C
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    OBJID_WINDOW = 0
+
+    user32 = _user32()
+
+    def hook_name_change(hwnd):
+        # Only the title of the foreground window matters. Limit the hook to
+        # the window's thread instead of receiving the name changes of every
+        # object in the system, and move it when the foreground changes.
+        global _name_change_hook
+        if _name_change_hook:
+            user32.UnhookWinEvent(_name_change_hook)
+            _name_change_hook = None
+        pid = wintypes.DWORD()
+        thread_id = user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid)) if hwnd else 0
+        if thread_id:
+            _name_change_hook = user32.SetWinEventHook(
+                EVENT_OBJECT_NAMECHANGE, EVENT_OBJECT_NAMECHANGE, None, proc, pid.value, thread_id,
+                WINEVENT_OUTOFCONTEXT,
+            )
+
+    def on_event(hook, event, hwnd, id_object, id_child, thread_id, event_time):
+        if event == EVENT_SYSTEM_FOREGROUND:
+            hook_name_change(hwnd)
+        elif event == EVENT_OBJECT_NAMECHANGE:
+            if id_object != OBJID_WINDOW or hwnd != user32.GetForegroundWindow():
+                return
+        global _focus_generation
+        _focus_generation += 1
+
+    # The hook callback must stay alive as long as the hooks are installed.
+    proc = _win_event_proc_type()(on_event)
+    _focus_hooks.append(proc)
+    for event in (EVENT_SYSTEM_FOREGROUND, EVENT_OBJECT_FOCUS):
+        handle = user32.SetWinEventHook(event, event, None, proc, 0, 0, WINEVENT_OUTOFCONTEXT)
+        _focus_hooks.append(handle)
+    hook_name_change(user32.GetForegroundWindow())
+
+
+@functools.lru_cache(maxsize=None)
+def _win_event_proc_type():
+    from ctypes import wintypes
+
+    return ctypes.WINFUNCTYPE(
+        None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND, wintypes.LONG, wintypes.LONG, wintypes.DWORD,
+        wintypes.DWORD,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _user32():
+    # Private instance, so the prototypes don't leak into ctypes.windll and
+    # don't break the other callers of these functions.
+    from ctypes import wintypes
+
+    user32 = ctypes.WinDLL("user32", use_last_error=True)
+    user32.GetForegroundWindow.argtypes = ()
+    user32.GetForegroundWindow.restype = wintypes.HWND
+    user32.GetWindowThreadProcessId.argtypes = (wintypes.HWND, wintypes.LPDWORD)
+    user32.GetWindowThreadProcessId.restype = wintypes.DWORD
+    user32.GetGUIThreadInfo.argtypes = (wintypes.DWORD, ctypes.c_void_p)
+    user32.GetGUIThreadInfo.restype = wintypes.BOOL
+    user32.SetWinEventHook.argtypes = (
+        wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, _win_event_proc_type(), wintypes.DWORD, wintypes.DWORD,
+        wintypes.DWORD,
+    )
+    user32.SetWinEventHook.restype = wintypes.HANDLE
+    user32.UnhookWinEvent.argtypes = (wintypes.HANDLE,)
+    user32.UnhookWinEvent.restype = wintypes.BOOL
+    return user32
+
+
 default_context = HotkeyContext()
 hotkey = default_context.hotkey
 remap_key = default_context.remap_key
 hotstring = default_context.hotstring
+load_hotstrings = default_context.load_hotstrings
+sequence = default_context.sequence
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
+import csv
 import dataclasses as dc
 import functools
-from typing import Callable, Union
+import io
+import json
+import os
+from typing import Callable, Iterable, List, Mapping, Union
 
 from . import hotkey_context
+from .exceptions import RegistrationError
 from .flow import ahk_call, _wrap_callback
-from .sending import _get_send_mode
+from .pool import _dispatcher
+from .sending import _get_send_mode, send
+from .text_insertion import insert_text
 
 __all__ = [
     "Hotstring",
@@ -34,6 +41,7 @@ def hotstring(
     mode=None,
     key_delay=None,
     reset_recognizer=False,
+    run_in=None,
 ):
     """hotstring(trigger: str, repl: Union[str, Callable] = None, *args, **options)
 
@@ -116,7 +124,13 @@ def hotstring(
 
     - **mode** – the method by which auto-replace hotstrings send their
       keystrokes. Defaults to one currently set in :attr:`Settings.send_mode`.
-      For the list of valid modes refer to :func:`~ahkpy.send`.
+      For the list of valid modes refer to :func:`~ahkpy.send`. Additionally,
+      the ``"paste"`` mode inserts the *repl* string literally with
+      :func:`~ahkpy.insert_text` through the clipboard, which is faster for
+      long replacements. The backspaces, the paste shortcut, and the end char
+      are sent in the current :attr:`Settings.send_mode` with the hotstring's
+      *key_delay* and send level. The *conform_to_case* option has no effect
+      in this mode.
 
     - **key_delay** (:class:`float`) – the delay between keystrokes produced by
       auto-backspacing and auto-replacement. Defaults to 0 for Event and Play
@@ -144,6 +158,12 @@ def hotstring(
 
       Defaults to ``False``.
 
+    - **run_in** – if ``"thread"`` or ``"process"`` and *repl* is a callable,
+      executes *repl* in a pool instead of the AHK thread. The queued calls
+      are ordered by *priority*, and only one call of *repl* is queued or
+      running at a time. For more information refer to
+      :meth:`HotkeyContext.hotkey`. Defaults to ``None``.
+
     If *repl* is given, returns an instance of :class:`Hotstring`.
     Otherwise, the method works as a decorator.
 
@@ -156,11 +176,8 @@ def hotstring(
         if callable(repl) and args:
             repl = functools.partial(repl, *args)
         nonlocal mode, key_delay
-        mode = _get_send_mode(mode, key_delay)
-        if key_delay is None and mode != "input":
-            # Wanted to use Settings.key_delay for default, but zero delay
-            # is a more suitable default for hotstrings.
-            key_delay = 0
+        if mode != "paste":
+            mode, key_delay = _hotstring_send_mode(mode, key_delay)
         hs = Hotstring(trigger, case_sensitive, replace_inside_word, context=ctx)
         hs.update(
             repl=repl,
@@ -173,6 +190,7 @@ def hotstring(
             mode=mode,
             key_delay=key_delay,
             reset_recognizer=reset_recognizer,
+            run_in=run_in,
         )
         # Enable the hotstring in case another hotstring with the same
         # 'string' existed before, but was disabled.
@@ -184,6 +202,259 @@ def hotstring(
     return hotstring_decorator(repl)
 
 
+HOTSTRING_OPTIONS = {
+    "case_sensitive": False,
+    "conform_to_case": True,
+    "replace_inside_word": False,
+    "wait_for_end_char": True,
+    "omit_end_char": False,
+    "backspacing": True,
+    "priority": 0,
+    "text": False,
+    "mode": None,
+    "key_delay": None,
+    "reset_recognizer": False,
+}
+
+HOTSTRING_FILE_FORMATS = {"csv", "tsv", "json"}
+
+
+def load_hotstrings(ctx, source, *, file_format=None, encoding="utf-8", cache=True, **defaults) -> List[Hotstring]:
+    """load_hotstrings(source, *, file_format=None, encoding="utf-8", cache=True, **options) -> List[ahkpy.Hotstring]
+
+    Register the text replacement hotstrings from a dictionary file or an
+    iterable.
+
+    If *source* is a path, the file is parsed according to its extension, or
+    the *file_format* if it's given. The supported formats are the following:
+
+    - ``"tsv"`` and ``"csv"`` – each row holds the trigger and its
+      replacement. If the first row starts with ``trigger``, it's a header
+      that names the columns, such as ``trigger``, ``replacement``, and the
+      per-entry *options*, e.g. ``case_sensitive``.
+    - ``"json"`` – either an object that maps the triggers to replacements,
+      or an array of objects with the ``trigger`` and ``replacement`` keys,
+      and the optional per-entry *options*.
+
+    If *source* is a mapping, it maps the triggers to replacements. Otherwise,
+    *source* must be an iterable of ``(trigger, replacement)`` pairs or of
+    mappings like the JSON objects above.
+
+    The keyword *options* set the defaults for all entries. For their
+    descriptions refer to :meth:`HotkeyContext.hotstring`. The entries in the
+    ``"paste"`` *mode* are registered with a callback that pastes the
+    replacement, like the ones created with :meth:`HotkeyContext.hotstring`.
+
+    The entries that identify the same hotstring, that is, that have the same
+    trigger, *case_sensitive*, and *replace_inside_word* options, are
+    deduplicated, and the last one wins. All hotstrings are registered and
+    enabled in a single call to AHK::
+
+        ahkpy.load_hotstrings("abbreviations.tsv", wait_for_end_char=False)
+
+    If *cache* is true, the entries parsed from a file are saved to the
+    ``__pycache__`` directory next to the file and reused on the next start
+    until the file or the *options* change.
+
+    Returns the list of :class:`Hotstring` instances. If some of the
+    hotstrings couldn't be registered, the rest are still registered, and a
+    :exc:`RegistrationError` holding the registered hotstrings and the error
+    messages of the failed triggers is raised.
+
+    :command: `Hotstring
+       <https://www.autohotkey.com/docs/commands/Hotstring.htm>`_
+    """
+    unknown = set(defaults) - set(HOTSTRING_OPTIONS)
+    if unknown:
+        raise TypeError(f"unexpected keyword arguments: {', '.join(sorted(unknown))}")
+    defaults = {**HOTSTRING_OPTIONS, **defaults}
+
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        if file_format is None:
+            file_format = os.path.splitext(path)[1][1:].lower()
+        if file_format not in HOTSTRING_FILE_FORMATS:
+            raise ValueError(f"{file_format!r} is not a valid hotstring file format")
+        compiled = _load_compiled(path, file_format, encoding, defaults, cache)
+    else:
+        compiled = _compile_hotstrings(_iter_entries(source), defaults)
+
+    hotstrings = []
+    entries = []
+    for option_str, trigger, replacement, case_sensitive, replace_inside_word, paste in compiled:
+        hs = Hotstring(trigger, case_sensitive, replace_inside_word, context=ctx)
+        if paste is not None:
+            replacement = hs._paste_callback(replacement, *paste)
+        hotstrings.append(hs)
+        entries.append((f":{option_str}:{trigger}", replacement))
+
+    with ctx._manager():
+        errors = ahk_call("HotstringMany", tuple(entries))
+
+    if errors:
+        failed = {}
+        for error in errors.values():
+            index, message = error[1], error[2]
+            failed[index - 1] = message
+        failures = "; ".join(f"{hotstrings[index].trigger!r}: {message}" for index, message in failed.items())
+        raise RegistrationError(
+            f"failed to register hotstrings: {failures}",
+            "Hotstring",
+            registered=[hs for index, hs in enumerate(hotstrings) if index not in failed],
+            errors={hotstrings[index].trigger: message for index, message in failed.items()},
+        )
+    return hotstrings
+
+
+def _load_compiled(path, file_format, encoding, defaults, cache):
+    stat = os.stat(path)
+    key = {
+        # Bump the version when the compiled format changes.
+        "version": 2,
+        "mtime": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "file_format": file_format,
+        "encoding": encoding,
+        "defaults": defaults,
+        "send_mode": _get_send_mode(),
+    }
+    directory, name = os.path.split(os.path.abspath(path))
+    cache_path = os.path.join(directory, "__pycache__", f"{name}.hotstrings.json")
+    if cache:
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached["key"] == key:
+                return cached["hotstrings"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    with open(path, encoding=encoding, newline="") as f:
+        entries = list(_parse_file(f, file_format))
+    compiled = _compile_hotstrings(entries, defaults)
+
+    if cache:
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(cache_path, "w", encoding="utf-8") as f:
+                json.dump({"key": key, "hotstrings": compiled}, f)
+        except OSError:
+            pass
+    return compiled
+
+
+def _parse_file(f: io.TextIOBase, file_format):
+    if file_format == "json":
+        data = json.load(f)
+        if not isinstance(data, (dict, list)):
+            raise ValueError("hotstring JSON must be an object or an array")
+        yield from _iter_entries(data)
+        return
+
+    if file_format == "tsv":
+        reader = csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE)
+    else:
+        reader = csv.reader(f)
+    header = None
+    for row in reader:
+        if not row or not any(row):
+            continue
+        if header is None and row[0].strip().lower() == "trigger":
+            header = [column.strip().lower() for column in row]
+            continue
+        if header is None:
+            if len(row) != 2:
+                raise ValueError(f"line {reader.line_num}: expected trigger and replacement, got {row!r}")
+            yield {"trigger": row[0], "replacement": row[1]}
+        else:
+            yield {
+                column: _parse_option(column, value)
+                for column, value in zip(header, row)
+                if value != "" or column in ("trigger", "replacement")
+            }
+
+
+def _parse_option(name, value):
+    default = HOTSTRING_OPTIONS.get(name)
+    if isinstance(default, bool):
+        lowered = value.strip().lower()
+        if lowered in ("1", "true", "yes"):
+            return True
+        if lowered in ("0", "false", "no"):
+            return False
+        raise ValueError(f"{value!r} is not a valid value for {name}")
+    if name == "priority":
+        return int(value)
+    if name == "key_delay":
+        return float(value)
+    return value
+
+
+def _iter_entries(source: Union[Mapping, Iterable]):
+    if isinstance(source, Mapping):
+        for trigger, replacement in source.items():
+            yield {"trigger": trigger, "replacement": replacement}
+        return
+    for item in source:
+        if isinstance(item, Mapping):
+            yield item
+        else:
+            trigger, replacement = item
+            yield {"trigger": trigger, "replacement": replacement}
+
+
+def _compile_hotstrings(entries, defaults):
+    # Build the AHK option strings and deduplicate the entries by the
+    # hotstring identity. Returns the list of [option_str, trigger,
+    # replacement, case_sensitive, replace_inside_word, paste], where paste
+    # is None or the [backspacing, omit_end_char, key_delay] of a paste mode
+    # entry.
+    send_modes = {}
+    result = {}
+    for entry in entries:
+        entry = dict(entry)
+        try:
+            trigger = entry.pop("trigger")
+            replacement = entry.pop("replacement")
+        except KeyError as exc:
+            raise ValueError(f"hotstring entry {entry!r} is missing the {exc.args[0]!r} key") from None
+        if not trigger:
+            raise ValueError("trigger must not be blank")
+        if not isinstance(replacement, str) or not replacement:
+            raise ValueError(f"replacement of {trigger!r} must be a non-empty string")
+        unknown = set(entry) - set(HOTSTRING_OPTIONS)
+        if unknown:
+            raise ValueError(f"hotstring {trigger!r} has unknown options: {', '.join(sorted(unknown))}")
+        options = {**defaults, **entry}
+
+        mode, key_delay = options["mode"], options["key_delay"]
+        paste = None
+        if mode == "paste":
+            # AHK doesn't know the paste mode. The entry is registered with a
+            # callback that does the backspacing by itself and resolves the
+            # send mode when the hotstring fires.
+            paste = [bool(options["backspacing"]), bool(options["omit_end_char"]), key_delay]
+            options["backspacing"], options["mode"] = False, None
+        else:
+            if (mode, key_delay) not in send_modes:
+                send_modes[mode, key_delay] = _hotstring_send_mode(mode, key_delay)
+            options["mode"], options["key_delay"] = send_modes[mode, key_delay]
+
+        case_sensitive = bool(options["case_sensitive"])
+        replace_inside_word = bool(options["replace_inside_word"])
+        if not case_sensitive:
+            trigger = trigger.lower()
+        option_str = _option_str(
+            case_sensitive, replace_inside_word, options["conform_to_case"], options["wait_for_end_char"],
+            options["omit_end_char"], options["backspacing"], options["priority"], options["text"],
+            options["mode"], options["key_delay"], options["reset_recognizer"],
+        )
+        result[trigger, case_sensitive, replace_inside_word] = [
+            option_str, trigger, replacement, case_sensitive, replace_inside_word, paste,
+        ]
+    return list(result.values())
+
+
 @dc.dataclass(frozen=True)
 class Hotstring:
     """Hotstring(trigger: str, case_sensitive: bool, replace_inside_word: bool, context: ahkpy.HotkeyContext)
@@ -249,82 +520,129 @@ class Hotstring:
 
     def update(
         self, *, repl=None, conform_to_case=None, wait_for_end_char=None, omit_end_char=None, backspacing=None,
-        priority=None, text=None, mode=None, key_delay=None, reset_recognizer=None,
+        priority=None, text=None, mode=None, key_delay=None, reset_recognizer=None, run_in=None,
     ):
         """Update the hotstring's *repl* and options.
 
         For more information about the arguments refer to
-        :meth:`HotkeyContext.hotstring`.
+        :meth:`HotkeyContext.hotstring`. The *run_in* argument applies to the
+        callable *repl* passed in the same call.
         """
-        if callable(repl):
+        if mode == "paste":
+            if not isinstance(repl, str) or not repl:
+                raise ValueError("paste mode requires a non-empty string repl")
+            # AHK doesn't know the paste mode, so the hotstring calls
+            # insert_text and does the backspacing by itself.
+            repl = self._paste_callback(repl, backspacing is not False, bool(omit_end_char), key_delay)
+            repl = _dispatcher(repl, run_in, priority)
+            backspacing, mode = False, None
+        elif callable(repl):
             repl = _wrap_callback(
                 repl,
                 ("hotstring",),
                 _bare_hotstring_handler,
                 functools.partial(_hotstring_handler, hotstring=self),
             )
+            repl = _dispatcher(repl, run_in, priority)
+        elif run_in is not None:
+            raise ValueError("run_in requires a callable repl")
 
-        options = []
+        option_str = _option_str(
+            self.case_sensitive, self.replace_inside_word, conform_to_case, wait_for_end_char, omit_end_char,
+            backspacing, priority, text, mode, key_delay, reset_recognizer,
+        )
 
-        if self.case_sensitive:
-            options.append("C")
-        elif conform_to_case:
-            options.append("C0")
-        elif conform_to_case is not None:
-            options.append("C1")
+        with self.context._manager():
+            ahk_call("Hotstring", f":{option_str}:{self.trigger}", repl)
 
-        if self.replace_inside_word:
-            options.append("?")
-        else:
-            options.append("?0")
+    def _paste_callback(self, repl, backspacing, omit_end_char, key_delay):
+        return functools.partial(_paste_replacement, repl, len(self.trigger), backspacing, omit_end_char, key_delay)
 
-        if wait_for_end_char is False:
-            options.append("*")
-        elif omit_end_char:
-            options.append("*0")
-            options.append("O")
-        else:
-            if wait_for_end_char:
-                options.append("*0")
-            if omit_end_char is False:
-                options.append("O0")
-
-        if backspacing:
-            options.append("B")
-        elif backspacing is not None:
-            options.append("B0")
-
-        if key_delay is not None:
-            if key_delay > 0:
-                key_delay = int(key_delay * 1000)
-            options.append(f"K{key_delay}")
-
-        if priority is not None:
-            options.append(f"P{priority}")
-
-        if text:
-            options.append("T")
-        elif text is not None:
-            options.append("T0")
-
-        if mode == "input":
-            options.append("SI")
-        elif mode == "play":
-            options.append("SP")
-        elif mode == "event":
-            options.append("SE")
-        elif mode is not None:
-            raise ValueError(f"{mode!r} is not a valid send mode")
-
-        if reset_recognizer:
-            options.append("Z")
-        elif reset_recognizer is not None:
-            options.append("Z0")
-
-        option_str = "".join(options)
 
-        with self.context._manager():
-            ahk_call("Hotstring", f":{option_str}:{self.trigger}", repl)
+def _option_str(
+    case_sensitive, replace_inside_word, conform_to_case, wait_for_end_char, omit_end_char, backspacing, priority,
+    text, mode, key_delay, reset_recognizer,
+):
+    options = []
+
+    if case_sensitive:
+        options.append("C")
+    elif conform_to_case:
+        options.append("C0")
+    elif conform_to_case is not None:
+        options.append("C1")
+
+    if replace_inside_word:
+        options.append("?")
+    else:
+        options.append("?0")
+
+    if wait_for_end_char is False:
+        options.append("*")
+    elif omit_end_char:
+        options.append("*0")
+        options.append("O")
+    else:
+        if wait_for_end_char:
+            options.append("*0")
+        if omit_end_char is False:
+            options.append("O0")
+
+    if backspacing:
+        options.append("B")
+    elif backspacing is not None:
+        options.append("B0")
+
+    if key_delay is not None:
+        if key_delay > 0:
+            key_delay = int(key_delay * 1000)
+        options.append(f"K{key_delay}")
+
+    if priority is not None:
+        options.append(f"P{priority}")
+
+    if text:
+        options.append("T")
+    elif text is not None:
+        options.append("T0")
+
+    if mode == "input":
+        options.append("SI")
+    elif mode == "play":
+        options.append("SP")
+    elif mode == "event":
+        options.append("SE")
+    elif mode is not None:
+        raise ValueError(f"{mode!r} is not a valid send mode")
+
+    if reset_recognizer:
+        options.append("Z")
+    elif reset_recognizer is not None:
+        options.append("Z0")
+
+    return "".join(options)
+
+
+def _hotstring_send_mode(mode, key_delay):
+    mode = _get_send_mode(mode, key_delay)
+    if key_delay is None and mode != "input":
+        # Wanted to use Settings.key_delay for default, but zero delay is a
+        # more suitable default for hotstrings.
+        key_delay = 0
+    return mode, key_delay
+
+
+def _paste_replacement(repl, trigger_length, backspacing, omit_end_char, key_delay):
+    # Send at the hotstring thread's default send level, like AHK does for
+    # the auto-replace hotstrings.
+    end_char = ahk_call("GetVar", "A_EndChar")
+    level = ahk_call("GetVar", "A_SendLevel")
+    mode, key_delay = _hotstring_send_mode(None, key_delay)
+    if backspacing:
+        send(f"{{BS {trigger_length + len(end_char)}}}", mode=mode, level=level, key_delay=key_delay)
+    insert_text(repl, "paste", mode=mode, level=level, key_delay=key_delay)
+    if end_char and not omit_end_char:
+        send("{Text}" + end_char, mode=mode, level=level, key_delay=key_delay)
 
 
 def _bare_hotstring_handler(func):
@@ -0,0 +1,364 @@
+import collections
+import functools
+import itertools
+from typing import Callable, Dict, List, Optional, Union
+
+from .flow import ahk_call
+from .hotstring import HOTSTRING_OPTIONS, _hotstring_send_mode, get_hotstring_end_chars
+from .sending import send
+from .text_insertion import insert_text
+
+__all__ = [
+    "HotstringRecognizer",
+]
+
+
+RECOGNIZER_OPTIONS = {
+    name: HOTSTRING_OPTIONS[name]
+    for name in (
+        "case_sensitive",
+        "conform_to_case",
+        "replace_inside_word",
+        "wait_for_end_char",
+        "omit_end_char",
+        "backspacing",
+        "text",
+        "mode",
+        "key_delay",
+        "reset_recognizer",
+    )
+}
+
+# The keys that move the caret and make the typed text meaningless.
+RESET_KEYS = "{Left}{Right}{Up}{Down}{Home}{End}{PgUp}{PgDn}{Delete}{Esc}"
+
+
+class HotstringRecognizer:
+    """The hotstring engine that matches the typed text in Python.
+
+    AHK checks all hotstrings against the typed text on every keystroke, which
+    becomes slow with tens of thousands of hotstrings. The recognizer receives
+    the typed characters from an `InputHook
+    <https://www.autohotkey.com/docs/commands/InputHook.htm>`_ and matches
+    all the triggers at once with an Aho–Corasick automaton, so the cost of a
+    keystroke doesn't depend on the number of hotstrings::
+
+        recognizer = ahkpy.HotstringRecognizer(wait_for_end_char=False)
+        for trigger, replacement in medical_abbreviations.items():
+            recognizer.add(trigger, replacement)
+        recognizer.start()
+
+    The keyword *options* set the defaults for the hotstrings added to the
+    recognizer. The supported options are *case_sensitive*,
+    *conform_to_case*, *replace_inside_word*, *wait_for_end_char*,
+    *omit_end_char*, *backspacing*, *text*, *mode*, *key_delay*, and
+    *reset_recognizer*. For their descriptions refer to
+    :meth:`HotkeyContext.hotstring`.
+
+    The *end_chars* argument sets the end chars of the recognizer. Defaults to
+    the end chars returned by :func:`get_hotstring_end_chars` at the time the
+    recognizer is started.
+
+    The recognizer ignores the input sent by AHK with the send level below
+    *level*. The replacements are sent with the level 0, so the recognizer
+    doesn't see them.
+
+    Unlike the AHK hotstrings, the recognizer doesn't respect the hotkey
+    contexts and is not reset by mouse clicks. It's reset by the keys that
+    move the caret, like the arrows, :kbd:`Home`, and :kbd:`End`.
+    """
+
+    def __init__(self, *, end_chars: Optional[str] = None, level=1, **options):
+        unknown = set(options) - set(RECOGNIZER_OPTIONS)
+        if unknown:
+            raise TypeError(f"unexpected keyword arguments: {', '.join(sorted(unknown))}")
+        self.defaults = {**RECOGNIZER_OPTIONS, **options}
+        self.end_chars = end_chars
+        self.level = level
+        self._matcher = _Matcher()
+        self._hook_id = None
+
+    def add(self, trigger: str, repl: Union[str, Callable], *args, **options):
+        """Add the hotstring to the recognizer.
+
+        If *repl* is a string, the typed trigger is replaced with it. If
+        *repl* is a callable, it's called with the optional positional *args*
+        when the hotstring is triggered.
+
+        The keyword *options* override the recognizer defaults. Adding the
+        hotstring with the same *trigger*, *case_sensitive*, and
+        *replace_inside_word* options replaces the existing one.
+        """
+        unknown = set(options) - set(RECOGNIZER_OPTIONS)
+        if unknown:
+            raise TypeError(f"unexpected keyword arguments: {', '.join(sorted(unknown))}")
+        if not trigger:
+            raise ValueError("trigger must not be blank")
+        if callable(repl):
+            if args:
+                repl = functools.partial(repl, *args)
+        elif not isinstance(repl, str) or not repl:
+            raise TypeError(f"object {repl!r} must be callable or a non-empty string")
+        self._matcher.add(trigger, repl, {**self.defaults, **options})
+
+    def remove(self, trigger: str, *, case_sensitive=None, replace_inside_word=None):
+        """Remove the hotstring from the recognizer.
+
+        The *case_sensitive* and *replace_inside_word* options default to the
+        recognizer defaults.
+        """
+        if case_sensitive is None:
+            case_sensitive = self.defaults["case_sensitive"]
+        if replace_inside_word is None:
+            replace_inside_word = self.defaults["replace_inside_word"]
+        self._matcher.remove(trigger, bool(case_sensitive), bool(replace_inside_word))
+
+    def __len__(self):
+        return len(self._matcher.entries)
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the recognizer receives the keystrokes (read-only).
+
+        :type: bool
+        """
+        return self._hook_id is not None
+
+    def start(self):
+        """Start receiving the keystrokes and triggering the hotstrings."""
+        if self._hook_id is not None:
+            return
+        end_chars = self.end_chars
+        if end_chars is None:
+            end_chars = get_hotstring_end_chars()
+        self._matcher.end_chars = frozenset(end_chars)
+        self._matcher.reset()
+        self._hook_id = ahk_call("HotstringInputHookStart", self.level, self._on_char, self._on_reset, RESET_KEYS)
+
+    def stop(self):
+        """Stop receiving the keystrokes."""
+        if self._hook_id is None:
+            return
+        ahk_call("HotstringInputHookStop", self._hook_id)
+        self._hook_id = None
+
+    def reset(self):
+        """Forget the typed text and wait for an entirely new hotstring."""
+        self._matcher.reset()
+
+    def _on_char(self, char):
+        match = self._matcher.feed(char)
+        if match is not None:
+            self._fire(*match)
+
+    def _on_reset(self):
+        self._matcher.reset()
+
+    def _fire(self, entry, typed, end_char):
+        options = entry.options
+        if callable(entry.repl):
+            entry.repl()
+            return
+
+        repl = entry.repl
+        if not options["case_sensitive"] and options["conform_to_case"]:
+            repl = _conform_to_case(typed, repl)
+        if end_char is not None and not options["omit_end_char"]:
+            tail = end_char
+        else:
+            tail = ""
+
+        paste = options["mode"] == "paste"
+        mode, key_delay = _hotstring_send_mode(None if paste else options["mode"], options["key_delay"])
+
+        if options["backspacing"]:
+            count = len(typed) + (1 if end_char is not None else 0)
+            send(f"{{BS {count}}}", mode=mode, level=0, key_delay=key_delay)
+        if paste:
+            insert_text(repl, "paste", mode=mode, level=0, key_delay=key_delay)
+            if tail:
+                send("{Text}" + tail, mode=mode, level=0, key_delay=key_delay)
+        elif options["text"]:
+            send("{Text}" + repl + tail, mode=mode, level=0, key_delay=key_delay)
+        else:
+            send(repl, mode=mode, level=0, key_delay=key_delay)
+            if tail:
+                send("{Text}" + tail, mode=mode, level=0, key_delay=key_delay)
+
+
+def _conform_to_case(typed, repl):
+    letters = [c for c in typed if c.isalpha()]
+    if not letters:
+        return repl
+    if all(c.isupper() for c in letters) and len(letters) > 1:
+        return repl.upper()
+    if letters[0].isupper():
+        return repl[:1].upper() + repl[1:]
+    return repl
+
+
+class _Entry:
+    __slots__ = ("trigger", "repl", "options", "seq")
+
+    def __init__(self, trigger, repl, options, seq):
+        self.trigger = trigger
+        self.repl = repl
+        self.options = options
+        self.seq = seq
+
+
+class _Automaton:
+    # The Aho–Corasick automaton over the triggers. Each state is an index.
+    # 'outputs' holds the entries whose trigger ends exactly at the state, and
+    # 'dict_links' points to the next state on the failure chain that has
+    # outputs, so that all the matches are enumerated without walking the
+    # whole chain.
+
+    def __init__(self, patterns: Dict[str, List[_Entry]]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.outputs: List[List[_Entry]] = [[]]
+        self.depth = [0]
+        for pattern, entries in patterns.items():
+            state = 0
+            for char in pattern:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.outputs.append([])
+                    self.depth.append(self.depth[state] + 1)
+                state = next_state
+            self.outputs[state] = entries
+
+        self.fail = [0] * len(self.goto)
+        self.dict_links = [0] * len(self.goto)
+        queue = collections.deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[child] = target if target != child else 0
+                fail = self.fail[child]
+                self.dict_links[child] = fail if self.outputs[fail] else self.dict_links[fail]
+                queue.append(child)
+
+    def step(self, state, char):
+        while state and char not in self.goto[state]:
+            state = self.fail[state]
+        return self.goto[state].get(char, 0)
+
+    def matches(self, state):
+        if not self.outputs[state]:
+            state = self.dict_links[state]
+        while state:
+            yield self.depth[state], self.outputs[state]
+            state = self.dict_links[state]
+
+
+class _Matcher:
+    # Tracks the typed text and finds the hotstring to trigger. Doesn't call
+    # AHK, so it can be tested on its own.
+
+    def __init__(self):
+        self.entries: Dict[tuple, _Entry] = {}
+        self.end_chars = frozenset(" \t\n-()[]{}':;\"/\\,.?!")
+        self.counter = itertools.count()
+        self.automata: Optional[tuple] = None
+        self.max_length = 0
+        self.reset()
+
+    def add(self, trigger, repl, options):
+        case_sensitive = bool(options["case_sensitive"])
+        replace_inside_word = bool(options["replace_inside_word"])
+        key = (trigger if case_sensitive else trigger.lower(), case_sensitive, replace_inside_word)
+        previous = self.entries.get(key)
+        seq = previous.seq if previous is not None else next(self.counter)
+        self.entries[key] = _Entry(key[0], repl, options, seq)
+        self.automata = None
+
+    def remove(self, trigger, case_sensitive, replace_inside_word):
+        key = (trigger if case_sensitive else trigger.lower(), case_sensitive, replace_inside_word)
+        if self.entries.pop(key, None) is not None:
+            self.automata = None
+
+    def reset(self):
+        self.states = (0, 0)
+        # The states before each typed char, for backspacing, and the typed
+        # chars to check the word boundaries and conform to case.
+        self.history = collections.deque()
+
+    def _build(self):
+        sensitive: Dict[str, List[_Entry]] = {}
+        insensitive: Dict[str, List[_Entry]] = {}
+        for (trigger, case_sensitive, _), entry in self.entries.items():
+            patterns = sensitive if case_sensitive else insensitive
+            patterns.setdefault(trigger, []).append(entry)
+        self.automata = (_Automaton(sensitive), _Automaton(insensitive))
+        self.max_length = max((len(trigger) for trigger, _, _ in self.entries), default=0)
+        self.reset()
+
+    def feed(self, char):
+        """Process the typed char.
+
+        Returns a tuple of the triggered entry, the typed trigger, and the end
+        char, or ``None``.
+        """
+        if self.automata is None:
+            self._build()
+        if char == "\b":
+            if self.history:
+                self.states = self.history.pop()[0]
+            else:
+                # The erased char is older than the longest trigger.
+                self.states = (0, 0)
+            return None
+        if char < " " and char not in "\t\n":
+            # A control character, e.g. typed with Ctrl.
+            self.reset()
+            return None
+
+        match = None
+        if char in self.end_chars:
+            match = self._find(wait_for_end_char=True)
+
+        states = self.states
+        self.history.append((states, char))
+        if len(self.history) > self.max_length + 1:
+            self.history.popleft()
+        sensitive, insensitive = self.automata
+        self.states = (sensitive.step(states[0], char), insensitive.step(states[1], char.lower()))
+
+        if match is not None:
+            match = (*match, char)
+        else:
+            match = self._find(wait_for_end_char=False)
+            if match is not None:
+                match = (*match, None)
+        if match is not None and match[0].options["reset_recognizer"]:
+            self.reset()
+        return match
+
+    def _find(self, wait_for_end_char):
+        best = None
+        typed_len = len(self.history)
+        for automaton, state in zip(self.automata, self.states):
+            for length, entries in automaton.matches(state):
+                for entry in entries:
+                    if bool(entry.options["wait_for_end_char"]) != wait_for_end_char:
+                        continue
+                    if not entry.options["replace_inside_word"]:
+                        if length < typed_len:
+                            before = self.history[-length - 1][1]
+                            if before.isalnum():
+                                continue
+                    if best is None or entry.seq < best[0].seq:
+                        best = (entry, length)
+        if best is None:
+            return None
+        entry, length = best
+        typed = "".join(char for _, char in itertools.islice(self.history, typed_len - length, typed_len))
+        return entry, typed
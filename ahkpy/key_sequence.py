@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import dataclasses as dc
+import functools
+from typing import Callable, Dict, Optional, Tuple
+
+from . import hotkey_context
+from .flow import _wrap_callback
+from .timer import Timer
+
+__all__ = [
+    "KeySequence",
+]
+
+
+def sequence(ctx, keys: str, func: Callable = None, *args, timeout=1):
+    """sequence(keys: str, func: Callable = None, *args, timeout=1)
+
+    Register *func* to be called when the keys are pressed one after another.
+
+    The *keys* argument is a space-separated list of keystrokes. Each keystroke
+    is either a combination of modifiers and a key joined with ``+``, such as
+    ``Ctrl+x`` or ``Ctrl+Shift+s``, or a hotkey name in the AHK notation, such
+    as ``^x``. The supported modifiers are ``Ctrl``, ``Alt``, ``Shift``, and
+    ``Win``::
+
+        ahkpy.sequence("Ctrl+x Ctrl+s", lambda: print("saved"))
+        ahkpy.sequence("Ctrl+x k", lambda: print("killed"))
+
+    The first keystroke of a sequence is registered as a hotkey in the context.
+    The following keystrokes work as hotkeys only while the sequence is in
+    progress, and otherwise reach the active window as usual.
+
+    If the next keystroke of the sequence is not pressed within *timeout*
+    seconds, the sequence is abandoned. If a sequence is a prefix of another
+    sequence, *func* is called after the timeout unless the longer sequence
+    is continued.
+
+    When the sequence is completed, *func* is called with the
+    :class:`KeySequence` instance as the *sequence* argument if the function
+    supports it.
+
+    The optional positional *args* will be passed to the *func* when it is
+    called. If you want the *func* to be called with keyword arguments use
+    :func:`functools.partial`.
+
+    Sequences are matched by a prefix tree, so each keystroke costs the same
+    regardless of the number of registered sequences, and only a single timer
+    is used to track the timeout of the pending sequence.
+
+    If *func* is given, returns an instance of :class:`KeySequence`.
+    Otherwise, the method works as a decorator.
+    """
+    strokes = _parse_keys(keys)
+    if timeout is not None and timeout <= 0:
+        raise ValueError("timeout must be positive")
+
+    def sequence_decorator(func):
+        if args:
+            func = functools.partial(func, *args)
+        seq = KeySequence(strokes, context=ctx)
+        if not callable(func):
+            raise TypeError(f"object {func!r} must be callable")
+        func = _wrap_callback(
+            func,
+            ("sequence",),
+            _bare_sequence_handler,
+            functools.partial(_sequence_handler, sequence=seq),
+        )
+        _get_engine(ctx).add(strokes, func, timeout)
+        return seq
+
+    if func is None:
+        return sequence_decorator
+    return sequence_decorator(func)
+
+
+@dc.dataclass(frozen=True)
+class KeySequence:
+    """KeySequence(keys: Tuple[str, ...], context: ahkpy.HotkeyContext)
+
+    The immutable object representing a key sequence registered in the given
+    context. The *keys* are the keystrokes in the AHK hotkey notation.
+
+    Creating an instance of :class:`!KeySequence` doesn't register it in AHK.
+    Use the :meth:`HotkeyContext.sequence` method instead.
+    """
+
+    keys: Tuple[str, ...]
+    context: hotkey_context.HotkeyContext
+    __slots__ = ("keys", "context")
+
+    def remove(self):
+        """Unregister the key sequence."""
+        _get_engine(self.context).remove(self.keys)
+
+
+def _bare_sequence_handler(func):
+    func()
+
+
+def _sequence_handler(func, sequence):
+    func(sequence=sequence)
+
+
+MODIFIERS = {
+    "ctrl": "^",
+    "control": "^",
+    "alt": "!",
+    "shift": "+",
+    "win": "#",
+}
+
+
+def _parse_keys(keys: str) -> Tuple[str, ...]:
+    strokes = tuple(_parse_stroke(stroke) for stroke in str(keys).split())
+    if not strokes:
+        raise ValueError("keys must not be blank")
+    return strokes
+
+
+def _parse_stroke(stroke):
+    if stroke.endswith("++"):
+        parts = stroke[:-2].split("+") + ["+"]
+    else:
+        parts = stroke.split("+")
+    *modifiers, key = parts
+    if not key or not all(mod.lower() in MODIFIERS for mod in modifiers):
+        # Use the keystroke as is, e.g. "^+x".
+        return stroke.lower()
+    prefix = "".join(sorted({MODIFIERS[mod.lower()] for mod in modifiers}))
+    return prefix + key.lower()
+
+
+class _Node:
+    __slots__ = ("children", "func", "timeout", "max_timeout")
+
+    def __init__(self):
+        self.children: Dict[str, _Node] = {}
+        self.func: Optional[Callable] = None
+        self.timeout: Optional[float] = None
+        # The longest timeout of the sequences in the subtree, or None if any
+        # of them waits indefinitely.
+        self.max_timeout: Optional[float] = 0
+
+    def update_max_timeout(self):
+        timeouts = [child.max_timeout for child in self.children.values()]
+        if self.func is not None:
+            timeouts.append(self.timeout)
+        if None in timeouts:
+            self.max_timeout = None
+        else:
+            self.max_timeout = max(timeouts, default=0)
+
+
+class _Trie:
+    # The state machine that matches the keystrokes against the registered
+    # sequences. Doesn't call AHK, so it can be tested on its own.
+
+    def __init__(self):
+        self.root = _Node()
+        self.pending: Optional[_Node] = None
+
+    def add(self, strokes, func, timeout):
+        path = [self.root]
+        for stroke in strokes:
+            path.append(path[-1].children.setdefault(stroke, _Node()))
+        path[-1].func = func
+        path[-1].timeout = timeout
+        self._update_path(path)
+
+    def remove(self, strokes):
+        path = [self.root]
+        for stroke in strokes:
+            node = path[-1].children.get(stroke)
+            if node is None:
+                return False
+            path.append(node)
+        if path[-1].func is None:
+            return False
+        path[-1].func = None
+        path[-1].timeout = None
+        # Drop the branches that don't lead to any sequence.
+        for stroke, parent, node in zip(reversed(strokes), reversed(path[:-1]), reversed(path[1:])):
+            if node.func is not None or node.children:
+                break
+            del parent.children[stroke]
+            if self.pending is node:
+                self.pending = None
+        self._update_path(path)
+        return True
+
+    def _update_path(self, path):
+        # Only the nodes on the path to the changed sequence can change their
+        # max timeout. The detached nodes are updated too, which is harmless.
+        for node in reversed(path):
+            node.update_max_timeout()
+
+    def expects(self, stroke):
+        return self.pending is not None and stroke in self.pending.children
+
+    def feed(self, stroke):
+        """Advance the state machine.
+
+        Returns a tuple of the function to call, or ``None``, and the timeout
+        to wait for the next keystroke, or ``None`` if no sequence is pending.
+        """
+        node = None
+        if self.pending is not None:
+            node = self.pending.children.get(stroke)
+        if node is None:
+            node = self.root.children.get(stroke)
+        if node is None:
+            self.pending = None
+            return None, None
+        if node.children:
+            self.pending = node
+            # Wait for the longest timeout of the sequences that continue the
+            # prefix.
+            return None, node.max_timeout
+        self.pending = None
+        return node.func, None
+
+    def expire(self):
+        """Abandon the pending sequence.
+
+        Returns the function of the pending prefix, if it's a complete sequence
+        itself.
+        """
+        node = self.pending
+        self.pending = None
+        if node is None:
+            return None
+        return node.func
+
+
+class _Engine:
+    # Connects the trie to AHK hotkeys and the timeout timer of a single hotkey
+    # context.
+
+    def __init__(self, ctx):
+        self.ctx = ctx
+        self.trie = _Trie()
+        self.hotkeys = {}
+        self.next_hotkeys = {}
+        self.timer = None
+        # The following keystrokes of all the sequences share one context.
+        self.next_ctx = hotkey_context.HotkeyContext(self.expects)
+
+    def add(self, strokes, func, timeout):
+        self.trie.add(strokes, func, timeout)
+        first, *rest = strokes
+        if first not in self.hotkeys:
+            self.hotkeys[first] = self.ctx.hotkey(first, self.on_stroke, first)
+        else:
+            self.hotkeys[first].enable()
+        for stroke in rest:
+            if stroke not in self.next_hotkeys:
+                self.next_hotkeys[stroke] = self.next_ctx.hotkey(stroke, self.on_stroke, stroke)
+
+    def expects(self, hot_id):
+        # The hot_id of a hotkey is its key name, which is the keystroke.
+        if not self.trie.expects(hot_id):
+            return False
+        active_when = self.ctx.active_when
+        return active_when is None or active_when(hot_id)
+
+    def remove(self, strokes):
+        if not self.trie.remove(strokes):
+            return
+        first = strokes[0]
+        if first not in self.trie.root.children and first in self.hotkeys:
+            self.hotkeys[first].disable()
+
+    def on_stroke(self, stroke):
+        func, timeout = self.trie.feed(stroke)
+        if self.trie.pending is not None and timeout is not None:
+            if self.timer is None:
+                self.timer = Timer(timeout, self.on_timeout, periodic=False)
+            self.timer.start(timeout)
+        elif self.timer is not None:
+            self.timer.stop()
+        if func is not None:
+            func()
+
+    def on_timeout(self):
+        func = self.trie.expire()
+        if func is not None:
+            func()
+
+
+_engines: Dict[hotkey_context.HotkeyContext, _Engine] = {}
+
+
+def _get_engine(ctx):
+    engine = _engines.get(ctx)
+    if engine is None:
+        engine = _engines[ctx] = _Engine(ctx)
+    return engine
@@ -0,0 +1,221 @@
+import functools
+from typing import Callable, Dict, List, Optional, Set, Union
+
+from . import hotkey_context
+from .hotkey import Hotkey
+from .sending import send
+
+__all__ = [
+    "Keymap",
+    "Layer",
+]
+
+
+class Keymap:
+    """The set of key bindings organized in layers, like in the QMK firmware.
+
+    Every keymap has the :attr:`base` layer that is always active. Other
+    layers are stacked on top of it when activated. When a key is pressed, the
+    binding from the topmost active layer that binds the key is executed.
+    If no active layer binds the key, the key is sent as is.
+
+    A layer is activated while a momentary key is held, or switched on and off
+    with a toggle key::
+
+        keymap = ahkpy.Keymap()
+        nav = keymap.layer("nav")
+        nav.bind("h", "{Left}")
+        nav.bind("l", "{Right}")
+        nav.bind("q", ahkpy.message_box, "Hello from the nav layer")
+        keymap.momentary("CapsLock", "nav")
+        keymap.toggle("F12", "nav")
+
+    Each key is registered as a single pair of down and up hotkeys in the
+    *context*, regardless of the number of layers that bind it. Switching
+    layers only reorders the stack of the active layers and doesn't touch
+    AHK at all. A keypress looks the key up in the active layers from the
+    top, so it costs one lookup per active layer.
+
+    The keys that are not bound in the active layers are passed through:
+    their presses and releases are sent separately, so holding the key, the
+    auto-repeat, and the modifiers work as usual.
+
+    If the *context* is not given, the hotkeys are registered in
+    :data:`default_context`.
+    """
+
+    def __init__(self, context: Optional[hotkey_context.HotkeyContext] = None):
+        if context is None:
+            context = hotkey_context.default_context
+        self.context = context
+        self._layers: Dict[str, Layer] = {}
+        self._stack: List[Layer] = []
+        self._hotkeys: Dict[str, List[Hotkey]] = {}
+        self._layer_keys: Dict[str, List[Hotkey]] = {}
+        # The keys that were pressed down without a binding and must be
+        # released the same way.
+        self._passed_through: Set[str] = set()
+        #: The bottom layer that is always active.
+        self.base = self.layer("base")
+
+    def layer(self, name: str) -> "Layer":
+        """Get the layer by its *name*, creating it if it doesn't exist."""
+        layer = self._layers.get(name)
+        if layer is None:
+            layer = self._layers[name] = Layer(self, name)
+        return layer
+
+    @property
+    def active_layers(self) -> List["Layer"]:
+        """The list of active layers from top to bottom (read-only).
+
+        :type: List[Layer]
+        """
+        return [*reversed(self._stack), self.base]
+
+    def activate(self, name: str):
+        """Put the layer on top of the active layers."""
+        layer = self.layer(name)
+        if layer is self.base or self._stack and self._stack[-1] is layer:
+            # Nothing to do, e.g. on the auto-repeat of the momentary key.
+            return
+        if layer in self._stack:
+            self._stack.remove(layer)
+        self._stack.append(layer)
+
+    def deactivate(self, name: str):
+        """Remove the layer from the active layers."""
+        layer = self.layer(name)
+        if layer in self._stack:
+            self._stack.remove(layer)
+
+    def toggle_layer(self, name: str):
+        """Activate the layer if it's not active or do the opposite."""
+        if self.layer(name).is_active:
+            self.deactivate(name)
+        else:
+            self.activate(name)
+
+    def momentary(self, key_name: str, layer: str):
+        """Activate the *layer* while the *key_name* is held down."""
+        self._bind_layer_key(
+            key_name,
+            (f"*{key_name}", self.activate, layer),
+            (f"*{key_name} Up", self.deactivate, layer),
+        )
+
+    def toggle(self, key_name: str, layer: str):
+        """Switch the *layer* on and off when *key_name* is pressed."""
+        self._bind_layer_key(key_name, (f"*{key_name}", self.toggle_layer, layer))
+
+    def _bind_layer_key(self, key_name, *hotkeys):
+        if key_name in self._hotkeys:
+            raise ValueError(f"key {key_name!r} is already bound in a layer")
+        self._layer_keys[key_name] = [
+            self.context.hotkey(hotkey_name, func, layer)
+            for hotkey_name, func, layer in hotkeys
+        ]
+
+    def _register(self, key_name):
+        if key_name in self._layer_keys:
+            raise ValueError(f"key {key_name!r} is already used to switch layers")
+        if key_name not in self._hotkeys:
+            # The $ prefix keeps the passed through keys from triggering the
+            # hotkeys again.
+            self._hotkeys[key_name] = [
+                self.context.hotkey(f"$*{key_name}", self._dispatch_down, key_name),
+                self.context.hotkey(f"$*{key_name} Up", self._dispatch_up, key_name),
+            ]
+
+    def _lookup(self, key_name):
+        # The binding of the key in the topmost active layer that binds it.
+        for layer in reversed(self._stack):
+            action = layer._bindings.get(key_name)
+            if action is not None:
+                return action
+        return self.base._bindings.get(key_name)
+
+    def _dispatch_down(self, key_name):
+        action = self._lookup(key_name)
+        if action is None:
+            # None of the active layers binds the key, let it through.
+            self._passed_through.add(key_name)
+            send("{Blind}{%s DownR}" % key_name.lstrip("*~$<>^!+#"))
+            return
+        action()
+
+    def _dispatch_up(self, key_name):
+        # The release is sent only if the press was, even if the layers were
+        # switched while the key was held.
+        if key_name in self._passed_through:
+            self._passed_through.discard(key_name)
+            send("{Blind}{%s Up}" % key_name.lstrip("*~$<>^!+#"))
+
+
+class Layer:
+    """The named set of key bindings in a :class:`Keymap`.
+
+    Creating an instance of :class:`!Layer` doesn't add it to the keymap. Use
+    the :meth:`Keymap.layer` method instead.
+    """
+
+    def __init__(self, keymap: Keymap, name: str):
+        #: The keymap the layer belongs to.
+        self.keymap = keymap
+        #: The name of the layer.
+        self.name = name
+        self._bindings: Dict[str, Callable] = {}
+
+    def bind(self, key_name: str, action: Union[str, Callable] = None, *args):
+        """Bind the *key_name* to the *action* in the layer.
+
+        If the *action* is a string, it is sent with :func:`~ahkpy.send` when
+        the key is pressed. Otherwise, it must be a callable that is called
+        with the optional positional *args*.
+
+        If the *action* is not given, the method works as a decorator::
+
+            @nav.bind("g")
+            def greet():
+                print("Hello from the nav layer")
+        """
+        if not key_name:
+            raise ValueError("key_name must not be blank")
+
+        def bind_decorator(action):
+            if isinstance(action, str):
+                func = functools.partial(send, action)
+            elif callable(action):
+                func = functools.partial(action, *args)
+            else:
+                raise TypeError(f"object {action!r} must be callable or a string")
+            self.keymap._register(key_name)
+            self._bindings[key_name] = func
+            return action
+
+        if action is None:
+            return bind_decorator
+        return bind_decorator(action)
+
+    def unbind(self, key_name: str):
+        """Remove the binding of the *key_name* from the layer."""
+        self._bindings.pop(key_name, None)
+
+    @property
+    def is_active(self) -> bool:
+        """Whether the layer is active (read-only).
+
+        :type: bool
+        """
+        return self is self.keymap.base or self in self.keymap._stack
+
+    def activate(self):
+        """Put the layer on top of the active layers."""
+        self.keymap.activate(self.name)
+
+    def deactivate(self):
+        """Remove the layer from the active layers."""
+        self.keymap.deactivate(self.name)
+
+    def __repr__(self):
+        return f"<{self.__class__.__qualname__} {self.name!r}>"
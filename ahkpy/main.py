@@ -8,6 +8,7 @@ import time
 import traceback
 
 import ahkpy as ahk
+from . import flow
 from .exceptions import Error  # noqa: F401, used in Python.ahk
 
 
@@ -38,7 +39,11 @@ def main():
         site.addsitedir(f"{venv}\\Lib\\site-packages")
 
     prepare_tray_menu()
-    run_from_args()
+    flow._in_auto_execute = True
+    try:
+        run_from_args()
+    finally:
+        flow._in_auto_execute = False
 
 
 def open_console(con, mode):
@@ -0,0 +1,182 @@
+import ctypes
+import dataclasses as dc
+import functools
+from typing import List, Optional, Tuple
+
+from .flow import ahk_call, global_ahk_lock
+from .window_message import on_message
+
+__all__ = [
+    "Monitor",
+    "monitor_from_point",
+    "monitor_from_rect",
+    "monitors",
+]
+
+
+@dc.dataclass(frozen=True)
+class Monitor:
+    """The immutable object that describes a display monitor.
+
+    All rectangles are ``(x, y, width, height)`` tuples in screen coordinates.
+    Use the :func:`monitors` function to get the list of monitors.
+    """
+
+    #: The monitor number, starting from 1, as used by AHK.
+    index: int
+
+    #: The monitor's device name, e.g. ``"\\\\.\\DISPLAY1"``.
+    name: str
+
+    #: The bounding rectangle of the monitor.
+    rect: Tuple[int, int, int, int]
+
+    #: The rectangle of the monitor without the taskbar and other registered
+    #: desktop toolbars.
+    work_area: Tuple[int, int, int, int]
+
+    #: The effective DPI of the monitor. Is 96 on systems that don't support
+    #: per-monitor DPI.
+    dpi: int
+
+    #: Whether the monitor is the primary one.
+    is_primary: bool
+
+    def contains_point(self, x, y) -> bool:
+        """Check if the point lies within the monitor bounds."""
+        mx, my, mw, mh = self.rect
+        return mx <= x < mx + mw and my <= y < my + mh
+
+
+_monitors: Optional[Tuple[Monitor, ...]] = None
+_handlers = []
+
+
+def monitors() -> List[Monitor]:
+    """Get the list of display monitors ordered by their index.
+
+    The monitor geometry is queried once and cached. The cache is invalidated
+    when the display settings or the work area change.
+
+    :command: `SysGet <https://www.autohotkey.com/docs/commands/SysGet.htm>`_
+    """
+    return list(_get_monitors())
+
+
+def monitor_from_point(x, y) -> Optional[Monitor]:
+    """Find the monitor that contains the point.
+
+    Returns ``None`` if the point is outside all monitors.
+    """
+    for monitor in _get_monitors():
+        if monitor.contains_point(x, y):
+            return monitor
+    return None
+
+
+def monitor_from_rect(x, y, width, height) -> Optional[Monitor]:
+    """Find the monitor that has the largest area of intersection with the
+    rectangle.
+
+    Useful for finding the monitor of the window::
+
+        win = ahkpy.windows.get_active()
+        monitor = ahkpy.monitor_from_rect(*win.rect)
+
+    Returns ``None`` if the rectangle doesn't intersect any monitor.
+    """
+    best = None
+    best_area = 0
+    for monitor in _get_monitors():
+        area = _intersection_area((x, y, width, height), monitor.rect)
+        if area > best_area:
+            best = monitor
+            best_area = area
+    return best
+
+
+def _intersection_area(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    width = min(ax + aw, bx + bw) - max(ax, bx)
+    height = min(ay + ah, by + bh) - max(ay, by)
+    if width <= 0 or height <= 0:
+        return 0
+    return width * height
+
+
+def _get_monitors():
+    global _monitors
+    monitors = _monitors
+    if monitors is not None:
+        return monitors
+
+    with global_ahk_lock:
+        if not _handlers:
+            WM_SETTINGCHANGE = 0x001A
+            WM_DISPLAYCHANGE = 0x007E
+            _handlers.append(on_message(WM_DISPLAYCHANGE, _invalidate))
+            _handlers.append(on_message(WM_SETTINGCHANGE, _invalidate))
+
+        primary = ahk_call("SysGet", "MonitorPrimary")
+        count = ahk_call("SysGet", "MonitorCount")
+        result = []
+        for index in range(1, count + 1):
+            rect = _to_rect(ahk_call("SysGet", "Monitor", index))
+            result.append(Monitor(
+                index=index,
+                name=ahk_call("SysGet", "MonitorName", index),
+                rect=rect,
+                work_area=_to_rect(ahk_call("SysGet", "MonitorWorkArea", index)),
+                dpi=_get_dpi(rect),
+                is_primary=index == primary,
+            ))
+        monitors = _monitors = tuple(result)
+    return monitors
+
+
+def _invalidate():
+    global _monitors
+    _monitors = None
+
+
+def _to_rect(result):
+    left, top, right, bottom = result["Left"], result["Top"], result["Right"], result["Bottom"]
+    return (left, top, right - left, bottom - top)
+
+
+def _get_dpi(rect):
+    x, y, _, _ = rect
+    MONITOR_DEFAULTTONEAREST = 0x00000002
+    MDT_EFFECTIVE_DPI = 0
+    POINT, monitor_from_point, get_dpi_for_monitor = _dpi_functions()
+    if get_dpi_for_monitor is None:
+        return 96
+    hmonitor = monitor_from_point(POINT(x, y), MONITOR_DEFAULTTONEAREST)
+    dpi_x = ctypes.c_uint()
+    dpi_y = ctypes.c_uint()
+    res = get_dpi_for_monitor(hmonitor, MDT_EFFECTIVE_DPI, ctypes.byref(dpi_x), ctypes.byref(dpi_y))
+    if res != 0:
+        return 96
+    return dpi_x.value
+
+
+@functools.lru_cache(maxsize=None)
+def _dpi_functions():
+    # Import wintypes and build the prototypes once instead of on every call.
+    # The private WinDLL instances keep the prototypes out of ctypes.windll.
+    from ctypes import wintypes
+
+    monitor_from_point = ctypes.WinDLL("user32").MonitorFromPoint
+    monitor_from_point.argtypes = (wintypes.POINT, wintypes.DWORD)
+    monitor_from_point.restype = wintypes.HMONITOR
+    try:
+        get_dpi_for_monitor = ctypes.WinDLL("shcore").GetDpiForMonitor
+    except (AttributeError, OSError):
+        # Shcore.dll is available since Windows 8.1.
+        return wintypes.POINT, monitor_from_point, None
+    get_dpi_for_monitor.argtypes = (
+        wintypes.HMONITOR, ctypes.c_int, ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_uint),
+    )
+    get_dpi_for_monitor.restype = ctypes.c_long
+    return wintypes.POINT, monitor_from_point, get_dpi_for_monitor
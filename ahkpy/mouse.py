@@ -1,7 +1,9 @@
-from typing import Tuple
+import math
+import random
+from typing import Callable, List, Sequence, Tuple, Union
 
 from .flow import ahk_call, global_ahk_lock
-from .sending import send
+from .sending import _get_send_mode, send
 from .settings import _set_coord_mode, get_settings
 from .unset import UNSET
 from .window import Control, Window
@@ -13,22 +15,17 @@ __all__ = [
     "get_cursor_type",
     "get_mouse_pos",
     "get_window_under_mouse",
+    "mouse_drag",
     "mouse_move",
+    "mouse_path",
     "mouse_press",
     "mouse_release",
     "mouse_scroll",
     "right_click",
 ]
 
-# Not implementing MouseClickDrag and passing coordinates in Click because it
-# complicates the signature. Use separate commands instead.
-#
-# MouseClickDrag:
-#
-#     ahkpy.mouse_move(x=x1, y=y1)
-#     ahkpy.mouse_press(which_button)
-#     ahkpy.mouse_move(x=x2, y=y2, speed=speed, relative_to=...)
-#     ahkpy.mouse_release()
+# Not passing coordinates in Click because it complicates the signature. Use
+# separate commands instead. MouseClickDrag is implemented by mouse_drag().
 #
 # Click with coordinates:
 #
@@ -237,6 +234,214 @@ def mouse_move(x, y, *, relative_to="window", mode=None, speed=None, delay=None)
         _send_click(str(int(x)), str(int(y)), no_click, offset, mode=mode, delay=delay)
 
 
+def mouse_path(points: Sequence[Tuple[int, int]], duration=0.5, *, shape="linear",
+               easing: Union[str, Callable[[float], float]] = "ease_in_out", relative_to="window", mode=None,
+               interval=0.01):
+    """Move the mouse cursor from its current position through the *points*
+    during *duration* seconds.
+
+    The whole trajectory is computed beforehand and played in a single AHK
+    call, which moves the cursor every *interval* seconds and keeps the
+    per-step timing with the performance counter. This makes the movement
+    smoother and cheaper than many :func:`mouse_move` calls. Between the
+    steps, AHK keeps checking its message queue, so the hotkeys and other
+    callbacks run during the movement::
+
+        ahkpy.mouse_path([(400, 300), (600, 500)], 0.8, shape="human")
+
+    The *shape* argument sets the form of the trajectory:
+
+    - ``"linear"`` – straight lines through the *points*.
+    - ``"bezier"`` – a Bézier curve from the current position to the last
+      point, with the intermediate *points* as the control points.
+    - ``"human"`` – slightly curved and jittery lines through the *points*
+      that resemble the hand movement.
+
+    The *easing* argument sets the speed along the trajectory. It's one of
+    ``"linear"``, ``"ease_in"``, ``"ease_out"``, ``"ease_in_out"``,
+    ``"minimum_jerk"``, or a function that maps the elapsed time fraction
+    from 0 to 1 to the covered distance fraction.
+
+    The *relative_to* argument works the same as in :func:`mouse_move`. If
+    it's ``"cursor"``, the *points* are relative to the starting position.
+    For the *mode* argument refer to :func:`send`.
+
+    :command: `Send, {Click X, Y, 0}
+       <https://www.autohotkey.com/docs/commands/Send.htm#Click>`_
+    """
+    if shape not in SHAPES:
+        raise ValueError(f"{shape!r} is not a valid shape")
+    if not callable(easing):
+        try:
+            easing = EASINGS[easing]
+        except KeyError:
+            raise ValueError(f"{easing!r} is not a valid easing") from None
+    if duration < 0:
+        raise ValueError("duration must be non-negative")
+    if interval <= 0:
+        raise ValueError("interval must be positive")
+    points = [(float(x), float(y)) for x, y in points]
+    if not points:
+        raise ValueError("points must not be empty")
+    mode = _get_send_mode(mode)
+    if mode not in ("input", "event", "play"):
+        raise ValueError(f"{mode!r} is not a valid send mode")
+
+    steps_count = max(math.ceil(duration / interval), 1)
+    with global_ahk_lock:
+        if relative_to == "cursor":
+            _set_coord_mode("mouse", "screen")
+            origin = ahk_call("MouseGetPos")
+            start = (origin["X"], origin["Y"])
+            points = [(start[0] + x, start[1] + y) for x, y in points]
+        else:
+            _set_coord_mode("mouse", relative_to)
+            origin = ahk_call("MouseGetPos")
+            start = (origin["X"], origin["Y"])
+        trajectory = _trajectory(start, points, steps_count, shape, easing)
+        steps = tuple(
+            (x, y, round(duration * 1000 * i / steps_count, 3))
+            for i, (x, y) in trajectory
+        )
+        ahk_call("MousePath", steps, mode)
+
+
+def mouse_drag(points: Sequence[Tuple[int, int]], duration=0.5, *, button="left", start: Tuple[int, int] = None,
+               modifier: str = None, level=None, **options):
+    """Drag the mouse through the *points* while holding the *button*.
+
+    If *start* is given, the cursor is moved there before pressing the
+    button. The *points*, *duration*, and the keyword *options* are passed to
+    :func:`mouse_path`. The *modifier* and *level* arguments work the same as
+    in :func:`click`. The button is released even if the movement fails::
+
+        ahkpy.mouse_drag([(500, 400)], start=(100, 100), shape="human")
+
+    :command: `MouseClickDrag
+       <https://www.autohotkey.com/docs/commands/MouseClickDrag.htm>`_
+    """
+    relative_to = options.get("relative_to", "window")
+    mode = options.get("mode")
+    with global_ahk_lock:
+        if start is not None:
+            mouse_move(*start, relative_to=relative_to, mode=mode, speed=0)
+        mouse_press(button, modifier=modifier, mode=mode, level=level)
+        try:
+            mouse_path(points, duration, **options)
+        finally:
+            mouse_release(button, modifier=modifier, mode=mode, level=level)
+
+
+def _ease_in_out(t):
+    return 4 * t ** 3 if t < 0.5 else 1 - (2 - 2 * t) ** 3 / 2
+
+
+EASINGS = {
+    "linear": lambda t: t,
+    "ease_in": lambda t: t ** 3,
+    "ease_out": lambda t: 1 - (1 - t) ** 3,
+    "ease_in_out": _ease_in_out,
+    # The velocity profile of the point-to-point hand movements.
+    "minimum_jerk": lambda t: t ** 3 * (10 - 15 * t + 6 * t ** 2),
+}
+
+SHAPES = {"linear", "bezier", "human"}
+
+
+def _trajectory(start, points, steps_count, shape, easing, rng=random):
+    # Returns the list of (step, (x, y)) pairs. The steps that don't move the
+    # cursor are dropped, but the last point is always reached.
+    if shape == "bezier":
+        controls = [start, *points]
+
+        def curve(p):
+            return _bezier(controls, p)
+    else:
+        if shape == "human":
+            controls = [start]
+            for a, b in zip([start, *points], points):
+                controls.extend(_human_segment(a, b, rng))
+            curve_points = [
+                _bezier(controls[i:i + 4], j / 16)
+                for i in range(0, len(controls) - 1, 3)
+                for j in range(16)
+            ]
+            curve_points.append(controls[-1])
+        else:
+            curve_points = [start, *points]
+
+        lengths = _cumulative_lengths(curve_points)
+
+        def curve(p):
+            return _along(curve_points, lengths, p)
+
+    result: List[Tuple[int, Tuple[int, int]]] = []
+    last = (round(start[0]), round(start[1]))
+    end = (round(points[-1][0]), round(points[-1][1]))
+    for i in range(1, steps_count + 1):
+        if i == steps_count:
+            pos = end
+        else:
+            # The easing may overshoot, but the curves are defined only
+            # between the start and the end.
+            x, y = curve(min(max(easing(i / steps_count), 0), 1))
+            if shape == "human":
+                x += rng.uniform(-0.5, 0.5)
+                y += rng.uniform(-0.5, 0.5)
+            pos = (round(x), round(y))
+        if pos != last or i == steps_count:
+            result.append((i, pos))
+            last = pos
+    return result
+
+
+def _human_segment(a, b, rng):
+    # Two control points of a cubic Bézier curve deviating sideways from the
+    # straight line, and the end point.
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    length = math.hypot(dx, dy)
+    if not length:
+        return [a, b, b]
+    nx, ny = -dy / length, dx / length
+    bend = rng.uniform(-0.15, 0.15) * min(length, 400)
+    c1 = (a[0] + dx * 0.3 + nx * bend, a[1] + dy * 0.3 + ny * bend)
+    c2 = (a[0] + dx * 0.7 + nx * bend * rng.uniform(0.3, 1), a[1] + dy * 0.7 + ny * bend * rng.uniform(0.3, 1))
+    return [c1, c2, b]
+
+
+def _bezier(controls, p):
+    # De Casteljau's algorithm.
+    points = list(controls)
+    while len(points) > 1:
+        points = [
+            (x1 + (x2 - x1) * p, y1 + (y2 - y1) * p)
+            for (x1, y1), (x2, y2) in zip(points, points[1:])
+        ]
+    return points[0]
+
+
+def _cumulative_lengths(points):
+    lengths = [0.0]
+    for (x1, y1), (x2, y2) in zip(points, points[1:]):
+        lengths.append(lengths[-1] + math.hypot(x2 - x1, y2 - y1))
+    return lengths
+
+
+def _along(points, lengths, p):
+    # The point at the fraction p of the polyline length.
+    total = lengths[-1]
+    if not total:
+        return points[-1]
+    target = p * total
+    for i in range(1, len(points)):
+        if lengths[i] >= target:
+            seg = lengths[i] - lengths[i - 1]
+            f = (target - lengths[i - 1]) / seg if seg else 1
+            (x1, y1), (x2, y2) = points[i - 1], points[i]
+            return x1 + (x2 - x1) * f, y1 + (y2 - y1) * f
+    return points[-1]
+
+
 def _send_click(*args, modifier: str = None, blind=True, mode=None, level=None, delay=None):
     if modifier is not None:
         unknown_modifiers = set(modifier) - MODIFIERS
@@ -0,0 +1,288 @@
+import collections
+import concurrent.futures
+import ctypes
+import heapq
+import itertools
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+from typing import Optional
+
+import _ahk
+
+from . import flow
+
+__all__ = [
+    "set_pool_size",
+]
+
+
+RUN_IN_MODES = {"thread", "process"}
+
+
+def set_pool_size(threads: Optional[int] = None, processes: Optional[int] = None):
+    """Set the number of workers that run the callbacks registered with the
+    *run_in* argument.
+
+    The *threads* argument sets the number of threads for ``run_in="thread"``.
+    Defaults to 4. The *processes* argument sets the number of processes for
+    ``run_in="process"``. Defaults to the number of CPUs.
+
+    The pool size can be changed only until the first callback is submitted to
+    the pool.
+
+    The worker processes are started with the ``spawn`` method, which imports
+    the main script of the program in each worker under the
+    ``"__mp_main__"`` name to unpickle the callbacks defined there. AHK is
+    not available in the workers, so the script must register its hotkeys and
+    call AHK under the ``if __name__ == "__main__":`` guard to use the
+    ``"process"`` pool.
+    """
+    for mode, size in (("thread", threads), ("process", processes)):
+        if size is None:
+            continue
+        if size <= 0:
+            raise ValueError(f"the number of {mode}s must be positive")
+        pool = _pools[mode]
+        if pool.workers:
+            raise RuntimeError(f"the {mode} pool is already running")
+        pool.size = size
+
+
+def _dispatcher(func, run_in, priority=0, max_threads=1, buffer=False):
+    # Wrap the callback so that calling it from AHK puts it into the pool
+    # queue and returns immediately.
+    if run_in is None:
+        return func
+    if run_in not in RUN_IN_MODES:
+        raise ValueError(f"{run_in!r} is not a valid run_in mode")
+    if max_threads is not None and max_threads <= 0:
+        raise ValueError("max_threads must be positive")
+    if run_in == "thread":
+        _install()
+    return _Task(_pools[run_in], func, priority or 0, max_threads or 1, bool(buffer))
+
+
+class _Task:
+    __slots__ = ("pool", "func", "priority", "max_threads", "buffer", "active", "backlog", "__weakref__")
+
+    def __init__(self, pool, func, priority, max_threads, buffer):
+        self.pool = pool
+        self.func = func
+        self.priority = priority
+        self.max_threads = max_threads
+        self.buffer = buffer
+        # The number of the task's calls that are queued or running.
+        self.active = 0
+        # The calls that exceeded max_threads and wait for a running call of
+        # the task to finish.
+        self.backlog = collections.deque()
+
+    def __call__(self, *args):
+        self.pool.submit(self, args)
+
+    def __repr__(self):
+        return f"<{self.__class__.__qualname__} {self.func!r} in {self.pool.mode}>"
+
+
+class _Pool:
+    # Runs the submitted tasks in the order of their priority. Calls of the
+    # same priority run in the order they were submitted.
+
+    def __init__(self, mode, size):
+        self.mode = mode
+        self.size = size
+        self.cond = threading.Condition()
+        self.heap = []
+        self.counter = itertools.count()
+        self.workers = []
+        self.executor = None
+
+    def submit(self, task, args):
+        with self.cond:
+            if task.active >= task.max_threads:
+                if task.buffer:
+                    task.backlog.append(args)
+                return
+            task.active += 1
+            self._push(task, args)
+            if not self.workers:
+                self._start()
+
+    def _push(self, task, args):
+        heapq.heappush(self.heap, (-task.priority, next(self.counter), task, args))
+        self.cond.notify()
+
+    def _start(self):
+        if self.mode == "process":
+            self.executor = concurrent.futures.ProcessPoolExecutor(self.size, mp_context=_process_context())
+        for i in range(self.size):
+            th = threading.Thread(
+                target=self._work,
+                name=f"ahkpy-{self.mode}-{i}",
+                daemon=True,
+            )
+            th.start()
+            self.workers.append(th)
+
+    def _work(self):
+        if self.mode == "thread":
+            flow._thread_state.marshal = _Marshal()
+        while True:
+            with self.cond:
+                while not self.heap:
+                    self.cond.wait()
+                _, _, task, args = heapq.heappop(self.heap)
+            try:
+                if self.executor is not None:
+                    self.executor.submit(task.func, *args).result()
+                else:
+                    task.func(*args)
+            except BaseException as exc:
+                sys.excepthook(type(exc), exc, exc.__traceback__)
+            finally:
+                with self.cond:
+                    if task.backlog:
+                        self._push(task, task.backlog.popleft())
+                    else:
+                        task.active -= 1
+
+
+def _process_context():
+    # In the embedded interpreter, sys.executable is the AHK executable, so
+    # the workers must be spawned with the Python interpreter explicitly.
+    ctx = multiprocessing.get_context("spawn")
+    ctx.set_executable(_python_executable())
+    return ctx
+
+
+def _python_executable():
+    name = os.path.basename(sys.executable).lower()
+    if name.startswith("python"):
+        return sys.executable
+    candidates = [
+        # The virtual environment.
+        os.path.join(sys.prefix, "Scripts", "python.exe"),
+        os.path.join(sys.prefix, "python.exe"),
+        os.path.join(sys.base_prefix, "python.exe"),
+    ]
+    for path in candidates:
+        if os.path.isfile(path):
+            return path
+    raise RuntimeError("cannot find the Python executable to start the process pool")
+
+
+_pools = {
+    "thread": _Pool("thread", 4),
+    "process": _Pool("process", os.cpu_count() or 1),
+}
+
+
+# AHK is not thread-safe, so the pool threads don't call it directly. Instead,
+# the calls are queued, and the main thread is woken up with a window message
+# to execute them.
+
+_calls = queue.SimpleQueue()
+_call_message = None
+_script_hwnd = None
+
+
+class _Call:
+    __slots__ = ("cmd", "args", "done", "result", "exc")
+
+    def __init__(self, cmd, args):
+        self.cmd = cmd
+        self.args = args
+        self.done = threading.Event()
+        self.result = None
+        self.exc = None
+
+    def wait(self):
+        self.done.wait()
+        if self.exc is not None:
+            raise self.exc
+        return self.result
+
+
+class _Marshal:
+    # Forwards the AHK calls of a pool thread to the main thread. The calls
+    # made inside a global_ahk_lock block form a session that the main thread
+    # executes in a single AHK thread without running anything else in
+    # between. This way the thread settings, like SendLevel and CoordMode,
+    # made by the first calls of the block apply to the following ones.
+
+    def __init__(self):
+        self.depth = 0
+        self.session = None
+
+    def __call__(self, cmd, args):
+        call = _Call(cmd, args)
+        if self.session is not None:
+            self.session.put(call)
+        else:
+            _post(call)
+        return call.wait()
+
+    def begin(self):
+        self.depth += 1
+        if self.depth == 1:
+            self.session = queue.SimpleQueue()
+            # The session is started by a call without a command.
+            _post(_Call(None, (self.session,)))
+
+    def end(self):
+        self.depth -= 1
+        if self.depth == 0:
+            self.session.put(None)
+            self.session = None
+
+
+def _post(call):
+    _calls.put(call)
+    _wake_main_thread()
+
+
+def _wake_main_thread():
+    ctypes.windll.user32.PostMessageW(_script_hwnd, _call_message, 0, 0)
+
+
+def _drain_calls():
+    while True:
+        try:
+            call = _calls.get_nowait()
+        except queue.Empty:
+            return
+        if call.cmd is not None:
+            _execute(call)
+            continue
+        session = call.args[0]
+        while True:
+            call = session.get()
+            if call is None:
+                break
+            _execute(call)
+
+
+def _execute(call):
+    try:
+        # The call is a part of a locked block in the pool thread, which
+        # doesn't take the global AHK lock. Don't wait on the lock in case
+        # another thread holds it.
+        call.result = _ahk.call(call.cmd, *call.args)
+    except BaseException as exc:
+        call.exc = exc
+    finally:
+        call.done.set()
+
+
+def _install():
+    # Must be called on the main thread before the first task is submitted.
+    global _call_message, _script_hwnd
+    if _call_message is not None:
+        return
+    from .window_message import on_message
+    _script_hwnd = int(flow.ahk_call("GetVar", "A_ScriptHwnd"))
+    _call_message = ctypes.windll.user32.RegisterWindowMessageW("AutoHotkey.py pool call")
+    on_message(_call_message, _drain_calls)
@@ -0,0 +1,509 @@
+import ctypes
+import functools
+import os
+import struct
+import threading
+import time
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+from .compiled_keys import KEY_IGNORE_ALL_EXCEPT_MODIFIER, _input_type
+from . import flow
+from .flow import global_ahk_lock, sleep
+from .settings import get_settings
+
+__all__ = [
+    "RecordedEvent",
+    "Recorder",
+    "Recording",
+    "record",
+    "replay",
+]
+
+
+# The record is the time in nanoseconds since the recording start, the window
+# message, the virtual-key code or the high word of mouseData, and the scan
+# code and flags for the keyboard events or the cursor position for the mouse
+# events.
+RECORD = struct.Struct("<qHhii")
+
+FILE_MAGIC = b"AHKPYREC"
+FILE_HEADER = struct.Struct("<8sHH")
+FILE_VERSION = 1
+
+WM_KEYDOWN = 0x0100
+WM_KEYUP = 0x0101
+WM_SYSKEYDOWN = 0x0104
+WM_SYSKEYUP = 0x0105
+WM_MOUSEMOVE = 0x0200
+WM_MOUSEWHEEL = 0x020A
+WM_XBUTTONDOWN = 0x020B
+WM_XBUTTONUP = 0x020C
+WM_MOUSEHWHEEL = 0x020E
+
+LLKHF_EXTENDED = 0x01
+LLKHF_INJECTED = 0x10
+LLMHF_INJECTED = 0x01
+
+KEYEVENTF_EXTENDEDKEY = 0x0001
+KEYEVENTF_KEYUP = 0x0002
+
+MOUSEEVENTF_MOVE = 0x0001
+MOUSEEVENTF_ABSOLUTE = 0x8000
+MOUSEEVENTF_VIRTUALDESK = 0x4000
+
+MOUSE_BUTTON_FLAGS = {
+    0x0201: 0x0002,  # WM_LBUTTONDOWN: MOUSEEVENTF_LEFTDOWN
+    0x0202: 0x0004,  # WM_LBUTTONUP: MOUSEEVENTF_LEFTUP
+    0x0204: 0x0008,  # WM_RBUTTONDOWN: MOUSEEVENTF_RIGHTDOWN
+    0x0205: 0x0010,  # WM_RBUTTONUP: MOUSEEVENTF_RIGHTUP
+    0x0207: 0x0020,  # WM_MBUTTONDOWN: MOUSEEVENTF_MIDDLEDOWN
+    0x0208: 0x0040,  # WM_MBUTTONUP: MOUSEEVENTF_MIDDLEUP
+    WM_XBUTTONDOWN: 0x0080,  # MOUSEEVENTF_XDOWN
+    WM_XBUTTONUP: 0x0100,  # MOUSEEVENTF_XUP
+    WM_MOUSEWHEEL: 0x0800,  # MOUSEEVENTF_WHEEL
+    WM_MOUSEHWHEEL: 0x1000,  # MOUSEEVENTF_HWHEEL
+}
+
+# The extra time left for the busy wait on top of the AHK poll interval, by
+# which sleep() may overshoot.
+SLEEP_MARGIN = 0.002
+
+
+class RecordedEvent(NamedTuple):
+    """The keyboard or mouse event captured by :func:`record`."""
+
+    #: The time in seconds since the recording start.
+    time: float
+    #: The window message, like ``WM_KEYDOWN`` or ``WM_LBUTTONDOWN``.
+    message: int
+    #: The virtual-key code of the keyboard event, or the wheel delta or the
+    #: X button number of the mouse event.
+    code: int
+    #: The scan code of the keyboard event, or the X screen coordinate of the
+    #: mouse event.
+    x: int
+    #: The ``LLKHF_*`` flags of the keyboard event, or the Y screen coordinate
+    #: of the mouse event.
+    y: int
+
+    @property
+    def is_keyboard(self) -> bool:
+        """Whether the event comes from the keyboard."""
+        return self.message < WM_MOUSEMOVE
+
+
+def record(*, keyboard=True, mouse=True, mouse_moves=True, capacity=1_000_000,
+           include_injected=False) -> "Recorder":
+    """Start recording the keyboard and mouse events.
+
+    The events are captured by the low-level keyboard and mouse hooks running
+    in a separate thread, so the recording keeps up with fast typing
+    regardless of what the AHK thread is doing. Each event is stored as a
+    20-byte record with the :func:`time.perf_counter_ns` timestamp into a
+    preallocated ring buffer of *capacity* events. When the buffer is full,
+    the oldest events are overwritten.
+
+    If *mouse_moves* is false, only the mouse clicks and the wheel are
+    recorded. The events sent by AHK and other programs are skipped unless
+    *include_injected* is true.
+
+    Returns an instance of :class:`Recorder`. Call :meth:`Recorder.stop` to
+    get the :class:`Recording`::
+
+        recorder = ahkpy.record()
+        ahkpy.wait_key_pressed("F12")
+        recording = recorder.stop()
+        recording.save("workflow.rec")
+
+    The recorder also works as a context manager that stops the recording
+    when the with-statement ends.
+    """
+    recorder = Recorder(
+        keyboard=keyboard, mouse=mouse, mouse_moves=mouse_moves, capacity=capacity,
+        include_injected=include_injected,
+    )
+    recorder.start()
+    return recorder
+
+
+class Recorder:
+    """The recorder of the keyboard and mouse events.
+
+    Use the :func:`record` function to create it.
+    """
+
+    def __init__(self, *, keyboard=True, mouse=True, mouse_moves=True, capacity=1_000_000,
+                 include_injected=False):
+        if not keyboard and not mouse:
+            raise ValueError("at least one of keyboard and mouse must be recorded")
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.keyboard = keyboard
+        self.mouse = mouse
+        self.mouse_moves = mouse_moves
+        self.include_injected = include_injected
+        self.capacity = int(capacity)
+        self._buffer = bytearray(RECORD.size * self.capacity)
+        self._count = 0
+        self._start_ns = 0
+        self._thread: Optional[threading.Thread] = None
+        self._thread_id = 0
+        self._recording: Optional[Recording] = None
+
+    @property
+    def is_recording(self) -> bool:
+        """Whether the recorder is capturing the events (read-only).
+
+        :type: bool
+        """
+        return self._thread is not None
+
+    @property
+    def dropped(self) -> int:
+        """The number of the oldest events overwritten because the buffer
+        was full (read-only).
+
+        :type: int
+        """
+        return max(self._count - self.capacity, 0)
+
+    def __len__(self):
+        return min(self._count, self.capacity)
+
+    def start(self):
+        """Start capturing the events."""
+        if self._thread is not None:
+            return
+        self._count = 0
+        self._recording = None
+        self._start_ns = time.perf_counter_ns()
+        ready = threading.Event()
+        errors = []
+        self._thread = threading.Thread(target=self._run, args=(ready, errors), name="ahkpy recorder", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if errors:
+            self._thread.join()
+            self._thread = None
+            raise errors[0]
+
+    def stop(self) -> "Recording":
+        """Stop capturing the events and return the recording.
+
+        Calling :meth:`!stop` again returns the same recording.
+        """
+        if self._thread is not None:
+            WM_QUIT = 0x0012
+            _user32().PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+            self._thread.join()
+            self._thread = None
+        if self._recording is None:
+            self._recording = Recording(self._ordered_data())
+        return self._recording
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _ordered_data(self):
+        size = RECORD.size
+        if self._count <= self.capacity:
+            return bytes(self._buffer[:self._count * size])
+        # The ring buffer has wrapped around, the oldest record follows the
+        # newest one.
+        split = self._count % self.capacity * size
+        return bytes(self._buffer[split:] + self._buffer[:split])
+
+    def _write(self, message, code, x, y):
+        offset = self._count % self.capacity * RECORD.size
+        RECORD.pack_into(self._buffer, offset, time.perf_counter_ns() - self._start_ns, message, code, x, y)
+        self._count += 1
+
+    def _run(self, ready, errors):
+        from ctypes import wintypes
+
+        class KBDLLHOOKSTRUCT(ctypes.Structure):
+            _fields_ = [
+                ("vkCode", wintypes.DWORD),
+                ("scanCode", wintypes.DWORD),
+                ("flags", wintypes.DWORD),
+                ("time", wintypes.DWORD),
+                ("dwExtraInfo", ctypes.c_size_t),
+            ]
+
+        class MSLLHOOKSTRUCT(ctypes.Structure):
+            _fields_ = [
+                ("pt", wintypes.POINT),
+                ("mouseData", wintypes.DWORD),
+                ("flags", wintypes.DWORD),
+                ("time", wintypes.DWORD),
+                ("dwExtraInfo", ctypes.c_size_t),
+            ]
+
+        WH_KEYBOARD_LL = 13
+        WH_MOUSE_LL = 14
+        HC_ACTION = 0
+
+        HookProc = _hook_proc_type()
+        user32 = _user32()
+        kernel32 = _kernel32()
+        write = self._write
+        include_injected = self.include_injected
+        mouse_moves = self.mouse_moves
+
+        # The hook procedures are kept short, because Windows skips the hooks
+        # that take too long to return.
+        def keyboard_proc(code, wparam, lparam):
+            if code == HC_ACTION:
+                info = KBDLLHOOKSTRUCT.from_address(lparam)
+                if include_injected or not info.flags & LLKHF_INJECTED:
+                    write(wparam, info.vkCode, info.scanCode, info.flags)
+            return user32.CallNextHookEx(None, code, wparam, lparam)
+
+        def mouse_proc(code, wparam, lparam):
+            if code == HC_ACTION and (mouse_moves or wparam != WM_MOUSEMOVE):
+                info = MSLLHOOKSTRUCT.from_address(lparam)
+                if include_injected or not info.flags & LLMHF_INJECTED:
+                    data = ctypes.c_short(info.mouseData >> 16).value
+                    write(wparam, data, info.pt.x, info.pt.y)
+            return user32.CallNextHookEx(None, code, wparam, lparam)
+
+        # The callbacks must stay alive as long as the hooks are installed.
+        procs = []
+        hooks = []
+        try:
+            module = kernel32.GetModuleHandleW(None)
+            for enabled, hook_id, func in (
+                (self.keyboard, WH_KEYBOARD_LL, keyboard_proc),
+                (self.mouse, WH_MOUSE_LL, mouse_proc),
+            ):
+                if not enabled:
+                    continue
+                proc = HookProc(func)
+                procs.append(proc)
+                hook = user32.SetWindowsHookExW(hook_id, proc, module, 0)
+                if not hook:
+                    raise ctypes.WinError(ctypes.get_last_error())
+                hooks.append(hook)
+            self._thread_id = kernel32.GetCurrentThreadId()
+        except Exception as exc:
+            errors.append(exc)
+            for hook in hooks:
+                user32.UnhookWindowsHookEx(hook)
+            ready.set()
+            return
+
+        ready.set()
+        try:
+            # The low-level hooks are called while the thread waits for
+            # messages.
+            msg = wintypes.MSG()
+            while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                pass
+        finally:
+            for hook in hooks:
+                user32.UnhookWindowsHookEx(hook)
+
+
+@functools.lru_cache(maxsize=None)
+def _hook_proc_type():
+    from ctypes import wintypes
+
+    return ctypes.WINFUNCTYPE(ctypes.c_ssize_t, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+
+
+@functools.lru_cache(maxsize=None)
+def _user32():
+    # Private instance, so the prototypes don't leak into ctypes.windll and
+    # don't break the other callers of these functions.
+    from ctypes import wintypes
+
+    user32 = ctypes.WinDLL("user32", use_last_error=True)
+    user32.SetWindowsHookExW.argtypes = (ctypes.c_int, _hook_proc_type(), wintypes.HINSTANCE, wintypes.DWORD)
+    user32.SetWindowsHookExW.restype = wintypes.HHOOK
+    user32.CallNextHookEx.argtypes = (wintypes.HHOOK, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+    user32.CallNextHookEx.restype = ctypes.c_ssize_t
+    user32.UnhookWindowsHookEx.argtypes = (wintypes.HHOOK,)
+    user32.UnhookWindowsHookEx.restype = wintypes.BOOL
+    user32.GetMessageW.argtypes = (ctypes.POINTER(wintypes.MSG), wintypes.HWND, wintypes.UINT, wintypes.UINT)
+    user32.GetMessageW.restype = wintypes.BOOL
+    user32.PostThreadMessageW.argtypes = (wintypes.DWORD, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM)
+    user32.PostThreadMessageW.restype = wintypes.BOOL
+    return user32
+
+
+@functools.lru_cache(maxsize=None)
+def _kernel32():
+    from ctypes import wintypes
+
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.GetModuleHandleW.argtypes = (wintypes.LPCWSTR,)
+    kernel32.GetModuleHandleW.restype = wintypes.HMODULE
+    kernel32.GetCurrentThreadId.argtypes = ()
+    kernel32.GetCurrentThreadId.restype = wintypes.DWORD
+    return kernel32
+
+
+class Recording:
+    """The compact sequence of the recorded events.
+
+    The events are stored as packed binary records. Iterating over the
+    recording yields instances of :class:`RecordedEvent`.
+
+    Use the :func:`record` function or the :meth:`load` method to create it.
+    """
+
+    def __init__(self, data: bytes = b""):
+        if len(data) % RECORD.size:
+            raise ValueError(f"recording data length must be a multiple of {RECORD.size}")
+        self._data = bytes(data)
+
+    def __len__(self):
+        return len(self._data) // RECORD.size
+
+    def __iter__(self) -> Iterator[RecordedEvent]:
+        for time_ns, *rest in RECORD.iter_unpack(self._data):
+            yield RecordedEvent(time_ns / 1e9, *rest)
+
+    def __bytes__(self):
+        return self._data
+
+    @property
+    def duration(self) -> float:
+        """The time in seconds between the first and the last events
+        (read-only).
+
+        :type: float
+        """
+        if not self._data:
+            return 0.0
+        first = RECORD.unpack_from(self._data, 0)[0]
+        last = RECORD.unpack_from(self._data, len(self._data) - RECORD.size)[0]
+        return (last - first) / 1e9
+
+    def save(self, path: os.PathLike):
+        """Save the recording to the file at *path*."""
+        with open(path, "wb") as f:
+            f.write(FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION, RECORD.size))
+            f.write(self._data)
+
+    @classmethod
+    def load(cls, path: os.PathLike) -> "Recording":
+        """Load the recording from the file at *path*."""
+        with open(path, "rb") as f:
+            header = f.read(FILE_HEADER.size)
+            if len(header) < FILE_HEADER.size or not header.startswith(FILE_MAGIC):
+                raise ValueError(f"file {os.fspath(path)!r} is not a recording")
+            _, version, record_size = FILE_HEADER.unpack(header)
+            if version != FILE_VERSION or record_size != RECORD.size:
+                raise ValueError(f"recording version {version} is not supported")
+            return cls(f.read())
+
+    def __repr__(self):
+        return f"<{self.__class__.__qualname__} events={len(self)} duration={self.duration:.3f}>"
+
+
+def replay(recording: Recording, speed=1.0, *, level=None, resolution=0.001):
+    """Replay the *recording* to the system.
+
+    The *speed* argument scales the pace of the replay, e.g. ``2`` replays the
+    events twice as fast. The replay starts with the first event right away.
+
+    The events that are due within *resolution* seconds of each other are
+    sent in a single `SendInput
+    <https://docs.microsoft.com/en-us/windows/win32/api/winuser/nf-winuser-sendinput>`_
+    call. The function sleeps while AHK handles its messages until the next
+    batch is due in less than the AHK poll interval (10 ms, or 50 ms in the
+    low power mode) plus 2 ms, and then waits for the exact time in a busy
+    loop. If the replay falls behind, the late events are sent right away
+    without dropping any of them.
+
+    The *level* argument works the same as in :func:`send`. The recorded
+    cursor positions are absolute, so the mouse events are replayed at the
+    same screen coordinates.
+    """
+    if speed <= 0:
+        raise ValueError("speed must be positive")
+    if level is None:
+        level = get_settings().send_level
+    elif not 0 <= level <= 100:
+        raise ValueError("level must be between 0 and 100")
+    events = list(recording)
+    if not events:
+        return
+
+    inputs = _build_inputs(events, KEY_IGNORE_ALL_EXCEPT_MODIFIER - int(level))
+    input_size = ctypes.sizeof(inputs[0])
+    send_input = ctypes.windll.user32.SendInput
+    start = time.perf_counter()
+    for due, first, last in _batches([event.time for event in events], speed, resolution):
+        _wait_until(start + due)
+        count = last - first
+        with global_ahk_lock:
+            sent = send_input(count, ctypes.byref(inputs, first * input_size), input_size)
+        if sent != count:
+            raise ctypes.WinError()
+
+
+def _wait_until(deadline, clock=time.perf_counter, sleep=sleep):
+    # sleep() polls AHK every _poll_interval and may return up to an interval
+    # late, so it must return before the deadline even then.
+    while True:
+        coarse = deadline - clock() - flow._poll_interval - SLEEP_MARGIN
+        if coarse <= 0:
+            break
+        sleep(coarse)
+    while clock() < deadline:
+        pass
+
+
+def _batches(times: List[float], speed: float, resolution: float) -> Iterator[Tuple[float, int, int]]:
+    # Yields the due time relative to the replay start, and the range of the
+    # events to send at once.
+    if not times:
+        return
+    origin = times[0]
+    first = 0
+    due = 0.0
+    for i in range(1, len(times)):
+        event_due = (times[i] - origin) / speed
+        if event_due - due > resolution:
+            yield due, first, i
+            first, due = i, event_due
+    yield due, first, len(times)
+
+
+def _build_inputs(events, extra_info):
+    INPUT_KEYBOARD = 0x1
+    INPUT_MOUSE = 0x0
+    INPUT = _input_type()
+    get_metric = ctypes.windll.user32.GetSystemMetrics
+    # SM_XVIRTUALSCREEN, SM_YVIRTUALSCREEN, SM_CXVIRTUALSCREEN,
+    # SM_CYVIRTUALSCREEN
+    left, top, width, height = (get_metric(i) for i in (76, 77, 78, 79))
+    inputs = (INPUT * len(events))()
+    for item, event in zip(inputs, events):
+        if event.is_keyboard:
+            item.type = INPUT_KEYBOARD
+            item.ki.wVk = event.code
+            item.ki.wScan = event.x
+            flags = KEYEVENTF_EXTENDEDKEY if event.y & LLKHF_EXTENDED else 0
+            if event.message in (WM_KEYUP, WM_SYSKEYUP):
+                flags |= KEYEVENTF_KEYUP
+            item.ki.dwFlags = flags
+            item.ki.dwExtraInfo = extra_info
+        else:
+            item.type = INPUT_MOUSE
+            # Normalize the coordinates to 0..65535 of the virtual screen.
+            item.mi.dx = round((event.x - left) * 65535 / max(width - 1, 1))
+            item.mi.dy = round((event.y - top) * 65535 / max(height - 1, 1))
+            item.mi.dwFlags = (
+                MOUSEEVENTF_MOVE | MOUSEEVENTF_ABSOLUTE | MOUSEEVENTF_VIRTUALDESK |
+                MOUSE_BUTTON_FLAGS.get(event.message, 0)
+            )
+            item.mi.mouseData = event.code & 0xFFFFFFFF
+            item.mi.dwExtraInfo = extra_info
+    return inputs
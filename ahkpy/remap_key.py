@@ -1,15 +1,17 @@
 import dataclasses as dc
 
+from .flow import ahk_call
 from .hotkey import Hotkey
 from .key_state import is_key_pressed
-from .sending import send
+from .sending import send, _get_send_mode
+from .settings import get_settings
 
 __all__ = [
     "RemappedKey",
 ]
 
 
-def remap_key(ctx, origin_key, destination_key, *, mode=None, level=None):
+def remap_key(ctx, origin_key, destination_key, *, mode=None, level=None, native=False):
     """Remap *origin_key* to *destination_key*.
 
     Returns an instance of :class:`RemappedKey`.
@@ -21,10 +23,23 @@ def remap_key(ctx, origin_key, destination_key, *, mode=None, level=None):
     :func:`send` function that will send the *destination_key* when the user
     presses the *origin_key*.
 
+    If the keyword-only *native* argument is true, the remapping is done
+    entirely by AHK, and Python is not called when the user presses and
+    releases the *origin_key*. In this case, the default *mode* and *level*
+    are taken from the current settings once, when the key is remapped.
+    Defaults to ``False``.
+
     For more information refer to `Remapping Keys
     <https://www.autohotkey.com/docs/misc/Remap.htm>`_.
     """
     mouse = destination_key.lower() in {"lbutton", "rbutton", "mbutton", "xbutton1", "xbutton2"}
+    ctrl_to_alt = (
+        origin_key.lower() in {"ctrl", "lctrl", "rctrl"} and
+        destination_key.lower() in {"alt", "lalt", "ralt"}
+    )
+    if native:
+        return _remap_key_native(ctx, origin_key, destination_key, mode, level, mouse, ctrl_to_alt)
+
     if mouse:
         def origin_hotkey():
             if not is_key_pressed(destination_key):
@@ -33,10 +48,6 @@ def remap_key(ctx, origin_key, destination_key, *, mode=None, level=None):
         def origin_up_hotkey():
             send("{Blind}{%s Up}" % destination_key, mode=mode, level=level, mouse_delay=-1)
     else:
-        ctrl_to_alt = (
-            origin_key.lower() in {"ctrl", "lctrl", "rctrl"} and
-            destination_key.lower() in {"alt", "lalt", "ralt"}
-        )
         if ctrl_to_alt:
             def origin_hotkey():
                 send(
@@ -57,6 +68,20 @@ def remap_key(ctx, origin_key, destination_key, *, mode=None, level=None):
     return RemappedKey(origin_hotkey, origin_up_hotkey)
 
 
+def _remap_key_native(ctx, origin_key, destination_key, mode, level, mouse, ctrl_to_alt):
+    mode = _get_send_mode(mode)
+    if mode not in {"input", "play", "event"}:
+        raise ValueError(f"{mode!r} is not a valid send mode")
+    if level is None:
+        level = get_settings().send_level
+    elif not 0 <= level <= 100:
+        raise ValueError("level must be between 0 and 100")
+
+    with ctx._manager():
+        ahk_call("RemapKey", origin_key, destination_key, mode, int(level), int(mouse), int(ctrl_to_alt))
+    return RemappedKey(Hotkey(f"*{origin_key}", ctx), Hotkey(f"*{origin_key} Up", ctx))
+
+
 @dc.dataclass(frozen=True)
 class RemappedKey:
     """RemappedKey(origin_hotkey: ahkpy.Hotkey, origin_up_hotkey: ahkpy.Hotkey)
@@ -1,8 +1,14 @@
+import contextvars
+import re
+from typing import List, Optional
+
 from .flow import ahk_call, global_ahk_lock
 from .settings import get_settings, optional_ms
 from .unset import UNSET
 
 __all__ = [
+    "SendBuffer",
+    "send_buffer",
     "send_event",
     "send_input",
     "send_play",
@@ -82,25 +88,152 @@ def _get_send_mode(mode=None, key_delay=None, key_duration=None, mouse_delay=Non
 
 def send_input(keys, *, level=None, **rest):
     """Send simulated keystrokes and mouse clicks using the Input mode."""
+    buffer = _current_buffer.get()
+    if buffer is not None:
+        buffer.add("input", keys, level)
+        return
     with global_ahk_lock:
-        _send_level(level)
-        ahk_call("SendInput", keys)
+        _send_input(keys, level)
 
 
 def send_event(keys, *, level=None, key_delay=None, key_duration=None, mouse_delay=None):
     """Send simulated keystrokes and mouse clicks using the Event mode."""
+    buffer = _current_buffer.get()
+    if buffer is not None:
+        buffer.add("event", keys, level, key_delay, key_duration, mouse_delay)
+        return
     with global_ahk_lock:
-        _send_level(level)
-        _set_delay(key_delay, key_duration, mouse_delay)
-        ahk_call("SendEvent", keys)
+        _send_event(keys, level, key_delay, key_duration, mouse_delay)
 
 
 def send_play(keys, *, key_delay=None, key_duration=None, mouse_delay=None, **rest):
     """Send simulated keystrokes and mouse clicks using the Play mode."""
+    buffer = _current_buffer.get()
+    if buffer is not None:
+        buffer.add("play", keys, None, key_delay, key_duration, mouse_delay)
+        return
     with global_ahk_lock:
-        # SendPlay is not affected by SendLevel.
-        _set_delay(key_delay, key_duration, mouse_delay, play=True)
-        ahk_call("SendPlay", keys)
+        _send_play(keys, key_delay, key_duration, mouse_delay)
+
+
+def _send_input(keys, level, *rest):
+    _send_level(level)
+    ahk_call("SendInput", keys)
+
+
+def _send_event(keys, level, key_delay, key_duration, mouse_delay):
+    _send_level(level)
+    _set_delay(key_delay, key_duration, mouse_delay)
+    ahk_call("SendEvent", keys)
+
+
+def _send_play(keys, level, key_delay, key_duration, mouse_delay):
+    # SendPlay is not affected by SendLevel.
+    _set_delay(key_delay, key_duration, mouse_delay, play=True)
+    ahk_call("SendPlay", keys)
+
+
+_SENDERS = {
+    "input": _send_input,
+    "event": _send_event,
+    "play": _send_play,
+}
+
+
+def send_buffer() -> "SendBuffer":
+    """Return a context manager that collects the keys sent inside the
+    with-statement and sends them at once when exiting it::
+
+        with ahkpy.send_buffer():
+            ahkpy.send("{Text}Best regards,")
+            ahkpy.send("{Enter}")
+            ahkpy.send("^s")
+
+    The consecutive :func:`send` calls with the same mode, level, and delays
+    are joined into a single Send command, so the user's keystrokes can't get
+    in between them, and AHK is called once instead of several times. The
+    calls with different options are sent in the original order.
+
+    Since the keys are not sent until the end of the with-statement, the
+    functions that depend on their effect, like :func:`get_clipboard` after
+    sending :kbd:`Ctrl+C`, must be called after :meth:`SendBuffer.flush`.
+    The same applies to the mouse functions like :func:`click`, which are not
+    buffered. The callbacks registered inside the with-statement, like timers
+    and hotkeys, send their keys right away after the with-statement ends.
+    """
+    return SendBuffer()
+
+
+class SendBuffer:
+    """The buffer of keys that are sent when the with-statement ends or
+    :meth:`flush` is called.
+
+    Use the :func:`send_buffer` function to create it.
+    """
+
+    def __init__(self):
+        # Each group is a list of the send options, the list of keys, and
+        # whether the group can be continued.
+        self._groups: List[list] = []
+        self._token: Optional[contextvars.Token] = None
+        self._closed = False
+
+    def __enter__(self):
+        outer = _current_buffer.get()
+        if outer is not None:
+            # Keep the order of the keys sent in the nested buffers.
+            outer.flush()
+        self._closed = False
+        self._token = _current_buffer.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _current_buffer.reset(self._token)
+        self._token = None
+        # The callbacks registered inside the with-statement copy the context
+        # with the buffer. After the with-statement, their keys are sent
+        # right away.
+        self._closed = True
+        self.flush()
+
+    def add(self, mode, keys, level=None, key_delay=None, key_duration=None, mouse_delay=None):
+        keys = str(keys)
+        if mode != "play":
+            if level is None:
+                level = get_settings().send_level
+            elif not 0 <= level <= 100:
+                raise ValueError("level must be between 0 and 100")
+        if self._closed:
+            with global_ahk_lock:
+                _SENDERS[mode](keys, level, key_delay, key_duration, mouse_delay)
+            return
+        options = (mode, level, key_delay, key_duration, mouse_delay)
+        group = self._groups[-1] if self._groups else None
+        blind = _BLIND_RE.match(keys)
+        if group is not None and group[0] == options and group[2] and not blind:
+            group[1].append(keys)
+        else:
+            group = [options, [keys], True]
+            self._groups.append(group)
+        if blind or _LITERAL_RE.search(keys):
+            # Blind mode applies to the whole string, and Text and Raw modes
+            # apply to the rest of it, so nothing can be appended after them.
+            group[2] = False
+
+    def flush(self):
+        """Send the collected keys now."""
+        groups, self._groups = self._groups, []
+        if not groups:
+            return
+        with global_ahk_lock:
+            for (mode, *options), keys, _ in groups:
+                _SENDERS[mode]("".join(keys), *options)
+
+
+_current_buffer = contextvars.ContextVar("send_buffer", default=None)
+
+_LITERAL_RE = re.compile(r"{(?:text|raw)}", re.IGNORECASE)
+_BLIND_RE = re.compile(r"{blind[^}]*}", re.IGNORECASE)
 
 
 def _send_level(level):
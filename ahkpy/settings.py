@@ -1,5 +1,6 @@
 import contextvars
 import dataclasses as dc
+from typing import Optional
 
 from .flow import ahk_call
 
@@ -127,6 +128,17 @@ class Settings:
     #:    <https://www.autohotkey.com/docs/commands/SetWinDelay.htm>`_
     win_delay: float = 0.1
 
+    #: The time to wait for the target window to respond before executing a
+    #: window or control command. If the window doesn't respond in time,
+    #: :exc:`~ahkpy.WindowHungError` is raised instead of stalling the script.
+    #:
+    #: The check sends a message to the window and waits for its message loop
+    #: to process it, which costs a round trip to the target process on every
+    #: command. If ``None``, the default, only the windows that Windows
+    #: already considers hung, i.e. that haven't processed messages for 5
+    #: seconds, raise the error. This check doesn't send any messages.
+    hung_window_timeout: Optional[float] = None
+
     # Should CoordMode also be here? I don't think so because the above settings
     # change only some aspects like speed and delay and don't change the overall
     # behavior. For example, the function that moves the mouse cursor or types a
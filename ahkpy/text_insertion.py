@@ -0,0 +1,88 @@
+from .flow import ahk_call, global_ahk_lock, _wait_for
+from .sending import _SENDERS, _current_buffer, _get_send_mode, send
+
+__all__ = [
+    "insert_text",
+]
+
+
+STRATEGIES = ("auto", "type", "paste")
+
+# The terminals paste with Shift+Insert, because Ctrl+V may be bound to
+# something else in the programs they run.
+TERMINAL_CLASSES = frozenset({
+    "ConsoleWindowClass",
+    "CASCADIA_HOSTING_WINDOW_CLASS",
+    "mintty",
+    "PuTTY",
+    "VirtualConsoleClass",
+})
+
+
+def insert_text(text: str, strategy="auto", *, threshold=200, timeout=1, mode=None, level=None, key_delay=None):
+    """Insert *text* into the active window.
+
+    The *strategy* argument takes one of the following values:
+
+    - ``"type"`` – sends the text keystroke by keystroke in the `Text mode
+      <https://www.autohotkey.com/docs/commands/Send.htm#SendText>`_. This
+      works everywhere, but takes time proportional to the length of the text
+      and can be interleaved with the keys the user types meanwhile.
+    - ``"paste"`` – puts the text into the clipboard and sends the paste
+      shortcut: :kbd:`Shift+Insert` to the terminal windows and :kbd:`Ctrl+V`
+      to the others. All the formats of the previous clipboard contents are
+      restored afterwards.
+    - ``"auto"`` – pastes the text that is at least *threshold* characters
+      long, and types the shorter text. The text is also typed if there's no
+      active window. This is the default.
+
+    The pasted text is put into the clipboard with `delayed rendering
+    <https://docs.microsoft.com/en-us/windows/win32/dataxchg/clipboard-operations#delayed-rendering>`_,
+    so AHK knows when the target window requests it. The previous clipboard
+    is restored as soon as that happens instead of after a fixed sleep. If
+    the window doesn't request the text in *timeout* seconds, the clipboard
+    is restored anyway. Note that a clipboard manager that reads every new
+    clipboard text may request it before the paste, then the wait lasts the
+    whole *timeout*.
+
+    The *mode*, *level*, and *key_delay* arguments are passed to :func:`send`
+    when typing the text or the paste shortcut. Inside :func:`send_buffer`, the buffered
+    keys are flushed before pasting.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"{strategy!r} is not a valid strategy")
+    text = str(text)
+    if not text:
+        return
+
+    win_class = None
+    if strategy != "type":
+        win_class = ahk_call("WinGetClass", "A")
+    if strategy == "auto":
+        strategy = "paste" if len(text) >= threshold and win_class else "type"
+
+    if strategy == "type":
+        send("{Text}" + text, mode=mode, level=level, key_delay=key_delay)
+        return
+
+    paste_keys = "+{Insert}" if win_class in TERMINAL_CLASSES else "^v"
+    buffer = _current_buffer.get()
+    if buffer is not None:
+        # Keep the order of the keys sent before the text.
+        buffer.flush()
+
+    mode = _get_send_mode(mode, key_delay)
+    if mode not in _SENDERS:
+        raise ValueError(f"{mode!r} is not a valid send mode")
+    ahk_call("PasteTextBegin", text)
+    try:
+        with global_ahk_lock:
+            # Bypass the send buffer, the text must be pasted now.
+            _SENDERS[mode](paste_keys, level, key_delay, None, None)
+        _wait_for(timeout, _paste_requested)
+    finally:
+        ahk_call("PasteTextEnd")
+
+
+def _paste_requested():
+    return ahk_call("PasteTextRequested")
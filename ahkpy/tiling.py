@@ -0,0 +1,446 @@
+import ctypes
+import functools
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+__all__ = [
+    "BSP",
+    "Columns",
+    "Container",
+    "Layout",
+    "Leaf",
+    "Node",
+    "Rows",
+    "Stack",
+]
+
+
+Rect = Tuple[int, int, int, int]
+
+
+class Node:
+    """The base class of the layout tree nodes.
+
+    The *weight* sets the share of the parent container area that the node
+    takes relative to its siblings.
+    """
+
+    def __init__(self, *, weight=1):
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+        self._weight = weight
+        #: The container that holds the node, or ``None`` for the root node.
+        self.parent: Optional["Container"] = None
+        #: The rectangle assigned to the node by the last arrangement.
+        self.rect: Optional[Rect] = None
+        self._dirty = True
+        self._dirty_below = False
+
+    @property
+    def weight(self):
+        """The relative share of the parent container area."""
+        return self._weight
+
+    @weight.setter
+    def weight(self, value):
+        if value <= 0:
+            raise ValueError("weight must be positive")
+        self._weight = value
+        if self.parent is not None:
+            self.parent._mark_dirty()
+
+    def _is_empty(self):
+        return False
+
+    def _mark_dirty(self):
+        self._dirty = True
+        node = self.parent
+        while node is not None and not node._dirty_below:
+            node._dirty_below = True
+            node = node.parent
+
+
+class Leaf(Node):
+    """The layout node that holds a window.
+
+    The *window* is usually an :class:`~ahkpy.Window` instance, but any
+    hashable object can be used if :class:`Layout` is given a custom *apply*
+    function.
+    """
+
+    def __init__(self, window: Hashable, *, weight=1):
+        super().__init__(weight=weight)
+        self.window = window
+
+    def __repr__(self):
+        return f"{self.__class__.__qualname__}({self.window!r})"
+
+
+class Container(Node):
+    """The base class of the nodes that split their area between the child
+    nodes.
+    """
+
+    def __init__(self, children: Iterable[Node] = (), *, weight=1):
+        super().__init__(weight=weight)
+        self.children: List[Node] = []
+        for child in children:
+            self.add(child)
+
+    def add(self, node: Node, index: Optional[int] = None) -> Node:
+        """Insert the *node* before the *index* or append it to the end of
+        the container. Returns the *node*.
+        """
+        if not isinstance(node, Node):
+            raise TypeError(f"expected a layout node, got {node!r}")
+        if node.parent is not None:
+            node.parent.remove(node)
+        was_empty = self._is_empty()
+        if index is None:
+            self.children.append(node)
+        else:
+            self.children.insert(index, node)
+        node.parent = self
+        node._mark_dirty()
+        self._changed(was_empty)
+        return node
+
+    def remove(self, node: Node):
+        """Remove the *node* from the container."""
+        was_empty = self._is_empty()
+        self.children.remove(node)
+        node.parent = None
+        self._changed(was_empty)
+
+    def _changed(self, was_empty):
+        self._mark_dirty()
+        if was_empty != self._is_empty() and self.parent is not None:
+            # Empty containers take no space, so the siblings have to be
+            # rearranged.
+            self.parent._mark_dirty()
+
+    def _is_empty(self):
+        return all(child._is_empty() for child in self.children)
+
+    def _split(self, rect: Rect, nodes: List[Node], gap: int) -> List[Rect]:
+        raise NotImplementedError
+
+    def __repr__(self):
+        children = ", ".join(map(repr, self.children))
+        return f"{self.__class__.__qualname__}([{children}])"
+
+
+class Columns(Container):
+    """The container that places its children side by side."""
+
+    def _split(self, rect, nodes, gap):
+        x, y, width, height = rect
+        return [
+            (start, y, size, height)
+            for start, size in _split_span(x, width, [node.weight for node in nodes], gap)
+        ]
+
+
+class Rows(Container):
+    """The container that places its children from top to bottom."""
+
+    def _split(self, rect, nodes, gap):
+        x, y, width, height = rect
+        return [
+            (x, start, width, size)
+            for start, size in _split_span(y, height, [node.weight for node in nodes], gap)
+        ]
+
+
+class Stack(Container):
+    """The container that gives every child its whole area, like a tabbed or
+    monocle layout.
+    """
+
+    def _split(self, rect, nodes, gap):
+        return [rect] * len(nodes)
+
+
+class BSP(Container):
+    """The container that recursively halves its area along the longer side.
+
+    The first child takes half of the area, and the remaining children split
+    the other half in the same fashion. A child with the *weight* of 2 takes
+    two thirds of the area instead of a half.
+    """
+
+    def _split(self, rect, nodes, gap):
+        result = []
+        for i, node in enumerate(nodes):
+            if i == len(nodes) - 1:
+                result.append(rect)
+                break
+            weights = [node.weight, 1]
+            x, y, width, height = rect
+            if width >= height:
+                (x1, w1), (x2, w2) = _split_span(x, width, weights, gap)
+                result.append((x1, y, w1, height))
+                rect = (x2, y, w2, height)
+            else:
+                (y1, h1), (y2, h2) = _split_span(y, height, weights, gap)
+                result.append((x, y1, width, h1))
+                rect = (x, y2, width, h2)
+        return result
+
+
+def _split_span(start, size, weights, gap):
+    count = len(weights)
+    available = max(size - gap * (count - 1), 0)
+    total = sum(weights)
+    result = []
+    acc = 0
+    prev_end = 0
+    for i, weight in enumerate(weights):
+        acc += weight
+        end = round(available * acc / total)
+        result.append((start + prev_end + gap * i, end - prev_end))
+        prev_end = end
+    return result
+
+
+class Layout:
+    """The tiling layout that arranges windows according to the tree of
+    nodes.
+
+    A layout is a tree of containers with windows in the leaves. Each container
+    splits its area between its children: :class:`Columns` side by side,
+    :class:`Rows` top to bottom, :class:`BSP` by binary space partitioning, and
+    :class:`Stack` gives every child the whole area.
+
+    Changing the tree marks only the affected container dirty. On
+    :meth:`arrange`, only the dirty subtrees are recomputed, and only the
+    windows whose rectangles actually changed are moved in a single batch::
+
+        from ahkpy import tiling
+
+        layout = tiling.Layout(tiling.Columns(), gap=8)
+
+        @ahkpy.set_timer(0.5)
+        def retile():
+            layout.sync(ahkpy.windows.filter(exe="notepad.exe"))
+
+    The *root* is the top-level container. Defaults to :class:`Columns`.
+
+    The *area* is the ``(x, y, width, height)`` rectangle that the windows are
+    arranged in. Defaults to the work area of the primary monitor.
+
+    The *gap* sets the distance in pixels between the adjacent windows.
+
+    The *apply* function is called with the dictionary that maps the moved
+    windows to their new rectangles. By default, the :class:`~ahkpy.Window`
+    instances are moved all at once with `DeferWindowPos
+    <https://docs.microsoft.com/en-us/windows/win32/api/winuser/nf-winuser-deferwindowpos>`_.
+    """
+
+    def __init__(self, root: Optional[Container] = None, *, area: Optional[Rect] = None, gap=0,
+                 apply: Optional[Callable[[Dict[Hashable, Rect]], None]] = None):
+        if gap < 0:
+            raise ValueError("gap must be non-negative")
+        if root is None:
+            root = Columns()
+        self.root = root
+        self.gap = gap
+        self.apply = apply if apply is not None else _defer_window_pos
+        self._area = area
+        self._leaves: Dict[Hashable, Leaf] = {}
+        self._rects: Dict[Hashable, Rect] = {}
+        self._applied: Dict[Hashable, Rect] = {}
+        for leaf in _iter_leaves(root):
+            self._leaves[leaf.window] = leaf
+
+    @property
+    def area(self) -> Rect:
+        """The rectangle that the windows are arranged in.
+
+        :type: Tuple[int, int, int, int]
+        """
+        if self._area is None:
+            from .monitor import monitors
+            primary = next(m for m in monitors() if m.is_primary)
+            return primary.work_area
+        return self._area
+
+    @area.setter
+    def area(self, value):
+        self._area = tuple(value) if value is not None else None
+        self.root._mark_dirty()
+
+    def add(self, window: Hashable, container: Optional[Container] = None, index: Optional[int] = None,
+            *, weight=1) -> Leaf:
+        """Add the *window* to the *container*, or to the root container if
+        it's not given. Returns the leaf node of the window.
+
+        If the window is already in the layout, it's moved to the container.
+        """
+        if container is None:
+            container = self.root
+        leaf = self._leaves.get(window)
+        if leaf is None:
+            leaf = Leaf(window, weight=weight)
+            self._leaves[window] = leaf
+        container.add(leaf, index)
+        return leaf
+
+    def remove(self, window: Hashable) -> bool:
+        """Remove the *window* from the layout.
+
+        Returns ``True`` if the window was in the layout.
+        """
+        leaf = self._leaves.pop(window, None)
+        if leaf is None:
+            return False
+        if leaf.parent is not None:
+            leaf.parent.remove(leaf)
+        self._rects.pop(window, None)
+        self._applied.pop(window, None)
+        return True
+
+    def find(self, window: Hashable) -> Optional[Leaf]:
+        """Find the leaf node of the *window*. Returns ``None`` if the window
+        is not in the layout.
+        """
+        return self._leaves.get(window)
+
+    def __contains__(self, window):
+        return window in self._leaves
+
+    def __len__(self):
+        return len(self._leaves)
+
+    @property
+    def rects(self) -> Dict[Hashable, Rect]:
+        """The rectangles of the windows computed by the last
+        :meth:`arrange` call (read-only).
+
+        :type: Dict[Window, Tuple[int, int, int, int]]
+        """
+        return dict(self._rects)
+
+    def arrange(self, force=False) -> Dict[Hashable, Rect]:
+        """Recompute the dirty parts of the layout and move the windows whose
+        rectangles changed.
+
+        If *force* is true, all windows are moved to their rectangles, even
+        if they haven't changed since the last call. Useful when the windows
+        were moved by the user.
+
+        Returns the dictionary that maps the moved windows to their new
+        rectangles.
+        """
+        self._visit(self.root, self.area)
+        if force:
+            self._applied.clear()
+        changes = {
+            window: rect
+            for window, rect in self._rects.items()
+            if self._applied.get(window) != rect
+        }
+        if changes:
+            self.apply(changes)
+            self._applied.update(changes)
+        return changes
+
+    def sync(self, windows: Iterable[Hashable], container: Optional[Container] = None) -> Dict[Hashable, Rect]:
+        """Make the layout contain exactly the given *windows* and arrange
+        them.
+
+        The windows that are not in the layout yet are added to the
+        *container*, or to the root container if it's not given. The windows
+        that are not in *windows* anymore are removed. Usually, *windows* is
+        an :class:`~ahkpy.Windows` instance.
+
+        Returns the dictionary that maps the moved windows to their new
+        rectangles.
+        """
+        windows = list(windows)
+        current = set(windows)
+        for window in list(self._leaves):
+            if window not in current:
+                self.remove(window)
+        for window in windows:
+            if window not in self._leaves:
+                self.add(window, container)
+        return self.arrange()
+
+    def _visit(self, node, rect):
+        if rect == node.rect and not node._dirty:
+            if node._dirty_below:
+                node._dirty_below = False
+                for child in node.children:
+                    if child.rect is not None:
+                        self._visit(child, child.rect)
+            return
+
+        node.rect = rect
+        node._dirty = False
+        node._dirty_below = False
+        if isinstance(node, Leaf):
+            self._rects[node.window] = rect
+            return
+
+        visible = [child for child in node.children if not child._is_empty()]
+        for child in node.children:
+            if child._is_empty():
+                _forget(child)
+        if not visible:
+            return
+        for child, child_rect in zip(visible, node._split(rect, visible, self.gap)):
+            self._visit(child, child_rect)
+
+
+def _forget(node):
+    node.rect = None
+    node._dirty = True
+    node._dirty_below = False
+    if isinstance(node, Container):
+        for child in node.children:
+            _forget(child)
+
+
+def _iter_leaves(node):
+    if isinstance(node, Leaf):
+        yield node
+    else:
+        for child in node.children:
+            yield from _iter_leaves(child)
+
+
+def _defer_window_pos(changes):
+    user32 = _user32()
+    SWP_NOZORDER = 0x0004
+    SWP_NOACTIVATE = 0x0010
+    hdwp = user32.BeginDeferWindowPos(len(changes))
+    for window, (x, y, width, height) in changes.items():
+        if not hdwp:
+            break
+        hdwp = user32.DeferWindowPos(
+            hdwp, window.id, None, x, y, width, height, SWP_NOZORDER | SWP_NOACTIVATE,
+        )
+    if hdwp and user32.EndDeferWindowPos(hdwp):
+        return
+
+    # One of the windows is gone or belongs to a higher integrity process.
+    # The whole batch is discarded, so move the windows one by one.
+    for window, (x, y, width, height) in changes.items():
+        window.move(x, y, width, height)
+
+
+@functools.lru_cache(maxsize=None)
+def _user32():
+    # Private instance, so the prototypes don't leak into ctypes.windll and
+    # don't break the other callers of these functions.
+    user32 = ctypes.WinDLL("user32")
+    user32.BeginDeferWindowPos.argtypes = (ctypes.c_int,)
+    user32.BeginDeferWindowPos.restype = ctypes.c_void_p
+    user32.DeferWindowPos.argtypes = (
+        ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p,
+        ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_uint,
+    )
+    user32.DeferWindowPos.restype = ctypes.c_void_p
+    user32.EndDeferWindowPos.argtypes = (ctypes.c_void_p,)
+    user32.EndDeferWindowPos.restype = ctypes.c_int
+    return user32
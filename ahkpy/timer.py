@@ -1,18 +1,30 @@
+import contextvars
 import dataclasses as dc
 import functools
-import weakref
-from typing import Callable, Optional
+import heapq
+import itertools
+import time
+from typing import Callable, Dict, List, Optional
 
-from .flow import ahk_call, void
+from . import flow
+from .flow import ahk_call
+from .histogram import Histogram
+from .pool import RUN_IN_MODES, _dispatcher
 
 __all__ = [
+    "PreciseTimerStats",
     "Timer",
+    "TimerStats",
+    "get_low_power",
+    "get_timer_stats",
     "set_countdown",
+    "set_low_power",
     "set_timer",
 ]
 
 
-def set_timer(interval=0.25, func=None, *args, priority=0):
+def set_timer(interval=0.25, func=None, *args, priority=0, run_in=None, precise=False, catch_up="coalesce",
+              slack=None):
     """Create a timer that will run *func* periodically with arguments *args*
     after *interval* seconds have passed.
 
@@ -24,6 +36,31 @@ def set_timer(interval=0.25, func=None, *args, priority=0):
     executed. It must be an :class:`int` between -2147483648 and
     2147483647. Defaults to 0.
 
+    If the optional *run_in* argument is ``"thread"`` or ``"process"``, *func*
+    is executed in a pool instead of the AHK thread. The tick is skipped if the
+    previous call of *func* is still queued or running. For more information
+    refer to :meth:`HotkeyContext.hotkey`.
+
+    The optional *slack* argument sets how many seconds the timer may be
+    delayed, so that it runs together with other timers and the script wakes
+    up less often. Defaults to 0, or to the slack set with
+    :func:`set_low_power`.
+
+    By default, the next tick is scheduled *interval* seconds after the
+    previous tick has started, so the ticks slip when they start late. If
+    *precise* is true, the ticks are scheduled at fixed deadlines, every
+    *interval* seconds since the timer was started, and a late tick doesn't
+    delay the following ones. The *catch_up* argument sets what happens to
+    the deadlines that were missed while the script was busy:
+
+    - ``"coalesce"`` – call *func* once for all the missed deadlines;
+    - ``"burst"`` – call *func* for every missed deadline, one after another;
+    - ``"skip"`` – don't call *func* for the deadlines missed by a whole
+      *interval* or more.
+
+    The precise timers collect the lateness and jitter statistics in
+    :attr:`Timer.stats`.
+
     If *func* is given, returns an instance :class:`Timer`. Otherwise, the
     function works as a decorator::
 
@@ -36,7 +73,9 @@ def set_timer(interval=0.25, func=None, *args, priority=0):
     :command: `SetTimer
        <https://www.autohotkey.com/docs/commands/SetTimer.htm>`_
     """
-    t = Timer(interval, func, priority, periodic=True)
+    t = Timer(
+        interval, func, priority, periodic=True, run_in=run_in, precise=precise, catch_up=catch_up, slack=slack,
+    )
 
     def set_timer_decorator(func):
         if args:
@@ -50,7 +89,7 @@ def set_timer(interval=0.25, func=None, *args, priority=0):
     return set_timer_decorator(func)
 
 
-def set_countdown(interval=0.25, func=None, *args, priority=0):
+def set_countdown(interval=0.25, func=None, *args, priority=0, run_in=None, slack=None):
     """Create a timer that will run *func* once with arguments *args* after
     *interval* seconds have passed.
 
@@ -62,6 +101,16 @@ def set_countdown(interval=0.25, func=None, *args, priority=0):
     executed. It must be an :class:`int` between -2147483648 and
     2147483647. Defaults to 0.
 
+    If the optional *run_in* argument is ``"thread"`` or ``"process"``, *func*
+    is executed in a pool instead of the AHK thread. The tick is skipped if the
+    previous call of *func* is still queued or running. For more information
+    refer to :meth:`HotkeyContext.hotkey`.
+
+    The optional *slack* argument sets how many seconds the timer may be
+    delayed, so that it runs together with other timers and the script wakes
+    up less often. Defaults to 0, or to the slack set with
+    :func:`set_low_power`.
+
     If *func* is given, returns an instance :class:`Timer`. Otherwise, the
     function works as a decorator::
 
@@ -74,7 +123,7 @@ def set_countdown(interval=0.25, func=None, *args, priority=0):
     :command: `SetTimer
        <https://www.autohotkey.com/docs/commands/SetTimer.htm>`_
     """
-    t = Timer(interval, func, priority, periodic=False)
+    t = Timer(interval, func, priority, periodic=False, run_in=run_in, slack=slack)
 
     def set_countdown_decorator(func):
         if args:
@@ -95,14 +144,28 @@ class Timer:
 
     Creating an instance of :class:`!Timer` doesn't register the function in
     AHK. Use the :func:`set_timer` or :func:`set_countdown` functions instead.
+
+    The timers don't create an AHK timer each. Instead, the timers with the
+    same priority are kept in a queue ordered by their deadlines, and a single
+    AHK timer is set to fire at the nearest deadline and run all the timers
+    that are due. This way, thousands of timers cost as much to AHK as one.
+    Since the due timers run one after another in the same AHK thread, a
+    timer function that takes long or calls :func:`sleep` delays other
+    timers of the same priority. Use the *run_in* argument for such
+    functions.
     """
 
     interval: float = 0.25
     func: Optional[Callable] = None
     priority: int = 0
     periodic: bool = True
+    run_in: Optional[str] = None
+    precise: bool = False
+    catch_up: str = "coalesce"
+    slack: Optional[float] = None
 
-    def __init__(self, interval=0.25, func=None, priority=0, periodic=True):
+    def __init__(self, interval=0.25, func=None, priority=0, periodic=True, run_in=None, precise=False,
+                 catch_up="coalesce", slack=None):
         self.func = func
 
         if interval < 0:
@@ -115,7 +178,21 @@ class Timer:
 
         self.periodic = periodic
 
-        self._ref: Optional[weakref.ReferenceType] = None
+        if run_in is not None and run_in not in RUN_IN_MODES:
+            raise ValueError(f"{run_in!r} is not a valid run_in mode")
+        self.run_in = run_in
+
+        if catch_up not in CATCH_UP_POLICIES:
+            raise ValueError(f"{catch_up!r} is not a valid catch_up policy")
+        self.precise = bool(precise)
+        self.catch_up = catch_up
+
+        if slack is not None and slack < 0:
+            raise ValueError("slack must be positive")
+        self.slack = slack
+
+        self._entry: Optional[_Entry] = None
+        self._stats: Optional[PreciseTimerStats] = None
 
     def start(self, interval=None, priority=None, periodic=None):
         """Start a stopped timer or restart a running timer.
@@ -124,7 +201,7 @@ class Timer:
         :class:`!Timer` instance will be updated with the new values. See the
         :meth:`Timer.update` method.
         """
-        self.update(interval=interval, priority=priority, force_restart=True)
+        self.update(interval=interval, priority=priority, periodic=periodic, force_restart=True)
 
     def update(self, func=None, interval=None, priority=None, periodic=None, force_restart=False):
         """Update the parameters of a timer and register them in AHK.
@@ -148,21 +225,14 @@ class Timer:
         if func is not None:
             self.stop()
             self.func = func
-            self._ref = None
         elif self.func is None:
             raise TypeError("func must not be None")
 
-        # When AHK timer is deleted it releases the reference to the passed
-        # callback. We can use this to check if the timer is alive.
-        func_wrapper = None
-        if self._ref is not None:
-            func_wrapper = self._ref()
-        if func_wrapper is None:
-            # AHK timer was deleted or never started.
+        entry = self._entry
+        if entry is None or entry.callback is None:
+            # The timer has expired or was never started.
             if not callable(self.func):
                 raise TypeError("timer callback must be callable")
-            func_wrapper = void(self.func)
-            self._ref = weakref.ref(func_wrapper)
             force_restart = True
 
         if interval is not None or periodic is not None or force_restart:
@@ -171,31 +241,420 @@ class Timer:
             if interval < 0:
                 raise ValueError("interval must be positive")
             self.interval = interval
-            interval = int(interval * 1000)
-
             if periodic is not None:
                 self.periodic = bool(periodic)
-            if not self.periodic:
-                interval *= -1
+            restart = True
         else:
-            interval = ""
+            restart = False
 
-        if priority is not None or force_restart:
-            if priority is None:
-                priority = self.priority
+        if priority is not None:
             if not -2147483648 <= priority <= 2147483647:
                 raise ValueError("priority must be between -2147483648 and 2147483647")
             self.priority = priority
-        else:
-            priority = ""
 
-        if interval != "" or priority != "":
-            ahk_call("SetTimer", func_wrapper, interval, priority)
+        if restart:
+            if self.run_in is None:
+                callback = self.func
+            else:
+                # The pool task returns nothing, and the process pool needs
+                # the picklable original function.
+                callback = _dispatcher(self.func, self.run_in, self.priority)
+            self.stop()
+            if self.precise and self._stats is None:
+                self._stats = PreciseTimerStats()
+            self._entry = _get_scheduler(self.priority).add(
+                callback, self.interval, self.periodic, contextvars.copy_context(),
+                precise=self.precise, catch_up=self.catch_up, stats=self._stats if self.precise else None,
+                slack=self.slack,
+            )
+        elif priority is not None and entry.scheduler.priority != self.priority:
+            # Move the timer to the scheduler of the new priority, keeping its
+            # deadline.
+            callback, context = entry.callback, entry.context
+            entry.scheduler.remove(entry)
+            self._entry = _get_scheduler(self.priority).add(
+                callback, entry.interval, entry.periodic, context, deadline=entry.deadline,
+                precise=entry.precise, catch_up=entry.catch_up, stats=entry.stats, slack=entry.slack,
+            )
+
+    @property
+    def stats(self) -> Optional["PreciseTimerStats"]:
+        """The lateness and jitter statistics of a precise timer (read-only).
+
+        ``None`` if the timer was not started with ``precise=True``.
+
+        :type: Optional[PreciseTimerStats]
+        """
+        return self._stats
 
     def stop(self):
         """Stop the timer."""
-        if not self._ref:
+        entry = self._entry
+        if entry is None:
             return
-        func = self._ref()
-        if func is not None:
-            ahk_call("SetTimer", func, "Delete")
+        self._entry = None
+        entry.scheduler.remove(entry)
+
+
+@dc.dataclass
+class TimerStats:
+    """The statistics of the timer scheduler.
+
+    All the timers with the same priority run off a single AHK timer. It's
+    re-armed to fire at the nearest deadline, and calls all the timers that
+    are due. All durations are in seconds.
+    """
+
+    #: The number of running timers.
+    queue_size: int = 0
+
+    #: The greatest number of timers that were running at the same time.
+    max_queue_size: int = 0
+
+    #: The number of times the AHK timers fired.
+    ticks: int = 0
+
+    #: The :func:`time.perf_counter` value when the stats were reset.
+    since: float = dc.field(default_factory=time.perf_counter)
+
+    #: The number of timer function calls.
+    calls: int = 0
+
+    #: The number of ticks that took longer than the time left to the next
+    #: deadline, delaying the timers that were due next.
+    overruns: int = 0
+
+    #: The time from the deadline of a timer to the start of its function.
+    lateness: Histogram = dc.field(default_factory=Histogram)
+
+    @property
+    def wakeups_per_second(self) -> float:
+        """The average number of times per second the AHK timers fired since
+        the stats were reset.
+
+        Doesn't include the checks for Ctrl+C that happen every 0.1 seconds,
+        or less often in the low power mode.
+        """
+        elapsed = time.perf_counter() - self.since
+        if elapsed <= 0:
+            return 0.0
+        return self.ticks / elapsed
+
+    def reset(self):
+        """Reset all the counters to zero, except :attr:`queue_size`."""
+        self.max_queue_size = self.queue_size
+        self.since = time.perf_counter()
+        self.ticks = 0
+        self.calls = 0
+        self.overruns = 0
+        self.lateness.reset()
+
+
+def get_timer_stats() -> TimerStats:
+    """Get the statistics of the timer scheduler.
+
+    The following example prints how late the timers fire::
+
+        stats = ahkpy.get_timer_stats()
+        print(stats.queue_size, stats.lateness.percentile(99))
+    """
+    return _stats
+
+
+_stats = TimerStats()
+
+
+def set_low_power(enabled=True, *, slack=0.1, housekeeping_interval=1.0):
+    """Enable or disable the low power mode, where the script wakes up less
+    often.
+
+    In the low power mode, the timers that were created without the *slack*
+    argument may be delayed by up to *slack* seconds, so that the timers with
+    similar deadlines run together. The Ctrl+C checks happen every
+    *housekeeping_interval* seconds instead of 0.1 seconds, and
+    :func:`sleep` and :func:`coop` poll the AHK message queue less often.
+
+    Use :attr:`TimerStats.wakeups_per_second` to see the effect.
+    """
+    if slack < 0:
+        raise ValueError("slack must be positive")
+    if housekeeping_interval <= 0:
+        raise ValueError("housekeeping_interval must be positive")
+    global _low_power_slack
+    if enabled:
+        _low_power_slack = slack
+        flow._poll_interval = LOW_POWER_POLL_INTERVAL
+        ahk_call("SetCheckSignalsInterval", int(housekeeping_interval * 1000))
+    else:
+        _low_power_slack = None
+        flow._poll_interval = DEFAULT_POLL_INTERVAL
+        ahk_call("SetCheckSignalsInterval", DEFAULT_CHECK_SIGNALS_INTERVAL)
+    for scheduler in _schedulers.values():
+        scheduler.rebuild()
+
+
+def get_low_power() -> bool:
+    """Get whether the low power mode is enabled."""
+    return _low_power_slack is not None
+
+
+DEFAULT_POLL_INTERVAL = 0.01
+LOW_POWER_POLL_INTERVAL = 0.05
+# In milliseconds, as set in Python.ahk.
+DEFAULT_CHECK_SIGNALS_INTERVAL = 100
+
+_low_power_slack: Optional[float] = None
+
+
+@dc.dataclass
+class PreciseTimerStats:
+    """The statistics of a timer started with ``precise=True``.
+
+    All durations are in seconds.
+    """
+
+    #: The number of timer function calls.
+    calls: int = 0
+
+    #: The number of deadlines that were coalesced or skipped according to
+    #: the *catch_up* policy.
+    missed: int = 0
+
+    #: The time from the deadline to the start of the timer function.
+    lateness: Histogram = dc.field(default_factory=Histogram)
+
+    #: The deviation of the time between the starts of consecutive calls from
+    #: the timer interval.
+    jitter: Histogram = dc.field(default_factory=Histogram)
+
+    def reset(self):
+        """Reset all the counters to zero."""
+        self.calls = 0
+        self.missed = 0
+        self.lateness.reset()
+        self.jitter.reset()
+
+
+CATCH_UP_POLICIES = {"coalesce", "burst", "skip"}
+
+
+class _Entry:
+    __slots__ = (
+        "deadline", "seq", "callback", "interval", "periodic", "context", "scheduler",
+        "precise", "catch_up", "stats", "last_start", "slack",
+    )
+
+    def __init__(self, deadline, seq, callback, interval, periodic, context, scheduler,
+                 precise=False, catch_up="coalesce", stats=None, slack=None):
+        self.deadline = deadline
+        self.seq = seq
+        # Set to None when the timer is stopped. The entry stays in the heap
+        # until its deadline, but doesn't reference the function anymore.
+        self.callback = callback
+        self.interval = interval
+        self.periodic = periodic
+        self.context = context
+        self.scheduler = scheduler
+        self.precise = precise
+        self.catch_up = catch_up
+        self.stats = stats
+        self.last_start: Optional[float] = None
+        self.slack = slack
+
+    @property
+    def latest(self):
+        # The time by which the timer must have run.
+        slack = self.slack
+        if slack is None:
+            slack = _low_power_slack or 0
+        return self.deadline + slack
+
+    def __lt__(self, other):
+        return (self.deadline, self.seq) < (other.deadline, other.seq)
+
+
+class _Scheduler:
+    # The heap of the timers of a single priority, run off a one-shot AHK
+    # timer that is re-armed after every tick. The timers are ordered by
+    # their deadlines in 'heap'. The 'latest' heap orders them by the time
+    # they must have run, including the slack, and the AHK timer is armed to
+    # the earliest of those times. Then all the timers whose deadlines have
+    # passed run in a single tick.
+
+    def __init__(self, priority, clock=time.perf_counter):
+        self.priority = priority
+        self.clock = clock
+        self.heap: List[_Entry] = []
+        self.latest: List[tuple] = []
+        self.active = 0
+        self.counter = itertools.count()
+        self.armed: Optional[float] = None
+        self.running = False
+        # Keep the bound method, so that AHK gets the same callable and
+        # reuses its timer.
+        self.tick_func = self.tick
+
+    def add(self, callback, interval, periodic, context, deadline=None, precise=False, catch_up="coalesce",
+            stats=None, slack=None):
+        if deadline is None:
+            deadline = self.clock() + interval
+        entry = _Entry(
+            deadline, next(self.counter), callback, interval, periodic, context, self, precise, catch_up, stats,
+            slack,
+        )
+        self.push(entry)
+        self.active += 1
+        _stats.queue_size += 1
+        if _stats.queue_size > _stats.max_queue_size:
+            _stats.max_queue_size = _stats.queue_size
+        if not self.running and (self.armed is None or entry.latest < self.armed):
+            self.arm()
+        return entry
+
+    def push(self, entry):
+        heapq.heappush(self.heap, entry)
+        heapq.heappush(self.latest, (entry.latest, entry.seq, entry))
+
+    def rebuild(self):
+        # Drop the stopped timers and recompute the slack.
+        self.heap = [entry for entry in self.heap if entry.callback is not None]
+        heapq.heapify(self.heap)
+        self.latest = [(entry.latest, entry.seq, entry) for entry in self.heap]
+        heapq.heapify(self.latest)
+        if not self.running:
+            self.arm()
+
+    def remove(self, entry):
+        if entry.callback is None or entry.scheduler is not self:
+            return
+        entry.callback = None
+        entry.context = None
+        self.active -= 1
+        _stats.queue_size -= 1
+        if not self.active:
+            self.heap.clear()
+            self.latest.clear()
+            if not self.running:
+                self.disarm()
+        elif len(self.latest) > 2 * self.active + 64:
+            # Drop the stopped timers, e.g. after many restarts of a timer
+            # with a long interval.
+            self.rebuild()
+
+    def pop_due(self, now):
+        due = []
+        heap = self.heap
+        while heap and heap[0].deadline <= now:
+            entry = heapq.heappop(heap)
+            if entry.callback is not None:
+                due.append(entry)
+        while heap and heap[0].callback is None:
+            heapq.heappop(heap)
+        return due
+
+    def tick(self):
+        self.armed = None
+        self.running = True
+        now = self.clock()
+        due = self.pop_due(now)
+        _stats.ticks += 1
+        next_deadline = self.heap[0].deadline if self.heap else None
+        try:
+            for i, entry in enumerate(due):
+                callback, context = entry.callback, entry.context
+                if callback is None:
+                    # Stopped by a function that ran earlier in this tick.
+                    continue
+                start = self.clock()
+                lateness = max(0.0, start - entry.deadline)
+                if entry.periodic:
+                    call = self.reschedule(entry, start)
+                    entry.seq = next(self.counter)
+                    self.push(entry)
+                    if not call:
+                        continue
+                else:
+                    self.remove(entry)
+                _stats.calls += 1
+                _stats.lateness.add(lateness)
+                stats = entry.stats
+                if stats is not None:
+                    stats.calls += 1
+                    stats.lateness.add(lateness)
+                    if entry.last_start is not None:
+                        stats.jitter.add(abs(start - entry.last_start - entry.interval))
+                    entry.last_start = start
+                try:
+                    # Like AHK callbacks, run in a copy of the context that was
+                    # current when the timer was started.
+                    context.copy().run(callback)
+                except BaseException:
+                    # Let AHK report the error, and run the rest of the due
+                    # timers on the next tick.
+                    for rest in due[i + 1:]:
+                        if rest.callback is not None:
+                            self.push(rest)
+                    raise
+        finally:
+            self.running = False
+            if next_deadline is not None and self.clock() > next_deadline:
+                _stats.overruns += 1
+            if self.active:
+                self.arm()
+            else:
+                self.heap.clear()
+                self.latest.clear()
+                self.disarm()
+
+    def reschedule(self, entry, now):
+        # Set the next deadline of a periodic timer. Returns whether the timer
+        # function should be called for the current one.
+        interval = entry.interval
+        if not entry.precise:
+            entry.deadline = now + interval
+            return True
+        if interval <= 0:
+            entry.deadline = now
+            return True
+        late = now - entry.deadline
+        if entry.catch_up == "burst" or late < interval:
+            entry.deadline += interval
+            return True
+        missed = int(late // interval)
+        # The first deadline on the grid that is still ahead.
+        entry.deadline += (missed + 1) * interval
+        if entry.catch_up == "skip":
+            entry.stats.missed += missed + 1
+            # Restart the jitter measurement after the gap.
+            entry.last_start = None
+            return False
+        entry.stats.missed += missed
+        return True
+
+    def arm(self):
+        latest = self.latest
+        while latest and (latest[0][2].callback is None or latest[0][2].seq != latest[0][1]):
+            # A stopped or rescheduled timer.
+            heapq.heappop(latest)
+        if not latest:
+            return
+        fire_at = latest[0][0]
+        self.armed = fire_at
+        delay = max(1, int((fire_at - self.clock()) * 1000))
+        ahk_call("SetTimer", self.tick_func, -delay, self.priority)
+
+    def disarm(self):
+        if self.armed is None:
+            return
+        self.armed = None
+        ahk_call("SetTimer", self.tick_func, "Delete")
+
+
+_schedulers: Dict[int, _Scheduler] = {}
+
+
+def _get_scheduler(priority):
+    scheduler = _schedulers.get(priority)
+    if scheduler is None:
+        scheduler = _schedulers[priority] = _Scheduler(priority)
+    return scheduler
@@ -0,0 +1,255 @@
+import functools
+import re
+import threading
+import time
+from typing import Callable, Optional
+
+from .flow import _wait_for, _wrap_callback
+from .timer import set_countdown
+
+__all__ = [
+    "Watch",
+]
+
+
+MATCH_MODES = {"startswith", "contains", "exact", "regex"}
+
+
+class Watch:
+    """The object that samples some state on the AHK event loop until it
+    satisfies the given condition.
+
+    Unlike the blocking AHK commands like `StatusBarWait
+    <https://www.autohotkey.com/docs/commands/StatusBarWait.htm>`_, the watch
+    never blocks the AHK thread: the state is sampled from a timer, so hotkeys
+    and other timers keep working while the watch is pending. All pending
+    watches share a single sampling timer.
+
+    The *sample* callable is called without arguments and must return the
+    current value of the state. Returning ``None`` means that the watched object
+    doesn't exist anymore, which finishes the watch with the ``None`` result.
+    The *condition* callable takes the sampled value and returns ``True`` when
+    the watch should finish with the ``True`` result.
+
+    The state is first sampled every *interval* seconds. The interval grows
+    each time the sampled value stays the same, up to *max_interval* seconds,
+    and drops back to *interval* once the value changes.
+
+    If the optional *timeout* is given, the watch finishes with the ``False``
+    result after this many seconds.
+
+    If the *func* is given, it will be called when the condition is met with
+    the :class:`!Watch` instance as the *watch* argument if the function
+    supports it.
+
+    Usually, you don't need to create the :class:`!Watch` instances yourself.
+    Use :meth:`Window.watch_status_bar` and :meth:`Control.watch_text` instead::
+
+        win = ahkpy.windows.get_active()
+        win.watch_status_bar("Done", lambda: print("done"), timeout=60)
+
+    The *key* argument identifies the sampled state. Watches with equal keys
+    sample the state only once per tick.
+    """
+
+    def __init__(self, sample: Callable, condition: Callable, func: Callable = None, *,
+                 timeout=None, interval=0.05, max_interval=1, key=None):
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if max_interval < interval:
+            raise ValueError("max_interval must not be less than interval")
+        if timeout is not None and timeout < 0:
+            raise ValueError("timeout must be non-negative")
+
+        self.sample = sample
+        self.condition = condition
+        if func is not None:
+            func = _wrap_callback(
+                func,
+                ("watch",),
+                _bare_watch_handler,
+                functools.partial(_watch_handler, watch=self),
+            )
+        self.func = func
+        self.interval = interval
+        self.max_interval = max_interval
+        self.key = key
+        self.timeout = timeout
+
+        #: The last sampled value.
+        self.value = None
+        #: ``True`` if the condition was met, ``None`` if the watched object
+        #: disappeared, ``False`` if the watch timed out or was cancelled.
+        self.result: Optional[bool] = None
+        self.done = False
+
+        self._exc = None
+        self._current_interval = interval
+        self._due = 0.0
+        self._deadline = None
+
+    def start(self):
+        """Start sampling the state.
+
+        The state is sampled for the first time on the next tick of the shared
+        sampling timer.
+        """
+        self.done = False
+        self._exc = None
+        self._current_interval = self.interval
+        self._due = time.perf_counter()
+        if self.timeout is not None:
+            self._deadline = self._due + self.timeout
+        _scheduler.add(self)
+        return self
+
+    def cancel(self):
+        """Stop sampling the state. The watch finishes with the ``False``
+        result.
+        """
+        if self.done:
+            return
+        _scheduler.remove(self)
+        self._finish(False)
+
+    def wait(self, timeout=None) -> Optional[bool]:
+        """Wait until the watch is finished and return its result.
+
+        During the wait, AHK keeps handling hotkeys and other callbacks. If the
+        watch is not finished after *timeout* seconds, the watch is cancelled
+        and ``False`` is returned. If *timeout* is not specified or ``None``,
+        there is no limit to the wait time.
+
+        Raises the exception that occurred while sampling the state, if any.
+        """
+        _wait_for(timeout, lambda: self.done)
+        if not self.done:
+            self.cancel()
+        if self._exc is not None:
+            raise self._exc
+        return self.result
+
+    def _check(self, value, now):
+        if value is None:
+            self._finish(None)
+            return
+        changed = value != self.value
+        self.value = value
+        if self.condition(value):
+            self._finish(True)
+            return
+        if self._deadline is not None and now >= self._deadline:
+            self._finish(False)
+            return
+
+        if changed:
+            self._current_interval = self.interval
+        else:
+            self._current_interval = min(self._current_interval * 1.5, self.max_interval)
+        self._due = now + self._current_interval
+        if self._deadline is not None:
+            self._due = min(self._due, self._deadline)
+
+    def _fail(self, exc):
+        self._exc = exc
+        self._finish(None)
+
+    def _finish(self, result):
+        self.result = result
+        self.done = True
+
+    def __repr__(self):
+        state = "done" if self.done else "pending"
+        return f"<{self.__class__.__qualname__} key={self.key!r} {state} result={self.result!r}>"
+
+
+def _bare_watch_handler(func):
+    func()
+
+
+def _watch_handler(func, watch):
+    func(watch=watch)
+
+
+class _WatchScheduler:
+    # Keeps all pending watches and samples them from a single countdown that
+    # is re-armed to the earliest due watch.
+
+    def __init__(self):
+        self.watches = []
+        self.lock = threading.Lock()
+        self.timer = None
+        self.armed_at = None
+
+    def add(self, watch):
+        with self.lock:
+            if watch not in self.watches:
+                self.watches.append(watch)
+        self.arm()
+
+    def remove(self, watch):
+        with self.lock:
+            try:
+                self.watches.remove(watch)
+            except ValueError:
+                pass
+
+    def arm(self):
+        with self.lock:
+            if not self.watches:
+                return
+            due = min(w._due for w in self.watches)
+            if self.armed_at is not None and self.armed_at <= due:
+                return
+            self.armed_at = due
+        delay = max(0, due - time.perf_counter())
+        if self.timer is None:
+            self.timer = set_countdown(delay, self.tick)
+        else:
+            self.timer.start(delay)
+
+    def tick(self):
+        self.armed_at = None
+        now = time.perf_counter()
+        with self.lock:
+            due = [w for w in self.watches if w._due <= now]
+        samples = {}
+        try:
+            for watch in due:
+                try:
+                    if watch.key is not None and watch.key in samples:
+                        value = samples[watch.key]
+                    else:
+                        value = watch.sample()
+                        if watch.key is not None:
+                            samples[watch.key] = value
+                    watch._check(value, now)
+                except Exception as exc:
+                    watch._fail(exc)
+                if watch.done:
+                    self.remove(watch)
+                    if watch.result and watch.func is not None:
+                        watch.func()
+        finally:
+            self.arm()
+
+
+_scheduler = _WatchScheduler()
+
+
+def _text_matcher(pattern, match):
+    if match not in MATCH_MODES:
+        raise ValueError(f"{match!r} is not a valid title match mode")
+    pattern = str(pattern)
+    if pattern == "" and match != "regex":
+        # Like StatusBarWait, an empty string waits for the text to become
+        # blank.
+        return lambda text: text == ""
+    if match == "startswith":
+        return lambda text: text.startswith(pattern)
+    elif match == "contains":
+        return lambda text: pattern in text
+    elif match == "exact":
+        return lambda text: text == pattern
+    regex = re.compile(pattern)
+    return lambda text: regex.search(text) is not None
@@ -1,18 +1,24 @@
 from __future__ import annotations
 
+import collections
 import ctypes
 import dataclasses as dc
 import enum
+import functools
 import struct
-from typing import Iterator, List, Optional, Tuple, Union
+import weakref
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
 from . import colors
+from . import flow
 from . import sending
-from .exceptions import Error
+from .exceptions import Error, WindowHungError
 from .flow import ahk_call, global_ahk_lock, _wait_for
-from .hotkey_context import HotkeyContext
+from .hotkey_context import HotkeyContext, _WindowContext
 from .settings import get_settings, optional_ms
 from .unset import UNSET, UnsetType
+from .watch import Watch, _text_matcher
 
 __all__ = [
     "Control",
@@ -21,6 +27,7 @@ __all__ = [
     "Windows",
     "WindowStyle",
     "all_windows",
+    "get_hung_counts",
     "visible_windows",
     "windows",
 ]
@@ -467,18 +474,16 @@ class Windows:
 
         For arguments refer to :meth:`filter`.
 
+        If AHK can check the criteria natively, the context doesn't call Python
+        when the hotkey is pressed. See :attr:`HotkeyContext.is_native`.
+
         :command: `Hotkey, IfWinExist
            <https://www.autohotkey.com/docs/commands/Hotkey.htm>`_, `#IfWinExist
            <https://www.autohotkey.com/docs/commands/_IfWinActive.htm>`_.
 
         """
-        # Not using Hotkey, IfWinActive/Exist because:
-        #
-        # 1. It doesn't support excluding windows.
-        # 2. It doesn't set DetectHiddenWindows from the given query before
-        #    enumerating the windows.
         self = self._filter(title, class_name, id, pid, exe, text, match)
-        return HotkeyContext(lambda: self.exist())
+        return self._context("IfWinExist", lambda: self.exist())
 
     def nonexistent_window_context(
             self, title=UNSET, *, class_name=UNSET, id=UNSET, pid=UNSET, exe=UNSET, text=UNSET, match=None):
@@ -489,13 +494,16 @@ class Windows:
 
         For arguments refer to :meth:`filter`.
 
+        If AHK can check the criteria natively, the context doesn't call Python
+        when the hotkey is pressed. See :attr:`HotkeyContext.is_native`.
+
         :command: `Hotkey, IfWinNotExist
            <https://www.autohotkey.com/docs/commands/Hotkey.htm>`_,
            `#IfWinNotExist
            <https://www.autohotkey.com/docs/commands/_IfWinActive.htm>`_.
         """
         self = self._filter(title, class_name, id, pid, exe, text, match)
-        return HotkeyContext(lambda: not self.exist())
+        return self._context("IfWinNotExist", lambda: not self.exist())
 
     def active_window_context(
             self, title=UNSET, *, class_name=UNSET, id=UNSET, pid=UNSET, exe=UNSET, text=UNSET, match=None):
@@ -506,13 +514,19 @@ class Windows:
 
         For arguments refer to :meth:`filter`.
 
+        If AHK can check the criteria natively, the context doesn't call Python
+        when the hotkey is pressed. See :attr:`HotkeyContext.is_native`.
+        Otherwise, unless the *text* criteria is given, the context is created
+        with ``cache=True``, so the matching is done once per foreground
+        window.
+
         :command: `Hotkey, IfWinActive
            <https://www.autohotkey.com/docs/commands/Hotkey.htm>`_,
            `#IfWinActive
            <https://www.autohotkey.com/docs/commands/_IfWinActive.htm>`_.
         """
         self = self._filter(title, class_name, id, pid, exe, text, match)
-        return HotkeyContext(lambda: self.get_active())
+        return self._context("IfWinActive", lambda: self.get_active(), cache=self._is_cacheable())
 
     def inactive_window_context(
             self, title=UNSET, *, class_name=UNSET, id=UNSET, pid=UNSET, exe=UNSET, text=UNSET, match=None):
@@ -523,13 +537,45 @@ class Windows:
 
         For arguments refer to :meth:`filter`.
 
+        If AHK can check the criteria natively, the context doesn't call Python
+        when the hotkey is pressed. See :attr:`HotkeyContext.is_native`.
+        Otherwise, unless the *text* criteria is given, the context is created
+        with ``cache=True``, so the matching is done once per foreground
+        window.
+
         :command: `Hotkey, IfWinNotActive
            <https://www.autohotkey.com/docs/commands/Hotkey.htm>`_,
            `#IfWinNotActive
            <https://www.autohotkey.com/docs/commands/_IfWinActive.htm>`_.
         """
         self = self._filter(title, class_name, id, pid, exe, text, match)
-        return HotkeyContext(lambda: not self.get_active())
+        return self._context("IfWinNotActive", lambda: not self.get_active(), cache=self._is_cacheable())
+
+    def _context(self, criterion, predicate, cache=False):
+        # Hotkey, IfWin... doesn't support excluding windows and matches the
+        # windows using the default settings of the script. If the criteria
+        # can't be expressed this way, fall back to the Python predicate.
+        if self._is_native():
+            win_title, win_text = self._include()
+            return _WindowContext(criterion, win_title, win_text, predicate)
+        return HotkeyContext(predicate, cache=cache)
+
+    def _is_native(self):
+        return (
+            self.title_mode == "startswith" and
+            self.text_mode == "fast" and
+            not self.hidden_windows and
+            (self.hidden_text or self.text is UNSET) and
+            self.exclude_title is UNSET and
+            self.exclude_text is UNSET and
+            None not in (self.title, self.class_name, self.id, self.pid, self.exe, self.text)
+        )
+
+    def _is_cacheable(self):
+        # Whether the window is active depends only on the foreground window
+        # and its title, which are tracked by the cached predicates. The window
+        # text can change silently.
+        return self.text is UNSET and self.exclude_text is UNSET
 
     def __iter__(self) -> Iterator[Window]:
         """__iter__() -> typing.Iterator[ahkpy.Window]
@@ -539,12 +585,38 @@ class Windows:
         :command: `WinGet, $, List
            <https://www.autohotkey.com/docs/commands/WinGet.htm#List>`_
         """
-        win_ids = self._call("WinGetList", *self._query())
-        if win_ids is None:
-            return
-        for win_id in win_ids.values():
-            if win_id > 0:
-                yield Window(win_id)
+        for win_id in self.ids():
+            yield Window(win_id)
+
+    def ids(self, title=UNSET, *, class_name=UNSET, id=UNSET, pid=UNSET, exe=UNSET, text=UNSET, match=None):
+        """ids(title: str = UNSET, **criteria) -> array.array
+
+        Return the ids (HWNDs) of the matching windows ordered from top to
+        bottom.
+
+        The ids are written by AHK directly into an :class:`array.array` of
+        signed 64-bit integers, so no :class:`Window` objects are created. Use
+        this method in the loops that run many times a second.
+
+        For arguments refer to :meth:`filter`.
+
+        :command: `WinGet, $, List
+           <https://www.autohotkey.com/docs/commands/WinGet.htm#List>`_
+        """
+        self = self._filter(title, class_name, id, pid, exe, text, match)
+        global _ids_capacity
+        while True:
+            capacity = _ids_capacity
+            buffer = array("q", bytes(8 * capacity))
+            address, _ = buffer.buffer_info()
+            count = self._call("WinGetIDs", address, capacity, *self._query())
+            if count is None:
+                return array("q")
+            if count <= capacity:
+                del buffer[count:]
+                return buffer
+            # More windows than expected, AHK didn't touch the buffer.
+            _ids_capacity = max(count * 2, capacity * 2)
 
     def __len__(self):
         """Return the number of matching windows.
@@ -593,7 +665,16 @@ class Windows:
             if set_delay:
                 ahk_call("SetWinDelay", optional_ms(get_settings().win_delay))
 
-            return ahk_call(cmd, *args)
+            if cmd not in _HUNG_SAFE_COMMANDS:
+                # Check the first window that the command is going to act on.
+                hwnd = self.id if isinstance(self.id, int) else ahk_call("WinExist", *self._query())
+                if hwnd:
+                    _check_hung(hwnd, cmd)
+
+            try:
+                return ahk_call(cmd, *args)
+            finally:
+                _restore_auto_execute_settings()
 
     def _query(self):
         return (*self._include(), *self._exclude())
@@ -623,13 +704,23 @@ class Windows:
         )
 
 
+# The initial size of the buffer for Windows.ids(). Grows to fit the largest
+# window list seen.
+_ids_capacity = 256
+
 windows = visible_windows = Windows()
 all_windows = windows.include_hidden_windows()
 
 
+_handles = weakref.WeakValueDictionary()
+
+
 @dc.dataclass(frozen=True)
 class WindowHandle:
     """The immutable object that contains the *id* (HWND) of a window/control.
+
+    The instances are interned: while a handle is alive, creating a handle of
+    the same class with the same *id* returns the existing object.
     """
 
     # I'd like the Window and Control classes to be hashable, and making the
@@ -637,7 +728,21 @@ class WindowHandle:
     # cannot have setter properties unless it's a subclass.
 
     id: Optional[int]
-    __slots__ = ("id",)
+    __slots__ = ("id", "__weakref__")
+
+    def __new__(cls, id):
+        # Intern the handles so that enumerating the same windows over and
+        # over again doesn't allocate new objects. The instances are immutable,
+        # so sharing them is safe.
+        key = (cls, id)
+        handle = _handles.get(key)
+        if handle is None:
+            handle = super().__new__(cls)
+            _handles[key] = handle
+        return handle
+
+    def __reduce__(self):
+        return self.__class__, (self.id,)
 
     def __bool__(self):
         """Check if the window/control exists.
@@ -679,7 +784,13 @@ class WindowHandle:
             if set_delay:
                 self._set_delay()
 
-            return ahk_call(cmd, *args)
+            if self.id:
+                _check_hung(self.id, cmd)
+
+            try:
+                return ahk_call(cmd, *args)
+            finally:
+                _restore_auto_execute_settings()
 
     def _set_delay(self):
         raise NotImplementedError
@@ -1958,29 +2069,44 @@ class Window(BaseWindow):
         Returns ``None`` if the window doesn't exist or there's no status bar.
         Raises an :exc:`Error` if there was a problem accessing the status bar.
 
+        Unlike the StatusBarWait command, AHK keeps handling hotkeys and other
+        callbacks during the wait. To wait for the status bar without blocking
+        the calling function use :meth:`watch_status_bar`.
+
         :command: `StatusBarWait
            <https://www.autohotkey.com/docs/commands/StatusBarWait.htm>`_
         """
-        # TODO: StatusBarWait is blocking and is not interruptable. However, it
-        # is usually more efficient to use StatusBarWait rather than calling
-        # StatusBarGetText in a loop.
-        try:
-            ok = self._call(
-                "StatusBarWait",
-                bar_text,
-                timeout,
-                part + 1,
-                *self._include(),
-                interval * 1000,
-                title_mode=match,
-            )
-            return bool(ok)
-        except Error as err:
-            if err.message == 2:
-                if not self._status_bar_exists():
-                    return None
-                err.message = "status bar cannot be accessed"
-            raise
+        watch = self.watch_status_bar(bar_text, part=part, interval=interval, max_interval=interval, match=match)
+        return watch.wait(timeout)
+
+    def watch_status_bar(self, bar_text="", func=None, *,
+                         timeout=None, part=0, interval=0.05, max_interval=1, match="startswith") -> Watch:
+        """watch_status_bar(bar_text="", func=None, **options) -> ahkpy.Watch
+
+        Start watching the window's status bar until it contains the specified
+        *bar_text* string without blocking the AHK thread.
+
+        If *func* is given, it will be called once the status bar text matches.
+        Use the :meth:`Watch.wait` method of the returned watch to wait for the
+        result.
+
+        The status bar is checked every *interval* seconds at first. The
+        interval grows up to *max_interval* seconds while the status bar text
+        stays the same.
+
+        For other arguments refer to :meth:`wait_status_bar`.
+        """
+        part = int(part)
+        watch = Watch(
+            functools.partial(self.get_status_bar_text, part),
+            _text_matcher(bar_text, match),
+            func,
+            timeout=timeout,
+            interval=interval,
+            max_interval=max_interval,
+            key=("status_bar", self.id, part),
+        )
+        return watch.start()
 
     def _status_bar_exists(self):
         status_bar = self.get_control("msctls_statusbar321")
@@ -2138,6 +2264,37 @@ class Control(BaseWindow):
     def text(self, value):
         return self._call("ControlSetText", "", str(value), *self._include(), set_delay=True)
 
+    def watch_text(self, text="", func=None, *,
+                   timeout=None, interval=0.05, max_interval=1, match="startswith") -> Watch:
+        """watch_text(text="", func=None, **options) -> ahkpy.Watch
+
+        Start watching the control until its text matches *text* without
+        blocking the AHK thread.
+
+        If *func* is given, it will be called once the control text matches. To
+        wait for the result, use the :meth:`Watch.wait` method of the returned
+        watch::
+
+            if status.watch_text("Ready", timeout=5).wait():
+                ...
+
+        The *match* argument specifies how *text* is matched. Defaults to
+        ``"startswith"``. For other modes refer to :meth:`Windows.filter`. An
+        empty *text* waits for the control text to become blank.
+
+        For other arguments refer to :meth:`Window.watch_status_bar`.
+        """
+        watch = Watch(
+            lambda: self.text,
+            _text_matcher(text, match),
+            func,
+            timeout=timeout,
+            interval=interval,
+            max_interval=max_interval,
+            key=("text", self.id),
+        )
+        return watch.start()
+
     @property
     def is_focused(self) -> bool:
         """Whether the control is focused (read-only).
@@ -2671,6 +2828,13 @@ class Control(BaseWindow):
             raise
 
 
+def _restore_auto_execute_settings():
+    # Don't let the match modes leak into the defaults that AHK saves from the
+    # auto-execute section and uses for the native window contexts.
+    if flow._in_auto_execute:
+        ahk_call("RestoreWindowSettings")
+
+
 def _set_title_match_mode(title_mode):
     if title_mode == "startswith":
         ahk_call("SetTitleMatchMode", 1)
@@ -2684,6 +2848,88 @@ def _set_title_match_mode(title_mode):
         raise ValueError(f"{title_mode!r} is not a valid title match mode")
 
 
+# The commands that don't send messages to the target window and can't get stuck
+# on it.
+_HUNG_SAFE_COMMANDS = {
+    "GroupAdd",
+    "WinActive",
+    "WinExist",
+    "WinGet",
+    "WinGetClass",
+    "WinGetIDs",
+    "WinGetList",
+    "WinGetPos",
+    "WinGetTitle",
+    "WinMinimizeAll",
+    "ControlGetPos",
+    "PostMessage",
+    # Killing the hung window is the way out.
+    "WinKill",
+}
+
+_hung_counts = collections.Counter()
+
+
+def _check_hung(hwnd, cmd):
+    if cmd in _HUNG_SAFE_COMMANDS:
+        return
+    user32 = _user32()
+    # IsHungAppWindow is cheap and reports the windows that haven't processed
+    # messages for 5 seconds. Pinging the window with WM_NULL fails fast on
+    # the windows that are busy right now, but waits for a round trip to the
+    # target process, so it's opt-in.
+    hung = user32.IsHungAppWindow(hwnd)
+    timeout = get_settings().hung_window_timeout
+    if not hung and timeout is not None:
+        WM_NULL = 0x0000
+        SMTO_ABORTIFHUNG = 0x0002
+        result = ctypes.c_size_t()
+        ok = user32.SendMessageTimeoutW(
+            hwnd, WM_NULL, 0, 0, SMTO_ABORTIFHUNG, max(int(timeout * 1000), 1), ctypes.byref(result),
+        )
+        # If the window doesn't exist anymore, let the command handle it.
+        hung = not ok and user32.IsWindow(hwnd)
+    if not hung:
+        return
+
+    pid = ctypes.c_ulong()
+    user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+    pid = pid.value
+    _hung_counts[pid] += 1
+    raise WindowHungError(f"window {hwnd:#x} is not responding", cmd, hwnd=hwnd, pid=pid)
+
+
+@functools.lru_cache(maxsize=None)
+def _user32():
+    # Private instance, so the prototypes don't leak into ctypes.windll and
+    # don't break the other callers of these functions.
+    from ctypes import wintypes
+
+    user32 = ctypes.WinDLL("user32", use_last_error=True)
+    user32.IsHungAppWindow.argtypes = (wintypes.HWND,)
+    user32.IsHungAppWindow.restype = wintypes.BOOL
+    user32.IsWindow.argtypes = (wintypes.HWND,)
+    user32.IsWindow.restype = wintypes.BOOL
+    user32.SendMessageTimeoutW.argtypes = (
+        wintypes.HWND, wintypes.UINT, wintypes.WPARAM, wintypes.LPARAM, wintypes.UINT, wintypes.UINT,
+        ctypes.POINTER(ctypes.c_size_t),
+    )
+    user32.SendMessageTimeoutW.restype = wintypes.LPARAM
+    user32.GetWindowThreadProcessId.argtypes = (wintypes.HWND, wintypes.LPDWORD)
+    user32.GetWindowThreadProcessId.restype = wintypes.DWORD
+    return user32
+
+
+def get_hung_counts() -> Dict[int, int]:
+    """Get the number of times the windows of each process were found hung.
+
+    Returns a dictionary that maps process identifiers to the number of
+    :exc:`~ahkpy.WindowHungError` errors raised for the windows of the
+    process.
+    """
+    return dict(_hung_counts)
+
+
 class WindowStyle(enum.IntFlag):
     """The object that holds the window styles.
 
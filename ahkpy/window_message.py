@@ -2,7 +2,8 @@ import dataclasses as dc
 import functools
 from typing import Callable
 
-from .flow import ahk_call, _wrap_callback
+from .flow import ahk_call, _rate_limit_args, _suppressed_count, _wrap_callback
+from .pool import _dispatcher
 
 __all__ = [
     "MessageHandler",
@@ -10,7 +11,8 @@ __all__ = [
 ]
 
 
-def on_message(msg_number: int, func=None, *args, max_threads=1, prepend_handler=False):
+def on_message(msg_number: int, func=None, *args, max_threads=1, prepend_handler=False, run_in=None,
+               debounce=None, throttle=None, coalesce=False):
     """Register *func* to be called on window message *msg_number*.
 
     Upon receiving a window message, the *func* will be called with the
@@ -37,6 +39,20 @@ def on_message(msg_number: int, func=None, *args, max_threads=1, prepend_handler
     will be registered to be called before any other functions previously
     registered for *msg_number*.
 
+    If the optional *run_in* argument is ``"thread"`` or ``"process"``, *func*
+    is executed in a pool instead of the AHK thread, and *max_threads* limits
+    the number of queued and running calls. The message is not answered with
+    the *func* result, so the message is passed on to the next handler. For
+    more information refer to :meth:`HotkeyContext.hotkey`.
+
+    The optional *debounce*, *throttle*, and *coalesce* arguments limit the
+    rate of *func* calls for bursts of messages like ``WM_MOUSEMOVE``. The
+    suppressed messages are dropped on the AHK side without calling Python and
+    are counted in :attr:`MessageHandler.suppressed_count`. The delayed calls
+    made by *debounce* and *coalesce* receive the arguments of the last
+    message, and their result is not sent back as the message reply. For more
+    information refer to :meth:`HotkeyContext.hotkey`.
+
     If *func* is given, returns an instance of :class:`MessageHandler`.
     Otherwise, the function works as a decorator::
 
@@ -54,6 +70,16 @@ def on_message(msg_number: int, func=None, *args, max_threads=1, prepend_handler
     if max_threads is not None and max_threads <= 0:
         raise ValueError("max_threads must be positive")
 
+    limit = _rate_limit_args(debounce, throttle, coalesce)
+    pool_max_threads = max_threads
+    if run_in is not None:
+        # The pool returns immediately, so AHK doesn't need to run the
+        # handler concurrently.
+        max_threads = 1
+    throttle_ms, debounce_ms, coalesce = limit
+    if coalesce and not throttle_ms:
+        # Let the next message reach the limiter while func is running.
+        max_threads = 2
     if prepend_handler:
         max_threads *= -1
 
@@ -64,7 +90,8 @@ def on_message(msg_number: int, func=None, *args, max_threads=1, prepend_handler
             _bare_message_handler,
             _message_handler,
         )
-        ahk_call("OnMessage", int(msg_number), func, max_threads)
+        func = _dispatcher(func, run_in, max_threads=pool_max_threads)
+        ahk_call("OnMessageWithLimit", int(msg_number), func, max_threads, *limit)
         return MessageHandler(msg_number, func)
 
     if func is None:
@@ -95,6 +122,15 @@ class MessageHandler:
     func: Callable
     __slots__ = ("msg_number", "func")
 
+    @property
+    def suppressed_count(self) -> int:
+        """The number of messages suppressed by the *debounce*, *throttle*, and
+        *coalesce* options (read-only).
+
+        :type: int
+        """
+        return _suppressed_count(self.func)
+
     def unregister(self):
         """Unregister the message handler."""
-        ahk_call("OnMessage", self.msg_number, self.func, 0)
+        ahk_call("OnMessageWithLimit", self.msg_number, self.func, 0, 0, 0, 0)
@@ -1,6 +1,9 @@
 import sys
 
+import pytest
+
 import ahkpy as ahk
+from .conftest import assert_equals_eventually
 
 
 def test_clipboard(request, child_ahk):
@@ -103,3 +106,61 @@ def test_clipboard_returns(request, child_ahk):
     )
 
     ahk.send("{F24}")
+
+
+def test_insert_text_strategy(monkeypatch):
+    from ahkpy import flow, sending, text_insertion
+
+    calls = []
+    win_class = "Notepad"
+
+    def fake_ahk_call(*args):
+        calls.append(args)
+        if args[0] == "WinGetClass":
+            return win_class
+        if args[0] == "PasteTextRequested":
+            return True
+
+    monkeypatch.setattr(flow, "ahk_call", fake_ahk_call)
+    monkeypatch.setattr(sending, "ahk_call", fake_ahk_call)
+    monkeypatch.setattr(text_insertion, "ahk_call", fake_ahk_call)
+
+    with pytest.raises(ValueError, match="'clipboard' is not a valid strategy"):
+        ahk.insert_text("x", "clipboard")
+
+    ahk.insert_text("short", mode="input", level=0)
+    assert calls[-1] == ("SendInput", "{Text}short")
+
+    calls.clear()
+    text = "long" * 100
+    ahk.insert_text(text, mode="input", level=0)
+    assert calls[0] == ("WinGetClass", "A")
+    assert calls[1] == ("PasteTextBegin", text)
+    assert ("SendInput", "^v") in calls
+    assert ("PasteTextRequested",) in calls
+    assert calls[-1] == ("PasteTextEnd",)
+
+    calls.clear()
+    win_class = "ConsoleWindowClass"
+    ahk.insert_text("x", "paste", mode="input", level=0)
+    assert ("SendInput", "+{Insert}") in calls
+
+    calls.clear()
+    with ahk.send_buffer():
+        ahk.send_input("a", level=0)
+        ahk.insert_text("x", "paste", mode="input", level=0)
+        # The buffered keys are sent before the paste.
+        assert calls.index(("SendInput", "a")) < calls.index(("PasteTextBegin", "x"))
+
+
+def test_insert_text(request, notepad):
+    stored = ahk.get_clipboard()
+    request.addfinalizer(lambda: ahk.set_clipboard(stored))
+    ahk.set_clipboard("saved")
+    edit = notepad.get_control("Edit1")
+    edit.text = ""
+
+    text = "The quick brown fox jumps over the lazy dog.\r\n" * 20
+    ahk.insert_text(text, "paste")
+    assert_equals_eventually(lambda: edit.text, text)
+    assert ahk.get_clipboard() == "saved"
@@ -0,0 +1,115 @@
+import pytest
+
+import ahkpy as ahk
+from ahkpy import compiled_keys
+from ahkpy.compiled_keys import (
+    KEY_IGNORE_ALL_EXCEPT_MODIFIER, KEYEVENTF_CHAR, KEYEVENTF_EXTENDEDKEY, KEYEVENTF_KEYUP, KEYEVENTF_UNICODE,
+    _translate_chars,
+)
+
+LCTRL = 0xA2
+LSHIFT = 0xA0
+
+
+def down(vk, flags=0):
+    return ahk.KeyEvent(vk, 0, flags)
+
+
+def up(vk, flags=0):
+    return ahk.KeyEvent(vk, 0, flags | KEYEVENTF_KEYUP)
+
+
+def char(c):
+    return ahk.KeyEvent(0, ord(c), KEYEVENTF_CHAR), ahk.KeyEvent(0, ord(c), KEYEVENTF_CHAR | KEYEVENTF_KEYUP)
+
+
+def test_compile_keys():
+    assert ahk.compile_keys("ab").events == (*char("a"), *char("b"))
+    assert ahk.compile_keys("a b").events == (*char("a"), down(0x20), up(0x20), *char("b"))
+    assert ahk.compile_keys("^+s").events == (down(LCTRL), down(LSHIFT), *char("s"), up(LSHIFT), up(LCTRL))
+    assert ahk.compile_keys("{Tab 2}").events == (down(0x09), up(0x09), down(0x09), up(0x09))
+    assert ahk.compile_keys("{Ctrl down}{Home}{Ctrl up}").events == (
+        down(0x11), down(0x24, KEYEVENTF_EXTENDEDKEY), up(0x24, KEYEVENTF_EXTENDEDKEY), up(0x11),
+    )
+    assert ahk.compile_keys("{vk41sc01E}").events == (ahk.KeyEvent(0x41, 0x1E, 0), ahk.KeyEvent(0x41, 0x1E, 2))
+    assert ahk.compile_keys("{}}").events == ahk.compile_keys("}").events
+    assert ahk.compile_keys("{U+20AC}").events == (
+        ahk.KeyEvent(0, 0x20AC, KEYEVENTF_UNICODE), ahk.KeyEvent(0, 0x20AC, KEYEVENTF_UNICODE | KEYEVENTF_KEYUP),
+    )
+    # Text mode sends everything literally.
+    text = ahk.compile_keys("a{Text}^b")
+    assert len(text) == 2 + 2 * 2
+    assert all(event.vk == 0 for event in text.events[2:])
+
+    # Text mode types Enter, Tab, and Backspace with the keys, like AHK.
+    # "\r\n" is a single Enter in every mode.
+    enter, tab, backspace = (down(0x0D), up(0x0D)), (down(0x09), up(0x09)), (down(0x08), up(0x08))
+    assert ahk.compile_keys("{Text}\r\n\t\b\n").events == (*enter, *tab, *backspace, *enter)
+    assert ahk.compile_keys("{Raw}a\r\nb").events == (*char("a"), *enter, *char("b"))
+    assert ahk.compile_keys("a\r\nb").events == (*char("a"), *enter, *char("b"))
+
+    blind = ahk.compile_keys("{Blind}x")
+    assert blind.blind
+    assert blind.events == char("x")
+
+
+def test_cache():
+    assert ahk.compile_keys("^c") is ahk.compile_keys("^c")
+    assert ahk.compile_keys("^c") is not ahk.compile_keys("^c", mode="event")
+
+
+@pytest.mark.parametrize("keys, message", [
+    ("{Enter", "unclosed brace"),
+    ("{Foo}", "unknown key name 'Foo'"),
+    ("{Tab many}", "invalid argument 'many'"),
+    ("x{Blind}", "must be at the start"),
+    ("^", "modifiers must be followed by a key"),
+    ("{Click}", "not supported"),
+])
+def test_errors(keys, message):
+    with pytest.raises(ValueError, match=message):
+        ahk.compile_keys(keys)
+
+
+def test_sink():
+    sent = []
+    keys = ahk.compile_keys("^a")
+    keys.send(level=3, sink=lambda events, extra_info: sent.append((events, extra_info)))
+    assert sent == [(keys.events, KEY_IGNORE_ALL_EXCEPT_MODIFIER - 3)]
+
+    sent.clear()
+    keys = ahk.compile_keys("ab", mode="event")
+    keys.send(level=0, sink=lambda events, extra_info: sent.append(events))
+    assert sent == [(event,) for event in keys.events]
+
+    with pytest.raises(ValueError, match="level must be between 0 and 100"):
+        keys.send(level=101, sink=print)
+    with pytest.raises(ValueError, match="not a valid mode"):
+        ahk.compile_keys("a", mode="play")
+
+
+def test_translate_chars(monkeypatch):
+    QWERTY, AZERTY = 0x04090409, 0x040C040C
+    keys = {
+        (QWERTY, "a"): (0x41, 0),
+        (QWERTY, "A"): (0x41, 1),
+        (QWERTY, "@"): (0x32, 1),
+        (AZERTY, "a"): (0x51, 0),
+        (AZERTY, "@"): (0x30, 6),
+    }
+    monkeypatch.setattr(compiled_keys, "_char_key", lambda c, layout: keys.get((layout, c)))
+
+    events = ahk.compile_keys("aA@").events
+    assert _translate_chars(events, QWERTY) == [
+        down(0x41), up(0x41),
+        # The shift is held only while the key goes down.
+        down(LSHIFT), down(0x41), up(LSHIFT), up(0x41),
+        down(LSHIFT), down(0x32), up(LSHIFT), up(0x32),
+    ]
+    assert _translate_chars(events, AZERTY) == [
+        down(0x51), up(0x51),
+        # The layout can't type the char.
+        ahk.KeyEvent(0, ord("A"), KEYEVENTF_UNICODE), ahk.KeyEvent(0, ord("A"), KEYEVENTF_UNICODE | KEYEVENTF_KEYUP),
+        # AltGr is Ctrl+Alt.
+        down(LCTRL), down(0xA4), down(0x30), up(0xA4), up(LCTRL), up(0x30),
+    ]
@@ -0,0 +1,91 @@
+import datetime as dt
+
+import pytest
+
+import ahkpy as ahk
+from ahkpy.cron import _CronRule, _Engine
+
+
+def test_cron_rule():
+    start = dt.datetime(2021, 3, 5, 10, 17, 30)  # Friday
+    assert _CronRule("*/15 * * * *").after(start) == dt.datetime(2021, 3, 5, 10, 30)
+    assert _CronRule("0 9 * * mon-fri").after(start) == dt.datetime(2021, 3, 8, 9, 0)
+    assert _CronRule("@daily").after(start) == dt.datetime(2021, 3, 6, 0, 0)
+    assert _CronRule("@monthly").after(start) == dt.datetime(2021, 4, 1, 0, 0)
+    assert _CronRule("0 0 1 jan *").after(start) == dt.datetime(2022, 1, 1, 0, 0)
+    assert _CronRule("30 12 29 2 *").after(start) == dt.datetime(2024, 2, 29, 12, 30)
+    # Sunday is both 0 and 7.
+    assert _CronRule("0 0 * * 7").after(start) == _CronRule("0 0 * * sun").after(start)
+    # If both day fields are restricted, either matches.
+    assert _CronRule("0 0 13 * fri").after(start) == dt.datetime(2021, 3, 12, 0, 0)
+    assert _CronRule("0 0 6 * fri").after(start) == dt.datetime(2021, 3, 6, 0, 0)
+
+
+@pytest.mark.parametrize("expr, message", [
+    ("* * * *", "must have five fields"),
+    ("60 * * * *", "must be between 0 and 59"),
+    ("*/0 * * * *", "invalid step"),
+    ("5-1 * * * *", "invalid range"),
+    ("0 0 30 2 *", "never matches"),
+])
+def test_cron_validation(expr, message):
+    with pytest.raises(ValueError, match=message):
+        _CronRule(expr)
+
+
+def test_rule_type():
+    with pytest.raises(TypeError, match="must be a cron expression"):
+        ahk.schedule(42, print)
+
+
+class FakeTimer:
+    def __init__(self):
+        self.interval = None
+
+    def start(self, interval):
+        self.interval = interval
+
+    def stop(self):
+        self.interval = None
+
+
+def test_engine():
+    now = [dt.datetime(2021, 3, 5, 10, 17, 30)]
+    engine = _Engine(now=lambda: now[0])
+    engine.installed = True
+    engine.timer = FakeTimer()
+    runs = []
+
+    hourly = ahk.ScheduledJob("@hourly", lambda: runs.append("hourly"))
+    quarter = ahk.ScheduledJob("*/15 * * * *", lambda: runs.append("quarter"))
+    engine.add(hourly)
+    engine.add(quarter)
+    assert engine.timer.interval == 12 * 60 + 30
+    assert engine.upcoming(10) == [
+        (dt.datetime(2021, 3, 5, 10, 30), quarter),
+        (dt.datetime(2021, 3, 5, 11, 0), hourly),
+    ]
+    assert quarter.upcoming(3) == [
+        dt.datetime(2021, 3, 5, 10, 30),
+        dt.datetime(2021, 3, 5, 10, 45),
+        dt.datetime(2021, 3, 5, 11, 0),
+    ]
+
+    # The timer fired early, e.g. after the clock was turned back.
+    now[0] = dt.datetime(2021, 3, 5, 10, 29)
+    engine.tick()
+    assert runs == []
+    assert engine.timer.interval == 60
+
+    # Woke up from sleep, the missed runs are coalesced.
+    now[0] = dt.datetime(2021, 3, 5, 12, 5)
+    engine.tick()
+    assert runs == ["quarter", "hourly"]
+    assert quarter.next_run == dt.datetime(2021, 3, 5, 12, 15)
+    assert hourly.next_run == dt.datetime(2021, 3, 5, 13, 0)
+
+    engine.remove(quarter)
+    assert quarter.next_run is None
+    assert engine.upcoming(10) == [(dt.datetime(2021, 3, 5, 13, 0), hourly)]
+    engine.remove(hourly)
+    assert engine.timer.interval is None
@@ -0,0 +1,31 @@
+import pytest
+
+import ahkpy as ahk
+
+
+def test_histogram():
+    hist = ahk.Histogram(bounds=(0.001, 0.01, 0.1))
+    assert hist.counts == [0, 0, 0, 0]
+    assert hist.mean == 0
+    assert hist.percentile(50) is None
+
+    for value in (0.0005, 0.001, 0.005, 0.05, 0.5):
+        hist.add(value)
+    assert hist.counts == [2, 1, 1, 1]
+    assert hist.count == 5
+    assert hist.max == 0.5
+    assert hist.mean == pytest.approx(0.1113)
+    assert hist.percentile(0) == 0.001
+    assert hist.percentile(40) == 0.001
+    assert hist.percentile(60) == 0.01
+    assert hist.percentile(100) == 0.5
+
+    hist.reset()
+    assert hist.counts == [0, 0, 0, 0]
+    assert hist.count == 0
+    assert hist.max == 0
+
+    with pytest.raises(ValueError, match="ascending"):
+        ahk.Histogram(bounds=(1, 0.5))
+    with pytest.raises(ValueError, match="percent"):
+        hist.percentile(101)
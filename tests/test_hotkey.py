@@ -1,4 +1,5 @@
 import sys
+import threading
 
 import pytest
 
@@ -50,6 +51,64 @@ def test_exceptions():
         ahk.hotkey("^t", func="not callable")
 
 
+def test_register_many(request):
+    pressed = []
+    hotkeys = ahk.default_context.register_many({
+        "F13": lambda: pressed.append("F13"),
+        "F14": lambda hotkey: pressed.append(hotkey.key_name),
+    })
+    for hk in hotkeys:
+        request.addfinalizer(hk.disable)
+    assert [hk.key_name for hk in hotkeys] == ["F13", "F14"]
+
+    ahk.send("{F13}{F14}", level=1)
+    ahk.sleep(0.01)
+    assert pressed == ["F13", "F14"]
+
+    ctx = ahk.HotkeyContext(lambda: False)
+    hotkeys = ctx.register_many({"F15": lambda: pressed.append("F15")})
+    request.addfinalizer(hotkeys[0].disable)
+    ahk.send("{F15}", level=1)
+    ahk.sleep(0.01)
+    assert pressed == ["F13", "F14"]
+
+    with pytest.raises(ahk.RegistrationError, match="'NoSuchKey':") as exc_info:
+        ahk.default_context.register_many({
+            "F16": lambda: pressed.append("F16"),
+            "NoSuchKey": lambda: None,
+        })
+    assert "F16" not in exc_info.value.message
+    assert [hk.key_name for hk in exc_info.value.registered] == ["F16"]
+    assert list(exc_info.value.errors) == ["NoSuchKey"]
+    request.addfinalizer(ahk.Hotkey("F16", ahk.default_context).disable)
+    ahk.send("{F16}", level=1)
+    ahk.sleep(0.01)
+    assert pressed == ["F13", "F14", "F16"]
+
+    with pytest.raises(ValueError, match="key_name must not be blank"):
+        ahk.default_context.register_many({"": lambda: None})
+
+    with pytest.raises(TypeError, match="must be callable"):
+        ahk.default_context.register_many({"F17": "not callable"})
+
+
+def test_register_many_errors(monkeypatch):
+    # ahkpy.hotkey is shadowed by the hotkey() function.
+    hotkey_module = sys.modules["ahkpy.hotkey"]
+
+    def fake_ahk_call(cmd, entries):
+        assert cmd == "HotkeyMany"
+        assert [entry[0] for entry in entries] == ["F13", "NoSuchKey", "F14"]
+        return {1: {1: 2, 2: "Invalid key name."}}
+
+    monkeypatch.setattr(hotkey_module, "ahk_call", fake_ahk_call)
+    with pytest.raises(ahk.RegistrationError, match="failed to register hotkeys: 'NoSuchKey': Invalid") as exc_info:
+        ahk.default_context.register_many({"F13": print, "NoSuchKey": print, "F14": print})
+    assert exc_info.value.what == "Hotkey"
+    assert [hk.key_name for hk in exc_info.value.registered] == ["F13", "F14"]
+    assert exc_info.value.errors == {"NoSuchKey": "Invalid key name."}
+
+
 def test_hotkey_field(request):
     hk = ahk.hotkey("F13", lambda: None)
     request.addfinalizer(hk.disable)
@@ -187,3 +246,89 @@ def test_hotkey_returns(child_ahk):
     )
 
     ahk.send("{F24}")
+
+
+def test_stats(request):
+    pressed = []
+    hk = ahk.hotkey("F13", lambda: pressed.append(1), stats=True)
+    request.addfinalizer(hk.disable)
+    assert ahk.get_hotkey_stats()[hk] is hk.stats
+
+    ahk.send("{F13}{F13}", level=1)
+    ahk.sleep(0.01)
+    assert pressed == [1, 1]
+    assert hk.stats.calls == 2
+    assert hk.stats.dropped == 0
+    assert hk.stats.dispatch_latency.count == 2
+    assert hk.stats.run_time.count == 2
+
+    # The second press arrives while the handler is still running.
+    def slow():
+        pressed.append(2)
+        if len(pressed) % 2:
+            ahk.send("{F13}", level=1)
+        ahk.sleep(0.05)
+
+    hk.update(func=slow, budget=0.01)
+    hk.stats.reset()
+    with pytest.warns(RuntimeWarning, match="exceeding the budget"):
+        ahk.send("{F13}", level=1)
+        ahk.sleep(0.1)
+    assert pressed == [1, 1, 2]
+    assert hk.stats.dropped == 1
+    assert hk.stats.over_budget == 1
+
+    hk.update(buffer=True)
+    hk.stats.reset()
+    pressed.clear()
+    with pytest.warns(RuntimeWarning):
+        ahk.send("{F13}", level=1)
+        ahk.sleep(0.2)
+    assert pressed == [2, 2]
+    assert hk.stats.buffered == 1
+    assert hk.stats.calls == 2
+    assert hk.stats.dispatch_latency.max >= 0.05
+
+    hk.update(stats=False)
+    assert hk.stats is None
+    assert hk not in ahk.get_hotkey_stats()
+
+
+def test_run_in_thread(request):
+    done = threading.Event()
+    result = []
+
+    def handler():
+        result.append(threading.current_thread() is threading.main_thread())
+        # AHK calls are marshalled to the main thread.
+        result.append(ahk.get_key_name("vk41"))
+        done.set()
+
+    hk = ahk.hotkey("F13", handler, run_in="thread")
+    request.addfinalizer(hk.disable)
+    ahk.send("{F13}", level=1)
+    ahk.sleep(0.2)
+    assert done.is_set()
+    assert result == [False, "a"]
+
+    with pytest.raises(ValueError, match="not a valid run_in mode"):
+        ahk.hotkey("F13", handler, run_in="fiber")
+
+
+def test_rate_limit(request):
+    pressed = []
+    hk = ahk.hotkey("F13", lambda: pressed.append(1), throttle=10)
+    request.addfinalizer(hk.disable)
+    ahk.send("{F13 3}", level=1)
+    ahk.sleep(0.05)
+    assert pressed == [1]
+    assert hk.suppressed_count == 2
+
+    hk.update(func=lambda: pressed.append(2))
+    ahk.send("{F13 2}", level=1)
+    ahk.sleep(0.05)
+    assert pressed == [1, 2, 2]
+    assert hk.suppressed_count == 0
+
+    with pytest.raises(ValueError, match="stats cannot be combined"):
+        hk.update(func=lambda: None, stats=True, coalesce=True)
@@ -51,3 +51,112 @@ def test_only_hotkey_context(child_ahk, settings):
     assert boop_windows.wait(timeout=1)
 
     ahk.send("{F24}")
+
+
+def test_cached_predicate(request):
+    predicate_calls = 0
+    pressed = 0
+
+    def predicate():
+        nonlocal predicate_calls
+        predicate_calls += 1
+        return True
+
+    def handler():
+        nonlocal pressed
+        pressed += 1
+
+    ctx = ahk.HotkeyContext(predicate, cache=True)
+    hk = ctx.hotkey("F13", handler)
+    request.addfinalizer(hk.disable)
+    assert ahk.HotkeyContext(predicate).predicate_stats is None
+
+    for _ in range(3):
+        ahk.send("{F13}", level=10)
+        ahk.sleep(0.01)
+    assert pressed == 3
+    assert predicate_calls == 1
+
+    stats = ctx.predicate_stats
+    assert stats.calls >= 3
+    assert stats.hits == stats.calls - 1
+    assert stats.misses == 1
+    assert 0 < stats.hit_rate < 1
+    assert stats.mean_eval_time == stats.eval_time > 0
+
+    # Focus change notifications drop the cache.
+    ahk.hotkey_context._focus_generation += 1
+    ahk.send("{F13}", level=10)
+    ahk.sleep(0.01)
+    assert pressed == 4
+    assert predicate_calls == 2
+
+
+def test_window_context_equality():
+    ctx = ahk.windows.active_window_context(title="Notepad")
+    assert ctx.is_native
+    assert ctx == ahk.windows.active_window_context(title="Notepad")
+    assert hash(ctx) == hash(ahk.windows.active_window_context(title="Notepad"))
+    assert ctx != ahk.windows.active_window_context(title="Notepad", class_name="Notepad")
+    assert ctx != ahk.windows.window_context(title="Notepad")
+
+
+def test_active_window_context_cache():
+    # Native contexts are checked by AHK and don't need the cache.
+    assert ahk.windows.active_window_context(title="Notepad").predicate_stats is None
+    assert ahk.windows.active_window_context(title="Notepad", match="regex").predicate_stats is not None
+    assert ahk.windows.inactive_window_context(exe="notepad.exe", match="regex").predicate_stats is not None
+    assert ahk.windows.active_window_context(title="Notepad", text="Status", match="regex").predicate_stats is None
+    assert ahk.windows.window_context(title="Notepad", match="regex").predicate_stats is None
+
+
+def test_name_change_hook(monkeypatch):
+    hotkey_context = ahk.hotkey_context
+    hooks = []
+    unhooked = []
+
+    class FakeUser32:
+        def GetForegroundWindow(self):
+            return foreground
+
+        def GetWindowThreadProcessId(self, hwnd, pid):
+            pid._obj.value = hwnd + 1
+            return hwnd + 2
+
+        def SetWinEventHook(self, event_min, event_max, module, proc, pid, thread_id, flags):
+            hooks.append((event_min, pid, thread_id))
+            return len(hooks)
+
+        def UnhookWinEvent(self, handle):
+            unhooked.append(handle)
+
+    foreground = 0x100
+    user32 = FakeUser32()
+    monkeypatch.setattr(hotkey_context, "_user32", lambda: user32)
+    monkeypatch.setattr(hotkey_context, "_win_event_proc_type", lambda: lambda func: func)
+    monkeypatch.setattr(hotkey_context, "_focus_hooks", [])
+    monkeypatch.setattr(hotkey_context, "_name_change_hook", None)
+    monkeypatch.setattr(hotkey_context, "_focus_generation", 0)
+
+    hotkey_context._install_focus_hooks()
+    EVENT_SYSTEM_FOREGROUND, EVENT_OBJECT_FOCUS, EVENT_OBJECT_NAMECHANGE = 0x0003, 0x8005, 0x800C
+    # The name change hook is limited to the foreground window's thread.
+    assert hooks == [
+        (EVENT_SYSTEM_FOREGROUND, 0, 0),
+        (EVENT_OBJECT_FOCUS, 0, 0),
+        (EVENT_OBJECT_NAMECHANGE, 0x101, 0x102),
+    ]
+
+    on_event = hotkey_context._focus_hooks[0]
+    generation = 0
+    foreground = 0x200
+    on_event(None, EVENT_SYSTEM_FOREGROUND, 0x200, 0, 0, 0, 0)
+    assert unhooked == [3]
+    assert hooks[-1] == (EVENT_OBJECT_NAMECHANGE, 0x201, 0x202)
+    assert hotkey_context._focus_generation == generation + 1
+
+    # The name changes of the child objects are ignored.
+    on_event(None, EVENT_OBJECT_NAMECHANGE, 0x200, -4, 0, 0, 0)
+    assert hotkey_context._focus_generation == generation + 1
+    on_event(None, EVENT_OBJECT_NAMECHANGE, 0x200, 0, 0, 0, 0)
+    assert hotkey_context._focus_generation == generation + 2
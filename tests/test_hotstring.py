@@ -1,6 +1,11 @@
+import io
+import os
+import sys
+
 import pytest
 
 import ahkpy as ahk
+from ahkpy.hotstring import HOTSTRING_OPTIONS, _compile_hotstrings, _iter_entries, _load_compiled, _parse_file
 from .conftest import assert_equals_eventually
 
 
@@ -30,6 +35,15 @@ class TestHotstring:
         ahk.send_event(" ")
         assert_equals_eventually(lambda: edit.text, "msitopen ")
 
+    def test_paste_mode(self, request, edit):
+        with pytest.raises(ValueError, match="paste mode requires a non-empty string repl"):
+            ahk.hotstring("nepotism", object, mode="paste")
+
+        hs = ahk.hotstring("nepotism", "msitopen", mode="paste")
+        request.addfinalizer(hs.disable)
+        ahk.send_event("nepotism.")
+        assert_equals_eventually(lambda: edit.text, "msitopen.")
+
     def test_wait_for_and_omit_end_char(self, request, edit):
         hs = ahk.hotstring("j@", "j2", wait_for_end_char=False)
         request.addfinalizer(hs.disable)
@@ -259,3 +273,126 @@ class TestHotstring:
         )
 
         ahk.send("{F24}")
+
+
+def test_parse_hotstring_files():
+    tsv = "btw\tby the way\n\nq\"t\t\"quoted\"\n"
+    assert list(_parse_file(io.StringIO(tsv), "tsv")) == [
+        {"trigger": "btw", "replacement": "by the way"},
+        {"trigger": 'q"t', "replacement": '"quoted"'},
+    ]
+
+    csv = "Trigger,Replacement,case_sensitive,priority\nBTW,\"by the way, yes\",1,\nidk,I don't know,no,5\n"
+    assert list(_parse_file(io.StringIO(csv), "csv")) == [
+        {"trigger": "BTW", "replacement": "by the way, yes", "case_sensitive": True},
+        {"trigger": "idk", "replacement": "I don't know", "case_sensitive": False, "priority": 5},
+    ]
+
+    with pytest.raises(ValueError, match="line 1: expected trigger and replacement"):
+        list(_parse_file(io.StringIO("btw\n"), "csv"))
+
+    json_object = '{"btw": "by the way"}'
+    assert list(_parse_file(io.StringIO(json_object), "json")) == [
+        {"trigger": "btw", "replacement": "by the way"},
+    ]
+    json_array = '[{"trigger": "btw", "replacement": "by the way", "text": true}]'
+    assert list(_parse_file(io.StringIO(json_array), "json")) == [
+        {"trigger": "btw", "replacement": "by the way", "text": True},
+    ]
+
+
+def test_compile_hotstrings():
+    defaults = {**HOTSTRING_OPTIONS, "mode": "event"}
+    entries = _iter_entries([
+        ("BTW", "by the way"),
+        {"trigger": "btw", "replacement": "By The Way"},
+        {"trigger": "BTW", "replacement": "BY THE WAY", "case_sensitive": True},
+        ("idk", "I don't know"),
+    ])
+    assert _compile_hotstrings(entries, defaults) == [
+        ["C0?0*0O0BK0P0T0SEZ0", "btw", "By The Way", False, False, None],
+        ["C?0*0O0BK0P0T0SEZ0", "BTW", "BY THE WAY", True, False, None],
+        ["C0?0*0O0BK0P0T0SEZ0", "idk", "I don't know", False, False, None],
+    ]
+    # AHK doesn't know the paste mode, the backspacing is left to the
+    # callback.
+    paste_defaults = {**defaults, "mode": "paste", "key_delay": 0.01}
+    assert _compile_hotstrings(_iter_entries([("sig", "Best regards")]), paste_defaults) == [
+        ["C0?0*0O0B0K10P0T0Z0", "sig", "Best regards", False, False, [True, False, 0.01]],
+    ]
+
+    with pytest.raises(ValueError, match="missing the 'replacement' key"):
+        _compile_hotstrings([{"trigger": "btw"}], defaults)
+    with pytest.raises(ValueError, match="must be a non-empty string"):
+        _compile_hotstrings([{"trigger": "btw", "replacement": ""}], defaults)
+    with pytest.raises(ValueError, match="unknown options: bogus"):
+        _compile_hotstrings([{"trigger": "btw", "replacement": "x", "bogus": 1}], defaults)
+
+
+def test_hotstring_cache(tmp_path):
+    defaults = {**HOTSTRING_OPTIONS, "mode": "event"}
+    path = tmp_path / "abbr.tsv"
+    path.write_text("btw\tby the way\n", encoding="utf-8")
+    compiled = _load_compiled(str(path), "tsv", "utf-8", defaults, cache=True)
+    cache_path = tmp_path / "__pycache__" / "abbr.tsv.hotstrings.json"
+    assert cache_path.exists()
+
+    # The cached entries are used while the file is unchanged.
+    stat = os.stat(path)
+    path.write_text("idk\tI dunno!!!\n", encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert _load_compiled(str(path), "tsv", "utf-8", defaults, cache=True) == compiled
+
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert _load_compiled(str(path), "tsv", "utf-8", defaults, cache=True)[0][1] == "idk"
+
+
+def test_load_hotstrings(request, tmp_path):
+    path = tmp_path / "abbr.json"
+    path.write_text('{"btw": "by the way", "idk": "I don\'t know"}', encoding="utf-8")
+    hotstrings = ahk.load_hotstrings(path, wait_for_end_char=False)
+    for hs in hotstrings:
+        request.addfinalizer(hs.disable)
+    assert [hs.trigger for hs in hotstrings] == ["btw", "idk"]
+
+    with pytest.raises(TypeError, match="unexpected keyword arguments: bogus"):
+        ahk.load_hotstrings({"btw": "by the way"}, bogus=True)
+    with pytest.raises(ValueError, match="'txt' is not a valid hotstring file format"):
+        ahk.load_hotstrings(tmp_path / "abbr.txt")
+
+
+def test_load_paste_hotstrings(monkeypatch, settings):
+    # ahkpy.hotstring is shadowed by the hotstring() function.
+    hotstring_module = sys.modules["ahkpy.hotstring"]
+
+    settings.send_mode = "input"
+    registered = []
+    calls = []
+
+    def fake_ahk_call(cmd, *args):
+        if cmd == "HotstringMany":
+            registered.extend(args[0])
+            return {}
+        if cmd == "GetVar":
+            return {"A_EndChar": " ", "A_SendLevel": 3}[args[0]]
+        raise AssertionError(cmd)
+
+    monkeypatch.setattr(hotstring_module, "ahk_call", fake_ahk_call)
+    monkeypatch.setattr(hotstring_module, "send", lambda keys, **options: calls.append((keys, options)))
+    monkeypatch.setattr(hotstring_module, "insert_text", lambda text, strategy, **options: calls.append(
+        (text, strategy, options),
+    ))
+
+    hotstrings = ahk.load_hotstrings({"sig": "Best regards"}, mode="paste", key_delay=0.01)
+    assert [hs.trigger for hs in hotstrings] == ["sig"]
+    [(trigger, callback)] = registered
+    assert trigger == ":C0?0*0O0B0K10P0T0Z0:sig"
+
+    callback()
+    # The paste is sent with the hotstring's key delay and send level.
+    options = {"mode": "event", "level": 3, "key_delay": 0.01}
+    assert calls == [
+        ("{BS 4}", options),
+        ("Best regards", "paste", options),
+        ("{Text} ", options),
+    ]
@@ -0,0 +1,118 @@
+import pytest
+
+import ahkpy as ahk
+from ahkpy.hotstring_recognizer import RECOGNIZER_OPTIONS, _conform_to_case, _Matcher
+from .conftest import assert_equals_eventually
+
+
+def options(**kwargs):
+    return {**RECOGNIZER_OPTIONS, **kwargs}
+
+
+def feed(matcher, text):
+    matches = []
+    for char in text:
+        match = matcher.feed(char)
+        if match is not None:
+            entry, typed, end_char = match
+            matches.append((entry.repl, typed, end_char))
+    return matches
+
+
+def test_wait_for_end_char():
+    matcher = _Matcher()
+    matcher.add("btw", "by the way", options())
+    assert feed(matcher, "btw") == []
+    assert feed(matcher, " ") == [("by the way", "btw", " ")]
+    # The trigger must start a word.
+    assert feed(matcher, "xbtw ") == []
+    assert feed(matcher, "(btw.") == [("by the way", "btw", ".")]
+
+
+def test_immediate():
+    matcher = _Matcher()
+    matcher.add("ab", "1", options(wait_for_end_char=False, replace_inside_word=True))
+    matcher.add("bc", "2", options(wait_for_end_char=False, replace_inside_word=True))
+    matcher.add("xabc", "3", options(wait_for_end_char=False))
+    assert feed(matcher, "zab") == [("1", "ab", None)]
+    assert feed(matcher, "c") == [("2", "bc", None)]
+    # The earlier added hotstring wins when several triggers end at the
+    # same char.
+    assert feed(matcher, " xab") == [("1", "ab", None)]
+    assert feed(matcher, "c") == [("2", "bc", None)]
+
+
+def test_case():
+    matcher = _Matcher()
+    matcher.add("Ahk", "AutoHotkey", options(case_sensitive=True))
+    matcher.add("py", "Python", options())
+    assert feed(matcher, "ahk ") == []
+    assert feed(matcher, "Ahk ") == [("AutoHotkey", "Ahk", " ")]
+    assert feed(matcher, "PY ") == [("Python", "PY", " ")]
+
+    assert _conform_to_case("py", "python") == "python"
+    assert _conform_to_case("Py", "python") == "Python"
+    assert _conform_to_case("PY", "python") == "PYTHON"
+    assert _conform_to_case("p.y", "python") == "python"
+
+
+def test_backspace():
+    matcher = _Matcher()
+    matcher.add("teh", "the", options())
+    assert feed(matcher, "tx\beh ") == [("the", "teh", " ")]
+    assert feed(matcher, "teh\b\b\beh ") == []
+    # Erasing more chars than the longest trigger forgets the typed text.
+    assert feed(matcher, "atehx\b\b\b\b\b\bteh ") == [("the", "teh", " ")]
+    # Control chars reset the recognizer.
+    assert feed(matcher, "te\x01h ") == []
+
+
+def test_remove_and_replace():
+    matcher = _Matcher()
+    matcher.add("Foo", "1", options())
+    matcher.add("foo", "2", options())
+    assert len(matcher.entries) == 1
+    assert feed(matcher, "foo ") == [("2", "foo", " ")]
+    matcher.remove("FOO", False, False)
+    assert feed(matcher, "foo ") == []
+
+
+def test_many_triggers():
+    matcher = _Matcher()
+    for i in range(10000):
+        matcher.add(f"abbr{i}", f"abbreviation {i}", options())
+    assert feed(matcher, "abbr1234 abbr12 ") == [
+        ("abbreviation 1234", "abbr1234", " "),
+        ("abbreviation 12", "abbr12", " "),
+    ]
+
+
+def test_options():
+    with pytest.raises(TypeError, match="unexpected keyword arguments: priority"):
+        ahk.HotstringRecognizer(priority=1)
+    recognizer = ahk.HotstringRecognizer()
+    with pytest.raises(ValueError, match="trigger must not be blank"):
+        recognizer.add("", "x")
+    with pytest.raises(TypeError, match="must be callable or a non-empty string"):
+        recognizer.add("x", "")
+    recognizer.add("x", "y")
+    assert len(recognizer) == 1
+
+
+def test_recognizer(request, notepad, settings):
+    settings.send_mode = "event"
+    edit = notepad.get_control("Edit1")
+    edit.text = ""
+    recognizer = ahk.HotstringRecognizer()
+    request.addfinalizer(recognizer.stop)
+    recognizer.add("nepotism", "msitopen")
+    recognizer.start()
+    assert recognizer.is_running
+
+    ahk.send("{Text}Nepotism ", level=10)
+    assert_equals_eventually(lambda: edit.text, "Msitopen ")
+
+    recognizer.stop()
+    edit.text = ""
+    ahk.send("{Text}nepotism ", level=10)
+    assert_equals_eventually(lambda: edit.text, "nepotism ")
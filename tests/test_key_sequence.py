@@ -0,0 +1,121 @@
+import pytest
+
+import ahkpy as ahk
+from ahkpy.key_sequence import _Engine, _parse_keys, _Trie
+
+
+def test_parse_keys():
+    assert _parse_keys("Ctrl+x Ctrl+s") == ("^x", "^s")
+    assert _parse_keys("Ctrl+Shift+S") == ("+^s", )
+    assert _parse_keys("  ^+x  k ") == ("^+x", "k")
+    assert _parse_keys("Alt++ Win+F1") == ("!+", "#f1")
+    with pytest.raises(ValueError, match="keys must not be blank"):
+        _parse_keys(" ")
+
+
+def test_trie():
+    save = object()
+    kill = object()
+    trie = _Trie()
+    trie.add(("^x", "^s"), save, 1)
+    trie.add(("^x", "k"), kill, 2)
+
+    assert trie.feed("^s") == (None, None)
+    assert trie.feed("^x") == (None, 2)
+    assert trie.expects("^s")
+    assert trie.expects("k")
+    assert not trie.expects("^x")
+    assert trie.feed("^s") == (save, None)
+    assert trie.pending is None
+    assert not trie.expects("k")
+
+    # An unexpected keystroke resets the state and starts over.
+    trie.feed("^x")
+    assert trie.feed("^x") == (None, 2)
+    assert trie.feed("k") == (kill, None)
+
+    # The timeout abandons the pending prefix.
+    trie.feed("^x")
+    assert trie.expire() is None
+    assert trie.feed("k") == (None, None)
+
+
+def test_prefix_sequence():
+    short = object()
+    long = object()
+    trie = _Trie()
+    trie.add(("g",), short, 0.5)
+    trie.add(("g", "g"), long, None)
+
+    assert trie.feed("g") == (None, None)
+    assert trie.expire() is short
+    trie.feed("g")
+    assert trie.feed("g") == (long, None)
+
+
+def test_remove():
+    save = object()
+    kill = object()
+    trie = _Trie()
+    trie.add(("^x", "^s"), save, 1)
+    trie.add(("^x", "k"), kill, 1)
+
+    assert trie.remove(("^x", "^s"))
+    assert not trie.remove(("^x", "^s"))
+    assert not trie.remove(("^x",))
+    assert list(trie.root.children["^x"].children) == ["k"]
+    assert trie.remove(("^x", "k"))
+    assert trie.root.children == {}
+
+
+def test_timeout_cache():
+    trie = _Trie()
+    trie.add(("^x", "^s"), object(), 1)
+    trie.add(("^x", "k", "k"), object(), 3)
+    trie.add(("^x", "f"), object(), None)
+    assert trie.feed("^x") == (None, None)
+
+    trie.remove(("^x", "f"))
+    assert trie.feed("^x") == (None, 3)
+    trie.remove(("^x", "k", "k"))
+    assert trie.feed("^x") == (None, 1)
+    trie.add(("^x", "k"), object(), 2)
+    assert trie.feed("^x") == (None, 2)
+
+
+def test_engine_context():
+    engine = _Engine(ahk.HotkeyContext(lambda hot_id: hot_id != "^s"))
+    engine.trie.add(("^x", "^s"), object(), 1)
+    engine.trie.add(("^x", "k"), object(), 1)
+    assert not engine.expects("k")
+    engine.trie.feed("^x")
+    assert engine.expects("k")
+    # The sequence context is checked for the following keystrokes too.
+    assert not engine.expects("^s")
+
+
+def test_sequence(request):
+    called = []
+    seq = ahk.sequence("F13 F14", lambda sequence: called.append(sequence), timeout=0.5)
+    request.addfinalizer(seq.remove)
+    assert seq.keys == ("f13", "f14")
+    assert seq.context == ahk.default_context
+
+    ahk.send_event("{F13}{F14}", level=10)
+    ahk.sleep(0.05)
+    assert called == [seq]
+
+    # Timed out.
+    ahk.send_event("{F13}", level=10)
+    ahk.sleep(0.6)
+    ahk.send_event("{F14}", level=10)
+    ahk.sleep(0.05)
+    assert called == [seq]
+
+    seq.remove()
+    ahk.send_event("{F13}{F14}", level=10)
+    ahk.sleep(0.05)
+    assert called == [seq]
+
+    with pytest.raises(ValueError, match="timeout must be positive"):
+        ahk.sequence("F13 F14", lambda: None, timeout=0)
@@ -0,0 +1,145 @@
+import pytest
+
+import ahkpy as ahk
+
+
+class FakeContext:
+    # Records the registered hotkeys instead of registering them in AHK.
+
+    def __init__(self):
+        self.hotkeys = {}
+
+    def hotkey(self, key_name, func, *args):
+        self.hotkeys[key_name] = (func, args)
+        return key_name
+
+    def press(self, key_name):
+        func, args = self.hotkeys[key_name]
+        func(*args)
+
+    def tap(self, key_name):
+        self.press(f"$*{key_name}")
+        self.press(f"$*{key_name} Up")
+
+
+def test_layers():
+    ctx = FakeContext()
+    keymap = ahk.Keymap(ctx)
+    calls = []
+    keymap.base.bind("j", lambda: calls.append("base j"))
+    nav = keymap.layer("nav")
+    nav.bind("j", lambda: calls.append("nav j"))
+    nav.bind("k", lambda x: calls.append(x), "nav k")
+    sym = keymap.layer("sym")
+    sym.bind("j", lambda: calls.append("sym j"))
+
+    assert keymap.layer("nav") is nav
+    assert sorted(ctx.hotkeys) == ["$*j", "$*j Up", "$*k", "$*k Up"]
+    assert keymap.active_layers == [keymap.base]
+
+    ctx.tap("j")
+    assert calls == ["base j"]
+
+    keymap.activate("nav")
+    keymap.activate("sym")
+    assert keymap.active_layers == [sym, nav, keymap.base]
+    ctx.tap("j")
+    ctx.tap("k")
+    assert calls == ["base j", "sym j", "nav k"]
+
+    # Activating the layer again moves it to the top.
+    nav.activate()
+    assert keymap.active_layers == [nav, sym, keymap.base]
+    # The auto-repeat of the momentary key keeps the layer on top.
+    nav.activate()
+    assert keymap.active_layers == [nav, sym, keymap.base]
+    ctx.tap("j")
+    assert calls[-1] == "nav j"
+
+    nav.unbind("j")
+    ctx.tap("j")
+    assert calls[-1] == "sym j"
+
+    keymap.deactivate("sym")
+    keymap.deactivate("sym")
+    assert not sym.is_active
+    assert keymap.base.is_active
+    keymap.toggle_layer("sym")
+    assert sym.is_active
+    keymap.toggle_layer("sym")
+    assert not sym.is_active
+
+
+def test_layer_keys():
+    ctx = FakeContext()
+    keymap = ahk.Keymap(ctx)
+    nav = keymap.layer("nav")
+    keymap.momentary("CapsLock", "nav")
+    keymap.toggle("F12", "nav")
+    assert sorted(ctx.hotkeys) == ["*CapsLock", "*CapsLock Up", "*F12"]
+
+    ctx.press("*CapsLock")
+    assert nav.is_active
+    ctx.press("*CapsLock Up")
+    assert not nav.is_active
+
+    ctx.press("*F12")
+    assert nav.is_active
+    ctx.press("*F12")
+    assert not nav.is_active
+
+    with pytest.raises(ValueError, match="already used to switch layers"):
+        nav.bind("CapsLock", "{Esc}")
+    nav.bind("h", "{Left}")
+    with pytest.raises(ValueError, match="already bound in a layer"):
+        keymap.momentary("h", "nav")
+    with pytest.raises(TypeError, match="must be callable or a string"):
+        nav.bind("l", 42)
+
+
+def test_decorator():
+    ctx = FakeContext()
+    keymap = ahk.Keymap(ctx)
+    calls = []
+
+    @keymap.base.bind("g")
+    def greet():
+        calls.append("g")
+
+    ctx.tap("g")
+    assert calls == ["g"]
+
+
+def test_passthrough(monkeypatch):
+    from ahkpy import keymap as keymap_module
+
+    sent = []
+    monkeypatch.setattr(keymap_module, "send", sent.append)
+    ctx = FakeContext()
+    keymap = ahk.Keymap(ctx)
+    calls = []
+    nav = keymap.layer("nav")
+    nav.bind("h", lambda: calls.append("nav h"))
+
+    # The press and the release are passed through separately, so the key
+    # can be held and auto-repeated.
+    ctx.press("$*h")
+    ctx.press("$*h")
+    ctx.press("$*h Up")
+    assert sent == ["{Blind}{h DownR}", "{Blind}{h DownR}", "{Blind}{h Up}"]
+
+    # The key pressed in a layer is not released after the layer is
+    # switched off.
+    sent.clear()
+    nav.activate()
+    ctx.press("$*h")
+    nav.deactivate()
+    ctx.press("$*h Up")
+    assert calls == ["nav h"]
+    assert sent == []
+
+    # The key passed through before the layer is switched on is released.
+    ctx.press("$*h")
+    nav.activate()
+    ctx.press("$*h Up")
+    assert sent == ["{Blind}{h DownR}", "{Blind}{h Up}"]
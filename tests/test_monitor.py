@@ -0,0 +1,40 @@
+import os
+
+import ahkpy as ahk
+
+
+def test_monitors():
+    monitors = ahk.monitors()
+    assert len(monitors) == ahk.monitors()[-1].index
+    assert [m.index for m in monitors] == list(range(1, len(monitors) + 1))
+    primaries = [m for m in monitors if m.is_primary]
+    assert len(primaries) == 1
+    primary = primaries[0]
+
+    x, y, width, height = primary.rect
+    assert width > 0 and height > 0
+    wx, wy, wwidth, wheight = primary.work_area
+    assert x <= wx and y <= wy
+    assert wx + wwidth <= x + width and wy + wheight <= y + height
+    assert primary.dpi >= 96
+    assert primary.name
+
+    assert ahk.monitor_from_point(x, y) == primary
+    assert ahk.monitor_from_point(x + width - 1, y + height - 1) == primary
+    assert ahk.monitor_from_rect(x - 10, y - 10, 20, 20) == primary
+    assert ahk.monitor_from_rect(-100000, -100000, 10, 10) is None
+    assert ahk.monitor_from_point(-100000, -100000) is None
+
+
+def test_cache_invalidation():
+    ahk.monitors()
+    cached = ahk.monitor._monitors
+    assert cached is not None
+    assert ahk.monitor._get_monitors() is cached
+
+    WM_DISPLAYCHANGE = 0x007E
+    win = ahk.all_windows.first(pid=os.getpid())
+    win.send_message(WM_DISPLAYCHANGE)
+    assert ahk.monitor._monitors is None
+    assert ahk.monitors() == list(cached)
+    assert ahk.monitor._get_monitors() is not cached
@@ -1,6 +1,9 @@
+import random
+
 import pytest
 
 import ahkpy as ahk
+from ahkpy.mouse import EASINGS, _trajectory
 
 
 def test_click_validation():
@@ -88,3 +91,51 @@ def test_get_mouse_pos(notepad):
     ctl = ahk.get_control_under_mouse()
     assert ctl
     assert ctl.class_name == "Edit"
+
+
+def test_trajectory():
+    linear = EASINGS["linear"]
+    assert _trajectory((0, 0), [(100, 0)], 4, "linear", linear) == [
+        (1, (25, 0)), (2, (50, 0)), (3, (75, 0)), (4, (100, 0)),
+    ]
+    # The polyline is traversed at a constant speed.
+    assert _trajectory((0, 0), [(30, 0), (30, 30)], 4, "linear", linear) == [
+        (1, (15, 0)), (2, (30, 0)), (3, (30, 15)), (4, (30, 30)),
+    ]
+    # The steps that don't move the cursor are dropped.
+    assert _trajectory((0, 0), [(2, 0)], 10, "linear", linear)[-1] == (10, (2, 0))
+    assert len(_trajectory((0, 0), [(2, 0)], 10, "linear", linear)) == 3
+    assert _trajectory((5, 5), [(5, 5)], 3, "linear", linear) == [(3, (5, 5))]
+
+    bezier = _trajectory((0, 0), [(50, 100), (100, 0)], 2, "bezier", linear)
+    assert bezier == [(1, (50, 50)), (2, (100, 0))]
+
+    rng = random.Random(1)
+    human = _trajectory((0, 0), [(300, 0), (300, 300)], 50, "human", EASINGS["minimum_jerk"], rng)
+    assert human[-1] == (50, (300, 300))
+    assert all(-100 <= x <= 400 and -100 <= y <= 400 for _, (x, y) in human)
+
+    for name, easing in EASINGS.items():
+        assert easing(0) == 0
+        assert easing(1) == 1
+        if name not in ("ease_in", "ease_out"):
+            assert easing(0.5) == pytest.approx(0.5)
+
+
+def test_mouse_path_validation():
+    with pytest.raises(ValueError, match="'zigzag' is not a valid shape"):
+        ahk.mouse_path([(0, 0)], shape="zigzag")
+    with pytest.raises(ValueError, match="'bounce' is not a valid easing"):
+        ahk.mouse_path([(0, 0)], easing="bounce")
+    with pytest.raises(ValueError, match="points must not be empty"):
+        ahk.mouse_path([])
+    with pytest.raises(ValueError, match="duration must be non-negative"):
+        ahk.mouse_path([(0, 0)], -1)
+
+
+def test_mouse_path():
+    ahk.mouse_move(0, 0, relative_to="screen")
+    ahk.mouse_path([(100, 50), (200, 200)], 0.1, shape="human", relative_to="screen")
+    assert ahk.get_mouse_pos(relative_to="screen") == (200, 200)
+    ahk.mouse_path([(-50, -50)], 0.05, relative_to="cursor")
+    assert ahk.get_mouse_pos(relative_to="screen") == (150, 150)
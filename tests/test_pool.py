@@ -0,0 +1,135 @@
+import queue
+import sys
+import threading
+
+import pytest
+
+import ahkpy as ahk
+from ahkpy import pool as ahk_pool
+from ahkpy.flow import global_ahk_lock
+from ahkpy.pool import _Pool, _Task
+
+
+def run_pool(pool, calls):
+    # Block the only worker until all the calls are submitted.
+    started = threading.Event()
+    release = threading.Event()
+    done = threading.Event()
+
+    def block():
+        started.set()
+        release.wait()
+
+    pool.submit(_Task(pool, block, 1000, 1, False), ())
+    started.wait(1)
+    for task, args in calls:
+        pool.submit(task, args)
+    pool.submit(_Task(pool, done.set, -1000, 1, False), ())
+    release.set()
+    assert done.wait(1)
+
+
+def test_priority():
+    pool = _Pool("thread", 1)
+    result = []
+    low = _Task(pool, result.append, -1, 10, False)
+    normal = _Task(pool, result.append, 0, 10, False)
+    high = _Task(pool, result.append, 1, 10, False)
+    run_pool(pool, [
+        (low, ("low",)),
+        (normal, ("normal 1",)),
+        (high, ("high",)),
+        (normal, ("normal 2",)),
+    ])
+    assert result == ["high", "normal 1", "normal 2", "low"]
+    assert low.active == normal.active == high.active == 0
+
+
+def test_max_threads():
+    pool = _Pool("thread", 1)
+    result = []
+    dropping = _Task(pool, result.append, 0, 2, False)
+    buffering = _Task(pool, result.append, 0, 1, True)
+    run_pool(pool, [
+        (dropping, ("d1",)),
+        (dropping, ("d2",)),
+        (dropping, ("d3",)),
+        (buffering, ("b1",)),
+        (buffering, ("b2",)),
+        (buffering, ("b3",)),
+    ])
+    assert result == ["d1", "d2", "b1", "b2", "b3"]
+    assert dropping.active == buffering.active == 0
+    assert not buffering.backlog
+
+
+def test_set_pool_size():
+    with pytest.raises(ValueError, match="must be positive"):
+        ahk.set_pool_size(threads=0)
+
+
+def test_send_from_thread(monkeypatch):
+    wakeups = queue.SimpleQueue()
+    drain = None
+    received = []
+
+    class FakeAHK:
+        @staticmethod
+        def call(cmd, *args):
+            received.append((drain, cmd, *args))
+
+    monkeypatch.setattr(ahk_pool, "_wake_main_thread", lambda: wakeups.put(None))
+    monkeypatch.setattr(ahk_pool, "_ahk", FakeAHK)
+    pool = _Pool("thread", 1)
+    proceed = threading.Event()
+    sent = threading.Event()
+
+    def handler():
+        ahk.send_input("abc", level=0)
+        proceed.wait(1)
+        ahk.send_input("def", level=1)
+        sent.set()
+
+    pool.submit(_Task(pool, handler, 0, 1, False), ())
+    for drain in (1, 2):
+        wakeups.get(timeout=1)
+        # The pool thread doesn't hold the lock while waiting for the main
+        # thread, so the main thread can call AHK in the meantime.
+        assert global_ahk_lock.acquire(timeout=0.1)
+        global_ahk_lock.release()
+        ahk_pool._drain_calls()
+        proceed.set()
+    assert sent.wait(1)
+    # Each send is executed by the main thread as a whole, so SendLevel
+    # applies to the following SendInput.
+    assert received == [
+        (1, "SendLevel", 0), (1, "SendInput", "abc"),
+        (2, "SendLevel", 1), (2, "SendInput", "def"),
+    ]
+
+
+def test_python_executable(monkeypatch, tmp_path):
+    monkeypatch.setattr(sys, "executable", str(tmp_path / "AutoHotkey.exe"))
+    monkeypatch.setattr(sys, "prefix", str(tmp_path))
+    monkeypatch.setattr(sys, "base_prefix", str(tmp_path / "base"))
+    with pytest.raises(RuntimeError, match="cannot find the Python executable"):
+        ahk_pool._python_executable()
+
+    (tmp_path / "base").mkdir()
+    (tmp_path / "base" / "python.exe").touch()
+    assert ahk_pool._python_executable() == str(tmp_path / "base" / "python.exe")
+
+    (tmp_path / "Scripts").mkdir()
+    (tmp_path / "Scripts" / "python.exe").touch()
+    assert ahk_pool._python_executable() == str(tmp_path / "Scripts" / "python.exe")
+
+
+def test_process_pool(tmp_path):
+    pool = _Pool("process", 1)
+    path = tmp_path / "result.txt"
+    pool.submit(_Task(pool, path.write_text, 0, 1, False), ("ok",))
+    for _ in range(300):
+        if path.exists() and path.read_text() == "ok":
+            break
+        threading.Event().wait(0.1)
+    assert path.read_text() == "ok"
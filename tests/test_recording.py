@@ -0,0 +1,95 @@
+import pytest
+
+import ahkpy as ahk
+from ahkpy import flow
+from ahkpy.recording import RECORD, WM_KEYDOWN, WM_KEYUP, WM_MOUSEMOVE, _batches, _wait_until
+
+
+def test_ring_buffer():
+    recorder = ahk.Recorder(capacity=3)
+    assert not recorder.is_recording
+    for vk in range(0x41, 0x46):
+        recorder._write(WM_KEYDOWN, vk, 0x1E, 0)
+    assert len(recorder) == 3
+    assert recorder.dropped == 2
+
+    recording = recorder.stop()
+    assert recorder.stop() is recording
+    assert len(recording) == 3
+    assert len(bytes(recording)) == 3 * RECORD.size
+    events = list(recording)
+    # The oldest events are overwritten.
+    assert [event.code for event in events] == [0x43, 0x44, 0x45]
+    assert all(event.is_keyboard for event in events)
+    assert events == sorted(events, key=lambda event: event.time)
+
+    with pytest.raises(ValueError, match="capacity must be positive"):
+        ahk.Recorder(capacity=0)
+    with pytest.raises(ValueError, match="at least one of keyboard and mouse"):
+        ahk.Recorder(keyboard=False, mouse=False)
+
+
+def test_save_load(tmp_path):
+    data = b"".join([
+        RECORD.pack(0, WM_KEYDOWN, 0x41, 0x1E, 0),
+        RECORD.pack(50_000_000, WM_KEYUP, 0x41, 0x1E, 0x80),
+        RECORD.pack(1_500_000_000, WM_MOUSEMOVE, 0, -100, 200),
+    ])
+    recording = ahk.Recording(data)
+    assert recording.duration == 1.5
+    assert list(recording)[2] == ahk.RecordedEvent(1.5, WM_MOUSEMOVE, 0, -100, 200)
+    assert not list(recording)[2].is_keyboard
+
+    path = tmp_path / "workflow.rec"
+    recording.save(path)
+    loaded = ahk.Recording.load(path)
+    assert bytes(loaded) == data
+
+    path.write_bytes(b"garbage")
+    with pytest.raises(ValueError, match="is not a recording"):
+        ahk.Recording.load(path)
+    with pytest.raises(ValueError, match="must be a multiple of 20"):
+        ahk.Recording(b"x")
+
+
+def test_batches():
+    times = [10.0, 10.0005, 10.1, 10.3, 10.3002]
+    assert list(_batches(times, 1, 0.001)) == [
+        (0.0, 0, 2),
+        (pytest.approx(0.1), 2, 3),
+        (pytest.approx(0.3), 3, 5),
+    ]
+    assert list(_batches(times, 2, 0.001)) == [
+        (0.0, 0, 2),
+        (pytest.approx(0.05), 2, 3),
+        (pytest.approx(0.15), 3, 5),
+    ]
+    assert list(_batches([], 1, 0.001)) == []
+
+    with pytest.raises(ValueError, match="speed must be positive"):
+        ahk.replay(ahk.Recording(), speed=0)
+
+
+@pytest.mark.parametrize("poll_interval", [0.01, 0.05])
+def test_wait_until(monkeypatch, poll_interval):
+    monkeypatch.setattr(flow, "_poll_interval", poll_interval)
+    now = 0.0
+    sleeps = []
+
+    def clock():
+        nonlocal now
+        now += 0.00001
+        return now
+
+    def fake_sleep(secs):
+        # The worst case of sleep() returns a whole poll interval late.
+        nonlocal now
+        sleeps.append(secs)
+        now += secs + poll_interval
+
+    times = [0.0, 0.0005, 0.1, 0.3, 0.3002, 1.0]
+    for due, first, last in _batches(times, 1, 0.001):
+        _wait_until(due, clock, fake_sleep)
+        # The wait ends on time, although sleep() overshoots.
+        assert due <= now < due + 0.0001
+    assert sleeps
@@ -1,3 +1,5 @@
+import pytest
+
 import ahkpy as ahk
 
 
@@ -37,3 +39,43 @@ def test_remap_key(request, child_ahk):
     assert win_f14.close_all(timeout=1)
 
     ahk.send("{F24}", level=10)
+
+
+def test_native_remap_key(request, child_ahk):
+    def hotkeys():
+        import ahkpy as ahk
+        import sys
+        ahk.hotkey("F24", sys.exit)
+        ahk.hotkey("F14", lambda: ahk.message_box("F14 pressed"))
+        print("ok00")
+
+    child_ahk.popen_code(hotkeys)
+    child_ahk.wait(0)
+
+    remap = ahk.remap_key("F13", "F14", native=True)
+    request.addfinalizer(remap.disable)
+    assert remap.origin_hotkey.key_name == "*F13"
+    assert remap.origin_up_hotkey.key_name == "*F13 Up"
+
+    ahk.send_event("{F13}", level=10)
+    win_f14 = ahk.windows.filter(title="Python.ahk", text="F14 pressed")
+    assert win_f14.wait(timeout=1)
+    assert win_f14.close_all(timeout=1)
+
+    remap.disable()
+    ahk.send_event("{F13}", level=10)
+    assert not win_f14.wait(timeout=0.5)
+
+    remap.toggle()
+    ahk.send_event("{F13}", level=10)
+    assert win_f14.wait(timeout=1)
+    assert win_f14.close_all(timeout=1)
+
+    ahk.send("{F24}", level=10)
+
+
+def test_native_remap_key_validation():
+    with pytest.raises(ValueError, match="is not a valid send mode"):
+        ahk.remap_key("F13", "F14", mode="nope", native=True)
+    with pytest.raises(ValueError, match="level must be between 0 and 100"):
+        ahk.remap_key("F13", "F14", level=101, native=True)
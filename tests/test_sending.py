@@ -1,3 +1,4 @@
+import contextvars
 import time
 
 import pytest
@@ -34,3 +35,50 @@ def test_fallback_to_send_event_on_delay(notepad):
     ahk.send("abcdef", key_delay=0.01)
     end = time.perf_counter()
     assert end - start >= 6 * 0.01
+
+
+def test_send_buffer(monkeypatch):
+    from ahkpy import sending
+
+    calls = []
+    monkeypatch.setattr(sending, "ahk_call", lambda *args: calls.append(args))
+
+    with ahk.send_buffer() as buffer:
+        ahk.send_input("{Text}Best regards,", level=0)
+        ahk.send_input("{Enter}", level=0)
+        ahk.send_input("^s", level=0)
+        ahk.send_input("{Blind}{Ctrl up}", level=0)
+        ahk.send_input("abc", level=0)
+        ahk.send_input("x", level=5)
+        assert calls == []
+        buffer.flush()
+        assert calls == [
+            ("SendLevel", 0), ("SendInput", "{Text}Best regards,"),
+            ("SendLevel", 0), ("SendInput", "{Enter}^s"),
+            # The keys after the Blind mode keys are not sent blind.
+            ("SendLevel", 0), ("SendInput", "{Blind}{Ctrl up}"),
+            ("SendLevel", 0), ("SendInput", "abc"),
+            ("SendLevel", 5), ("SendInput", "x"),
+        ]
+        calls.clear()
+
+        ahk.send_input("a", level=0)
+        with ahk.send_buffer():
+            # The outer buffer is flushed to keep the order.
+            assert calls == [("SendLevel", 0), ("SendInput", "a")]
+            ahk.send_input("b", level=0)
+        ahk.send_input("c", level=0)
+        assert calls[-1] == ("SendInput", "b")
+    assert calls[-1] == ("SendInput", "c")
+
+    # The callbacks registered inside the with-statement copy the context
+    # with the buffer, and send the keys right away after it ends.
+    with ahk.send_buffer():
+        callback_context = contextvars.copy_context()
+    calls.clear()
+    callback_context.run(ahk.send_input, "late", level=0)
+    assert calls == [("SendLevel", 0), ("SendInput", "late")]
+
+    with pytest.raises(ValueError, match="level must be between 0 and 100"):
+        with ahk.send_buffer():
+            ahk.send_input("a", level=101)
@@ -0,0 +1,153 @@
+import pytest
+
+from ahkpy import tiling
+
+
+class Recorder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, changes):
+        self.calls.append(changes)
+
+
+@pytest.fixture
+def recorder():
+    return Recorder()
+
+
+def test_columns(recorder):
+    layout = tiling.Layout(area=(0, 0, 300, 100), apply=recorder)
+    layout.add("a")
+    assert layout.arrange() == {"a": (0, 0, 300, 100)}
+
+    layout.add("b")
+    layout.add("c")
+    assert layout.arrange() == {
+        "a": (0, 0, 100, 100),
+        "b": (100, 0, 100, 100),
+        "c": (200, 0, 100, 100),
+    }
+    assert len(recorder.calls) == 2
+
+    # Nothing changed.
+    assert layout.arrange() == {}
+    assert len(recorder.calls) == 2
+
+    # Removing the last window moves only the remaining ones.
+    assert layout.remove("c")
+    assert not layout.remove("c")
+    assert layout.arrange() == {
+        "a": (0, 0, 150, 100),
+        "b": (150, 0, 150, 100),
+    }
+    assert "c" not in layout
+    assert len(layout) == 2
+
+
+def test_rows_weights_and_gap(recorder):
+    layout = tiling.Layout(tiling.Rows(), area=(10, 20, 100, 310), gap=10, apply=recorder)
+    layout.add("a", weight=2)
+    layout.add("b")
+    assert layout.arrange() == {
+        "a": (10, 20, 100, 200),
+        "b": (10, 230, 100, 100),
+    }
+
+    layout.find("b").weight = 2
+    assert layout.arrange() == {
+        "a": (10, 20, 100, 150),
+        "b": (10, 180, 100, 150),
+    }
+
+    with pytest.raises(ValueError, match="weight must be positive"):
+        layout.find("a").weight = 0
+    with pytest.raises(ValueError, match="gap must be non-negative"):
+        tiling.Layout(gap=-1)
+
+
+def test_stack(recorder):
+    layout = tiling.Layout(tiling.Stack(), area=(0, 0, 100, 100), apply=recorder)
+    layout.add("a")
+    layout.add("b")
+    assert layout.arrange() == {"a": (0, 0, 100, 100), "b": (0, 0, 100, 100)}
+
+
+def test_bsp(recorder):
+    layout = tiling.Layout(tiling.BSP(), area=(0, 0, 400, 300), apply=recorder)
+    for window in "abc":
+        layout.add(window)
+    assert layout.arrange() == {
+        "a": (0, 0, 200, 300),
+        "b": (200, 0, 200, 150),
+        "c": (200, 150, 200, 150),
+    }
+
+
+def test_incremental_subtree(recorder):
+    left = tiling.Rows()
+    right = tiling.Rows()
+    layout = tiling.Layout(tiling.Columns([left, right]), area=(0, 0, 200, 200), apply=recorder)
+    layout.add("a", left)
+    layout.add("b", left)
+    layout.add("c", right)
+    assert layout.arrange() == {
+        "a": (0, 0, 100, 100),
+        "b": (0, 100, 100, 100),
+        "c": (100, 0, 100, 200),
+    }
+
+    # Only the right column is affected.
+    layout.add("d", right)
+    assert left._dirty is False
+    assert right._dirty is True
+    assert layout.root._dirty_below is True
+    assert layout.arrange() == {
+        "c": (100, 0, 100, 100),
+        "d": (100, 100, 100, 100),
+    }
+    assert layout.root._dirty_below is False
+
+    # Moving a window between containers.
+    layout.add("d", left)
+    assert layout.arrange() == {
+        "a": (0, 0, 100, 67),
+        "b": (0, 67, 100, 66),
+        "c": (100, 0, 100, 200),
+        "d": (0, 133, 100, 67),
+    }
+
+
+def test_empty_containers_take_no_space(recorder):
+    left = tiling.Rows()
+    right = tiling.Rows()
+    layout = tiling.Layout(tiling.Columns([left, right]), area=(0, 0, 200, 100), apply=recorder)
+    layout.add("a", left)
+    assert layout.arrange() == {"a": (0, 0, 200, 100)}
+
+    layout.add("b", right)
+    assert layout.arrange() == {"a": (0, 0, 100, 100), "b": (100, 0, 100, 100)}
+
+    layout.remove("b")
+    assert layout.arrange() == {"a": (0, 0, 200, 100)}
+    assert right.rect is None
+
+
+def test_area_and_force(recorder):
+    layout = tiling.Layout(area=(0, 0, 100, 100), apply=recorder)
+    layout.add("a")
+    layout.arrange()
+
+    layout.area = (0, 0, 200, 100)
+    assert layout.arrange() == {"a": (0, 0, 200, 100)}
+    assert layout.arrange() == {}
+    assert layout.arrange(force=True) == {"a": (0, 0, 200, 100)}
+    assert layout.rects == {"a": (0, 0, 200, 100)}
+
+
+def test_sync(recorder):
+    layout = tiling.Layout(area=(0, 0, 200, 100), apply=recorder)
+    assert layout.sync(["a", "b"]) == {"a": (0, 0, 100, 100), "b": (100, 0, 100, 100)}
+    assert layout.sync(["b", "c"]) == {"b": (0, 0, 100, 100), "c": (100, 0, 100, 100)}
+    assert "a" not in layout
+    assert layout.sync(["b", "c"]) == {}
@@ -1,3 +1,4 @@
+import contextvars
 import sys
 
 import pytest
@@ -67,6 +68,27 @@ def test_timer_stop(child_ahk):
     assert res.returncode == 0
 
 
+def test_low_power_at_import(child_ahk):
+    def code():
+        import ahkpy as ahk
+        import sys
+
+        ahk.set_low_power(housekeeping_interval=2)
+
+        @ahk.set_countdown(0.1)
+        def check():
+            # The interval outlives the end of the main script.
+            print(ahk.ahk_call("GetVar", "CHECK_SIGNALS_INTERVAL"))
+            sys.exit()
+
+        ahk.hotkey("F24", lambda: None)  # Make the script persistent
+
+    res = child_ahk.run_code(code)
+    assert res.stderr == ""
+    assert res.stdout == "2000\n"
+    assert res.returncode == 0
+
+
 def test_timer_update(request):
     times = []
 
@@ -135,3 +157,139 @@ def test_timer_returns(child_ahk):
     )
 
     ahk.send("{F24}")
+
+
+def test_scheduler(monkeypatch):
+    from ahkpy import timer as timer_module
+
+    calls = []
+    monkeypatch.setattr(timer_module, "ahk_call", lambda *args: calls.append(args[2:]))
+    monkeypatch.setattr(timer_module, "_stats", timer_module.TimerStats())
+    now = [0.0]
+    scheduler = timer_module._Scheduler(5, clock=lambda: now[0])
+    context = contextvars.copy_context()
+    ticks = []
+
+    fast = scheduler.add(lambda: ticks.append("fast"), 0.1, True, context)
+    assert calls == [(-100, 5)]
+    scheduler.add(lambda: ticks.append("slow"), 0.25, False, context)
+    # The AHK timer is not re-armed for a later deadline.
+    assert calls == [(-100, 5)]
+    stats = ahk.get_timer_stats()
+    assert stats.queue_size == 2
+
+    now[0] = 0.1
+    scheduler.tick()
+    assert ticks == ["fast"]
+    assert calls[-1] == (-100, 5)
+
+    now[0] = 0.25
+    scheduler.tick()
+    assert ticks == ["fast", "fast", "slow"]
+    assert stats.queue_size == 1
+    assert stats.calls == 3
+    assert stats.lateness.count == 3
+
+    scheduler.remove(fast)
+    assert stats.queue_size == 0
+    assert scheduler.heap == []
+    assert calls[-1] == ("Delete",)
+
+
+def test_scheduler_error(monkeypatch):
+    from ahkpy import timer as timer_module
+
+    monkeypatch.setattr(timer_module, "ahk_call", lambda *args: None)
+    monkeypatch.setattr(timer_module, "_stats", timer_module.TimerStats())
+    now = [0.0]
+    scheduler = timer_module._Scheduler(0, clock=lambda: now[0])
+    context = contextvars.copy_context()
+    ticks = []
+
+    def fail():
+        raise RuntimeError("boom")
+
+    scheduler.add(fail, 0.1, False, context)
+    scheduler.add(lambda: ticks.append(1), 0.1, False, context)
+    now[0] = 0.1
+    with pytest.raises(RuntimeError, match="boom"):
+        scheduler.tick()
+    assert ticks == []
+    # The rest of the due timers run on the next tick.
+    scheduler.tick()
+    assert ticks == [1]
+    assert scheduler.active == 0
+
+
+@pytest.mark.parametrize("catch_up, expected_ticks, expected_missed", [
+    ("coalesce", [0.1, 0.2, 0.45, 0.5], 1),
+    ("burst", [0.1, 0.2, 0.45, 0.45, 0.5], 0),
+    ("skip", [0.1, 0.2, 0.5], 2),
+])
+def test_precise(monkeypatch, catch_up, expected_ticks, expected_missed):
+    from ahkpy import timer as timer_module
+
+    monkeypatch.setattr(timer_module, "ahk_call", lambda *args: None)
+    monkeypatch.setattr(timer_module, "_stats", timer_module.TimerStats())
+    now = [0.0]
+    scheduler = timer_module._Scheduler(0, clock=lambda: now[0])
+    stats = ahk.PreciseTimerStats()
+    ticks = []
+    scheduler.add(
+        lambda: ticks.append(now[0]), 0.1, True, contextvars.copy_context(),
+        precise=True, catch_up=catch_up, stats=stats,
+    )
+
+    # The tick due at 0.3 runs late, but the following deadlines stay on the grid.
+    for now[0] in (0.1, 0.2, 0.45, 0.45, 0.5):
+        scheduler.tick()
+    assert ticks == expected_ticks
+    assert stats.missed == expected_missed
+    assert stats.calls == len(expected_ticks)
+    assert stats.lateness.count == len(expected_ticks)
+
+
+def test_precise_validation():
+    with pytest.raises(ValueError, match="not a valid catch_up policy"):
+        ahk.Timer(catch_up="drop")
+    t = ahk.Timer(func=print, precise=True)
+    assert t.stats is None
+
+
+def test_slack(monkeypatch):
+    from ahkpy import timer as timer_module
+
+    calls = []
+    monkeypatch.setattr(timer_module, "ahk_call", lambda *args: calls.append(args[1:]))
+    monkeypatch.setattr(timer_module, "_stats", timer_module.TimerStats())
+    now = [0.0]
+    scheduler = timer_module._Scheduler(0, clock=lambda: now[0])
+    monkeypatch.setitem(timer_module._schedulers, 0, scheduler)
+    context = contextvars.copy_context()
+    ticks = []
+
+    scheduler.add(lambda: ticks.append("a"), 0.1, False, context, slack=0.05)
+    scheduler.add(lambda: ticks.append("b"), 0.12, False, context, slack=0.1)
+    # Armed to the latest time the first timer can run.
+    assert calls[-1][1] == -150
+    now[0] = 0.15
+    scheduler.tick()
+    assert ticks == ["a", "b"]
+    assert ahk.get_timer_stats().ticks == 1
+
+    ahk.set_low_power(slack=0.2, housekeeping_interval=2)
+    try:
+        assert ahk.get_low_power()
+        assert (2000,) in calls  # SetCheckSignalsInterval
+        assert timer_module.flow._poll_interval == timer_module.LOW_POWER_POLL_INTERVAL
+        scheduler.add(lambda: ticks.append("c"), 0.1, False, context)
+        assert calls[-1][1] == -300
+        scheduler.add(lambda: ticks.append("d"), 0.1, False, context, slack=0)
+        assert calls[-1][1] == -100
+    finally:
+        ahk.set_low_power(False)
+    assert not ahk.get_low_power()
+    assert (100,) in calls
+    assert timer_module.flow._poll_interval == timer_module.DEFAULT_POLL_INTERVAL
+    # The default slack is recomputed for the running timers.
+    assert calls[-1][1] == -100
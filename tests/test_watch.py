@@ -0,0 +1,80 @@
+import pytest
+
+import ahkpy as ahk
+
+
+def test_validation():
+    with pytest.raises(ValueError, match="interval must be positive"):
+        ahk.Watch(lambda: 1, bool, interval=0)
+    with pytest.raises(ValueError, match="max_interval must not be less"):
+        ahk.Watch(lambda: 1, bool, interval=1, max_interval=0.5)
+
+
+def test_watch():
+    values = iter(range(100))
+    samples = []
+
+    def sample():
+        value = next(values)
+        samples.append(value)
+        return value
+
+    watch = ahk.Watch(sample, lambda v: v == 3, interval=0.01).start()
+    assert watch.wait(timeout=1) is True
+    assert watch.value == 3
+    assert samples == [0, 1, 2, 3]
+
+    watch = ahk.Watch(lambda: None, bool).start()
+    assert watch.wait(timeout=1) is None
+
+    watch = ahk.Watch(lambda: 1, lambda v: False, timeout=0.1, interval=0.01).start()
+    assert watch.wait() is False
+
+
+def test_cancel():
+    called = []
+    watch = ahk.Watch(lambda: 1, lambda v: True, lambda: called.append(1), interval=0.01)
+    watch.start()
+    watch.cancel()
+    ahk.sleep(0.05)
+    assert watch.result is False
+    assert called == []
+
+
+def test_shared_sample():
+    count = 0
+
+    def sample():
+        nonlocal count
+        count += 1
+        return count
+
+    w1 = ahk.Watch(sample, lambda v: True, key="shared").start()
+    w2 = ahk.Watch(sample, lambda v: True, key="shared").start()
+    assert w1.wait(timeout=1) is True
+    assert w2.wait(timeout=1) is True
+    assert count == 1
+
+
+def test_adaptive_interval():
+    samples = 0
+
+    def sample():
+        nonlocal samples
+        samples += 1
+        return "same"
+
+    watch = ahk.Watch(sample, lambda v: False, timeout=0.5, interval=0.01, max_interval=0.2).start()
+    assert watch.wait() is False
+    # Without backing off the watch would sample the value ~50 times.
+    assert samples < 20
+
+
+def test_sample_error():
+    def sample():
+        raise ahk.Error("sus")
+
+    watch = ahk.Watch(sample, bool).start()
+    with pytest.raises(ahk.Error, match="sus"):
+        watch.wait(timeout=1)
+    assert watch.done
@@ -80,6 +80,25 @@ class TestWindows:
 
         assert repr(top) == f"Window(id={top.id})"
 
+    def test_ids(self, msg_boxes, monkeypatch):
+        ids = msg_boxes.ids()
+        assert ids.typecode == "q"
+        assert list(ids) == [win.id for win in msg_boxes]
+        assert list(msg_boxes.ids(title="ahkpy win2")) == [msg_boxes.first(title="ahkpy win2").id]
+        assert list(msg_boxes.ids(title="nonexistent")) == []
+
+        # The buffer grows to fit all the windows.
+        monkeypatch.setattr(ahk.window, "_ids_capacity", 1)
+        assert msg_boxes.ids() == ids
+        assert ahk.window._ids_capacity >= 2
+
+    def test_interning(self, msg_boxes):
+        top = msg_boxes.first()
+        assert list(msg_boxes)[0] is top
+        assert ahk.Window(top.id) is top
+        assert ahk.Control(top.id) is not top
+        assert dataclasses.replace(top) is top
+
     def test_filter(self, msg_boxes):
         assert len(msg_boxes.filter(title="ahkpy win2")) == 1
         assert msg_boxes.filter(title="ahkpy win2").first().title == "ahkpy win2"
@@ -332,6 +351,20 @@ def test_status_bar(notepad):
     assert notepad.get_status_bar_text(1) == "  Ln 1, Col 3"
 
 
+def test_watch_status_bar(notepad):
+    ahk.sleep(0.2)
+    matched = []
+    watch = notepad.watch_status_bar("  Ln 1, Col 5", lambda watch: matched.append(watch), part=1, timeout=2)
+    ahk.set_countdown(0.2, notepad.send, "qq")
+    assert not watch.done
+    assert watch.wait(timeout=2) is True
+    assert matched == [watch]
+    assert watch.value == "  Ln 1, Col 5"
+
+    watch = notepad.watch_status_bar("  Ln 1, Col x", part=1, timeout=0.1)
+    assert watch.wait() is False
+
+
 def test_hidden_text():
     msg = "Type here to search"
     bar = ahk.windows.first(class_name="Shell_TrayWnd")
@@ -690,6 +723,97 @@ class TestControl:
         assert list_view.get_list_items(selected=True, focused=True) == [["Hello wow", "1"]]
 
 
+def test_hung_window(child_ahk, settings):
+    def code():
+        import time
+        print("ok00", flush=True)
+        # Block the AHK thread so that the main window stops processing
+        # messages.
+        time.sleep(3)
+
+    child_ahk.popen_code(code)
+    child_ahk.wait(0)
+    settings.hung_window_timeout = 0.1
+
+    win = ahk.all_windows.first(pid=child_ahk.proc.pid)
+    assert win
+    prev_count = ahk.get_hung_counts().get(child_ahk.proc.pid, 0)
+    with pytest.raises(ahk.WindowHungError, match="is not responding") as exc_info:
+        win.title = "Hung"
+    assert exc_info.value.hwnd == win.id
+    assert exc_info.value.pid == child_ahk.proc.pid
+    assert exc_info.value.what == "WinSetTitle"
+    assert ahk.get_hung_counts()[child_ahk.proc.pid] == prev_count + 1
+
+    # Commands that don't send messages to the window still work.
+    assert win.exists
+
+
+def test_check_hung(monkeypatch, settings):
+    from ahkpy import window as window_module
+    from ahkpy.window import _check_hung
+
+    calls = []
+
+    class FakeUser32:
+        hung = 0
+
+        def IsHungAppWindow(self, hwnd):
+            calls.append("IsHungAppWindow")
+            return self.hung
+
+        def SendMessageTimeoutW(self, *args):
+            calls.append("SendMessageTimeoutW")
+            return 1
+
+        def GetWindowThreadProcessId(self, hwnd, pid):
+            pid._obj.value = 42
+
+    user32 = FakeUser32()
+    monkeypatch.setattr(window_module, "_user32", lambda: user32)
+
+    # The window is not pinged by default.
+    _check_hung(0x10, "WinSetTitle")
+    assert calls == ["IsHungAppWindow"]
+
+    calls.clear()
+    settings.hung_window_timeout = 0.1
+    _check_hung(0x10, "WinSetTitle")
+    assert calls == ["IsHungAppWindow", "SendMessageTimeoutW"]
+
+    calls.clear()
+    user32.hung = 1
+    with pytest.raises(ahk.WindowHungError, match="window 0x10 is not responding") as exc_info:
+        _check_hung(0x10, "WinSetTitle")
+    assert calls == ["IsHungAppWindow"]
+    assert exc_info.value.pid == 42
+
+
+def test_check_hung_criteria(monkeypatch):
+    from ahkpy import window as window_module
+
+    calls = []
+    checked = []
+
+    def fake_ahk_call(cmd, *args):
+        calls.append(cmd)
+        if cmd == "WinExist":
+            return 0x10
+
+    monkeypatch.setattr(window_module, "ahk_call", fake_ahk_call)
+    monkeypatch.setattr(window_module, "_check_hung", lambda hwnd, cmd: checked.append((hwnd, cmd)))
+
+    # The window that matches the criteria is checked before the command.
+    ahk.windows.hide_all(title="Notepad")
+    assert checked == [(0x10, "WinHide")]
+    assert calls[-2:] == ["WinExist", "WinHide"]
+
+    # The commands that don't wait for the window don't resolve it.
+    checked.clear()
+    ahk.windows.filter(title="Notepad").first()
+    assert checked == []
+
+
 def test_window_context(child_ahk, settings):
     def code():
         import ahkpy as ahk
@@ -833,6 +957,19 @@ def test_exclude_active_window_context(child_ahk, settings):
     ahk.send("{F24}")
 
 
+def test_native_window_context():
+    assert not ahk.HotkeyContext(lambda: True).is_native
+    assert ahk.windows.window_context(title="Notepad", exe="notepad.exe").is_native
+    assert ahk.windows.nonexistent_window_context(class_name="Notepad").is_native
+    assert ahk.windows.active_window_context(title="Notepad", text="Status").is_native
+    assert ahk.windows.inactive_window_context(pid=1).is_native
+
+    assert not ahk.windows.window_context(title="Notepad", match="contains").is_native
+    assert not ahk.windows.exclude(title="Untitled").active_window_context().is_native
+    assert not ahk.all_windows.window_context(title="Notepad").is_native
+    assert not ahk.windows.filter(title=None).window_context().is_native
+
+
 def test_include_hidden_context(child_ahk, settings):
     def code():
         import ahkpy as ahk
@@ -860,3 +997,23 @@ def test_include_hidden_context(child_ahk, settings):
 
 
 # TODO: Write nonexistent/inactive window context tests.
+
+
+def test_restore_auto_execute_settings(monkeypatch):
+    from ahkpy import flow
+    from ahkpy import window as window_module
+
+    calls = []
+    monkeypatch.setattr(window_module, "ahk_call", lambda cmd, *args: calls.append(cmd))
+    win = ahk.windows.filter(title="Notepad", match="regex")
+
+    monkeypatch.setattr(flow, "_in_auto_execute", False)
+    win.first()
+    assert calls[-1] == "WinExist"
+
+    # The modes set for the command don't leak into the auto-execute
+    # defaults.
+    calls.clear()
+    monkeypatch.setattr(flow, "_in_auto_execute", True)
+    win.first()
+    assert calls[-2:] == ["WinExist", "RestoreWindowSettings"]
@@ -47,6 +47,34 @@ def test_on_message(request):
     assert result == 0
 
 
+def test_on_message_rate_limit(request):
+    win = ahk.all_windows.first(pid=os.getpid())
+    calls = []
+
+    throttled = ahk.on_message(0x5557, lambda w_param, l_param, msg, hwnd: calls.append(("t", l_param)), throttle=10)
+    request.addfinalizer(throttled.unregister)
+    for i in range(5):
+        win.post_message(0x5557, 0, i)
+    ahk.sleep(0.05)
+    assert calls == [("t", 0)]
+    assert throttled.suppressed_count == 4
+
+    debounced = ahk.on_message(0x5558, lambda w_param, l_param, msg, hwnd: calls.append(("d", l_param)), debounce=0.05)
+    request.addfinalizer(debounced.unregister)
+    for i in range(5):
+        win.post_message(0x5558, 0, i)
+    ahk.sleep(0.01)
+    assert debounced.suppressed_count == 4
+    ahk.sleep(0.1)
+    assert calls == [("t", 0), ("d", 4)]
+    assert debounced.suppressed_count == 4
+
+    with pytest.raises(ValueError, match="cannot be used together"):
+        ahk.on_message(0x5559, lambda: None, throttle=1, debounce=1)
+    with pytest.raises(ValueError, match="must be positive"):
+        ahk.on_message(0x5559, lambda: None, throttle=0)
+
+
 def test_on_message_timeout(child_ahk):
     def code():
         import ahkpy as ahk